@@ -26,15 +26,24 @@ from .schemas import (
     prompt_variable_type,
     prompt_test_type,
     prompt_result_type,
+    prompt_leaderboard_type,
     prompt_types,
     register_prompt_types,
 )
 from .prompt_chain import PromptChain
-from .prompt_renderer import PromptRenderer, RendererError
+from .prompt_renderer import PromptRenderer, RendererError, CompiledTemplate
+from .render_cache import RenderCache
 from .prompt_diff import PromptDiff
 from .prompt_scorer import PromptScorer
+from .async_scorer import AsyncPromptScorer
+from .evaluation import EvaluationError, Evaluator
+from .analytics import ResultFrame, summarize_results, compare_results
+from .result_table import ResultTable
+from .sequential import SequentialProbabilityRatioTest
 from .prompt_exporter import PromptExporter
 from .storage import PromptStorage, InMemoryStorage
+from .sqlite_storage import SQLitePromptStorage
+from .async_storage import AsyncPromptStorage, AsyncStorageAdapter
 from .types import (
     PromptVariableType,
     PromptVariable,
@@ -43,6 +52,8 @@ from .types import (
     PromptVariableFields,
     PromptTestFields,
     PromptResultFields,
+    VariableManifest,
+    RenderedPrompt,
     DiffLine,
     DiffResult,
     LangChainExport,
@@ -50,6 +61,11 @@ from .types import (
     FullJsonExport,
     TestRunResult,
     ComparisonResult,
+    VersionSummary,
+    VersionComparison,
+    SequentialComparison,
+    LeaderboardEntry,
+    Leaderboard,
 )
 from .client import PromptsPlugin, MinionsPrompts
 
@@ -60,17 +76,31 @@ __all__ = [
     "prompt_variable_type",
     "prompt_test_type",
     "prompt_result_type",
+    "prompt_leaderboard_type",
     "prompt_types",
     "register_prompt_types",
     # Core classes
     "PromptChain",
     "PromptRenderer",
     "RendererError",
+    "CompiledTemplate",
+    "RenderCache",
     "PromptDiff",
     "PromptScorer",
+    "AsyncPromptScorer",
+    "EvaluationError",
+    "Evaluator",
+    "ResultFrame",
+    "ResultTable",
+    "SequentialProbabilityRatioTest",
+    "summarize_results",
+    "compare_results",
     "PromptExporter",
     "InMemoryStorage",
     "PromptStorage",
+    "SQLitePromptStorage",
+    "AsyncPromptStorage",
+    "AsyncStorageAdapter",
     # Types
     "PromptVariableType",
     "PromptVariable",
@@ -79,6 +109,8 @@ __all__ = [
     "PromptVariableFields",
     "PromptTestFields",
     "PromptResultFields",
+    "VariableManifest",
+    "RenderedPrompt",
     "DiffLine",
     "DiffResult",
     "LangChainExport",
@@ -86,6 +118,11 @@ __all__ = [
     "FullJsonExport",
     "TestRunResult",
     "ComparisonResult",
+    "VersionSummary",
+    "VersionComparison",
+    "SequentialComparison",
+    "LeaderboardEntry",
+    "Leaderboard",
     # Client
     "PromptsPlugin",
     "MinionsPrompts",
@@ -0,0 +1,471 @@
+"""
+Results analytics — vectorised aggregation and A/B statistics over prompt-result scores.
+
+Requires NumPy, available through the ``analytics`` extra::
+
+    pip install "minions-prompts[analytics]"
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any
+
+from .schemas import prompt_result_type, prompt_test_type
+from .storage import PromptStorage
+from .types import LeaderboardEntry, TestRunResult, VersionComparison, VersionSummary
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MAX_BOOTSTRAP_SUPPORT = 4096
+"""Number of strata :func:`bootstrap_ci` draws multinomial counts over.
+
+Samples with at most this many distinct values are resampled exactly;
+larger ones are split into this many equal-count strata of sorted values.
+"""
+
+_BOOTSTRAP_CHUNK = 1 << 22
+"""Most multinomial counts :func:`bootstrap_ci` holds in memory at once."""
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as exc:
+        raise ImportError(
+            "minions_prompts.analytics requires NumPy; "
+            'install it with: pip install "minions-prompts[analytics]"'
+        ) from exc
+    return numpy
+
+
+@dataclass
+class ResultFrame:
+    """Prompt-result scores laid out as columns.
+
+    Prompt and test IDs are interned to integer codes. Each scoring dimension
+    is one float64 column, with NaN where a result has no score for it.
+
+    Example::
+
+        frame = ResultFrame.from_storage(storage)
+        summaries = summarize_results(frame)
+        comparison = compare_results(frame, v1_id, v2_id)
+    """
+
+    prompt_ids: list[str]
+    """Distinct prompt IDs; ``prompt_codes`` index into this list."""
+
+    test_ids: list[str]
+    """Distinct test IDs; ``test_codes`` index into this list."""
+
+    prompt_codes: np.ndarray
+    test_codes: np.ndarray
+    passed: np.ndarray
+    scores: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.passed)
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[tuple[str, str, dict[str, float], bool]],
+    ) -> ResultFrame:
+        """Build a frame from ``(prompt_id, test_id, scores, passed)`` rows."""
+        np = _numpy()
+        # Each column is built in one C-level pass rather than row by row.
+        rows = list(rows)
+        n = len(rows)
+        prompt_col, test_col, score_col, passed_col = (
+            list(map(itemgetter(i), rows)) for i in range(4)
+        )
+        prompt_index = {id: code for code, id in enumerate(dict.fromkeys(prompt_col))}
+        test_index = {id: code for code, id in enumerate(dict.fromkeys(test_col))}
+        score_col = [scores or {} for scores in score_col]
+        nan = float("nan")
+
+        return cls(
+            prompt_ids=list(prompt_index),
+            test_ids=list(test_index),
+            prompt_codes=np.fromiter(map(prompt_index.__getitem__, prompt_col), np.int32, n),
+            test_codes=np.fromiter(map(test_index.__getitem__, test_col), np.int32, n),
+            passed=np.fromiter(map(bool, passed_col), bool, n),
+            scores={
+                dim: np.fromiter(map(dict.get, score_col, repeat(dim), repeat(nan)), np.float64, n)
+                for dim in dict.fromkeys(chain.from_iterable(score_col))
+            },
+        )
+
+    @classmethod
+    def from_results(cls, results: Iterable[TestRunResult]) -> ResultFrame:
+        """Build a frame from scorer results."""
+        return cls.from_rows((r.prompt_id, r.test_id, r.scores, r.passed) for r in results)
+
+    @classmethod
+    def from_storage(
+        cls,
+        storage: PromptStorage,
+        prompt_ids: Iterable[str] | None = None,
+    ) -> ResultFrame:
+        """Load every stored prompt-result, optionally only for some prompts.
+
+        Results are found through their ``references`` relations. Of each
+        result's targets, the prompt-test minion is its test and the other
+        is its prompt, so only the distinct targets are loaded, never the
+        prompt or test of every result. A result whose targets cannot be
+        told apart is skipped.
+
+        Args:
+            storage: The storage backend holding the results.
+            prompt_ids: Restrict to results of these prompts.
+        """
+        wanted = set(prompt_ids) if prompt_ids is not None else None
+        targets: dict[str, list[str]] = {}
+        for rel in storage.get_relations(type="references"):
+            targets.setdefault(rel.source_id, []).append(rel.target_id)
+
+        target_ids = list(dict.fromkeys(chain.from_iterable(targets.values())))
+        is_test = {
+            id: minion.minion_type_id == prompt_test_type.id
+            for id, minion in zip(target_ids, storage.get_minions(target_ids))
+            if minion is not None
+        }
+        pairs: dict[str, tuple[str, str]] = {}
+        for source_id, refs in targets.items():
+            pair = _prompt_and_test(refs, is_test)
+            if pair is not None and (wanted is None or pair[0] in wanted):
+                pairs[source_id] = pair
+
+        rows = (
+            (*pairs[m.id], m.fields.get("scores") or {}, m.fields.get("passed"))
+            for m in storage.get_minions(pairs)
+            if m is not None and m.minion_type_id == prompt_result_type.id
+        )
+        return cls.from_rows(rows)
+
+
+def _prompt_and_test(refs: list[str], is_test: dict[str, bool]) -> tuple[str, str] | None:
+    """Tell a result's prompt from its test by the target minions' types.
+
+    A missing target is taken to be the test only when the other target is
+    a stored prompt.
+    """
+    if len(refs) != 2:
+        return None
+    first, second = (is_test.get(id) for id in refs)
+    if first is True and second is not True:
+        return refs[1], refs[0]
+    if second is True and first is not True:
+        return refs[0], refs[1]
+    if first is None and second is False:
+        return refs[1], refs[0]
+    if second is None and first is False:
+        return refs[0], refs[1]
+    return None
+
+
+def summarize_results(
+    frame: ResultFrame,
+    *,
+    percentiles: Sequence[float] = (50, 90, 95),
+) -> dict[str, VersionSummary]:
+    """Compute per-version counts, pass rates, mean scores and percentiles.
+
+    Args:
+        frame: The results to aggregate.
+        percentiles: Percentiles (0–100) to report per dimension.
+
+    Returns:
+        A VersionSummary per prompt ID with at least one result.
+    """
+    np = _numpy()
+    k = len(frame.prompt_ids)
+    codes = frame.prompt_codes
+    counts = np.bincount(codes, minlength=k)
+    pass_counts = np.bincount(codes, weights=frame.passed, minlength=k)
+
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(k + 1))
+    quantiles = np.asarray(percentiles, dtype=np.float64)
+
+    means: dict[str, np.ndarray] = {}
+    spreads: dict[str, list[np.ndarray | None]] = {}
+    for dim, column in frame.scores.items():
+        valid = ~np.isnan(column)
+        totals = np.bincount(codes[valid], weights=column[valid], minlength=k)
+        n = np.bincount(codes[valid], minlength=k)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means[dim] = totals / n
+        grouped = column[order]
+        spreads[dim] = [
+            np.nanpercentile(grouped[bounds[c]:bounds[c + 1]], quantiles) if n[c] else None
+            for c in range(k)
+        ]
+
+    summaries: dict[str, VersionSummary] = {}
+    for c, prompt_id in enumerate(frame.prompt_ids):
+        if not counts[c]:
+            continue
+        summaries[prompt_id] = VersionSummary(
+            prompt_id=prompt_id,
+            count=int(counts[c]),
+            pass_rate=float(pass_counts[c] / counts[c]),
+            means={dim: float(m[c]) for dim, m in means.items() if not np.isnan(m[c])},
+            percentiles={
+                dim: dict(zip(map(float, quantiles), map(float, spread[c])))
+                for dim, spread in spreads.items()
+                if spread[c] is not None
+            },
+        )
+    return summaries
+
+
+def paired_deltas(
+    frame: ResultFrame,
+    v1_id: str,
+    v2_id: str,
+) -> tuple[list[str], dict[str, np.ndarray]]:
+    """Pair two versions' results by test and return ``v2 - v1`` per dimension.
+
+    Repeated runs of a test are averaged first. A missing score counts as 0,
+    as in :meth:`PromptScorer.compare_versions`.
+
+    Returns:
+        The shared test IDs and, per dimension, the delta for each of them.
+
+    Raises:
+        ValueError: If either version has no results.
+    """
+    np = _numpy()
+    try:
+        c1 = frame.prompt_ids.index(v1_id)
+        c2 = frame.prompt_ids.index(v2_id)
+    except ValueError:
+        missing = v1_id if v1_id not in frame.prompt_ids else v2_id
+        raise ValueError(f"No results for prompt {missing}") from None
+
+    t = len(frame.test_ids)
+    m1 = frame.prompt_codes == c1
+    m2 = frame.prompt_codes == c2
+    n1 = np.bincount(frame.test_codes[m1], minlength=t)
+    n2 = np.bincount(frame.test_codes[m2], minlength=t)
+    shared = np.flatnonzero((n1 > 0) & (n2 > 0))
+
+    deltas: dict[str, np.ndarray] = {}
+    for dim, column in frame.scores.items():
+        filled = np.nan_to_num(column, nan=0.0)
+        s1 = np.bincount(frame.test_codes[m1], weights=filled[m1], minlength=t)
+        s2 = np.bincount(frame.test_codes[m2], weights=filled[m2], minlength=t)
+        deltas[dim] = s2[shared] / n2[shared] - s1[shared] / n1[shared]
+    return [frame.test_ids[i] for i in shared], deltas
+
+
+def bootstrap_ci(
+    values: np.ndarray | Sequence[float],
+    *,
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: int | np.random.Generator | None = None,
+) -> tuple[float, float]:
+    """Percentile bootstrap confidence interval for the mean of ``values``.
+
+    Each resample is drawn as multinomial counts over at most
+    :data:`MAX_BOOTSTRAP_SUPPORT` strata, so the cost does not grow with
+    the number of values. When ``values`` has no more distinct entries
+    than that (typical for integer scores and their deltas), each distinct
+    value is a stratum and the draw has exactly the distribution of
+    resampling indices. Otherwise the sorted values are split into
+    equal-count strata; a resample's sum is its counts times the strata
+    means, plus normal noise with the variance the draws within strata
+    would add.
+
+    Raises:
+        ValueError: If ``values`` is empty or ``confidence`` is not in (0, 1).
+    """
+    np = _numpy()
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    values = np.asarray(values, dtype=np.float64)
+    n = values.size
+    if n == 0:
+        raise ValueError("Cannot bootstrap an empty sample")
+
+    rng = np.random.default_rng(seed)
+    support, counts = np.unique(values, return_counts=True)
+    if support.size <= MAX_BOOTSTRAP_SUPPORT:
+        variances = None
+    else:
+        # np.unique sorted the values, so equal-count strata of the sorted
+        # values are runs of the support.
+        starts = np.linspace(0, n, MAX_BOOTSTRAP_SUPPORT + 1).astype(np.int64)[:-1]
+        ordered = np.repeat(support, counts)
+        counts = np.diff(np.append(starts, n))
+        support = np.add.reduceat(ordered, starts) / counts
+        spread = ordered - np.repeat(support, counts)
+        variances = np.add.reduceat(spread * spread, starts) / counts
+
+    means = np.empty(resamples)
+    step = max(1, _BOOTSTRAP_CHUNK // support.size)
+    for start in range(0, resamples, step):
+        stop = min(start + step, resamples)
+        draws = rng.multinomial(n, counts / n, size=stop - start)
+        means[start:stop] = draws @ support
+        if variances is not None:
+            means[start:stop] += np.sqrt(draws @ variances) * rng.standard_normal(stop - start)
+    means /= n
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def compare_results(
+    frame: ResultFrame,
+    v1_id: str,
+    v2_id: str,
+    *,
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: int | None = None,
+) -> VersionComparison:
+    """Paired A/B statistics between two versions over their shared tests.
+
+    Args:
+        frame: Results for (at least) both versions.
+        v1_id: ID of the baseline version.
+        v2_id: ID of the comparison version.
+        confidence: Confidence level of the bootstrap intervals.
+        resamples: Bootstrap resamples per dimension.
+        seed: Seed for reproducible intervals.
+
+    Returns:
+        A VersionComparison.
+
+    Raises:
+        ValueError: If the versions share no tests.
+    """
+    np = _numpy()
+    test_ids, deltas = paired_deltas(frame, v1_id, v2_id)
+    if not test_ids:
+        raise ValueError(f"Prompts {v1_id} and {v2_id} have no tests in common")
+
+    total = sum(deltas.values(), np.zeros(len(test_ids)))
+    sign = np.sign(total)
+    rng = np.random.default_rng(seed)
+    return VersionComparison(
+        v1_id=v1_id,
+        v2_id=v2_id,
+        pairs=len(test_ids),
+        mean_deltas={dim: float(d.mean()) for dim, d in deltas.items()},
+        confidence_intervals={
+            dim: bootstrap_ci(d, confidence=confidence, resamples=resamples, seed=rng)
+            for dim, d in deltas.items()
+        },
+        wins={
+            "v1": int(np.count_nonzero(sign < 0)),
+            "v2": int(np.count_nonzero(sign > 0)),
+            "tie": int(np.count_nonzero(sign == 0)),
+        },
+    )
+
+
+def pairwise_wins(totals: np.ndarray | Sequence[Sequence[float]]) -> np.ndarray:
+    """Head-to-head win counts between versions scored on the same tests.
+
+    Args:
+        totals: ``(versions, tests)`` matrix of per-test scores.
+
+    Returns:
+        ``(versions, versions)`` matrix whose ``[i, j]`` entry counts the tests
+        where version i scored higher than version j; ties count half.
+    """
+    np = _numpy()
+    totals = np.asarray(totals, dtype=np.float64)
+    diff = totals[:, None, :] - totals[None, :, :]
+    wins = (diff > 0).sum(axis=-1) + 0.5 * (diff == 0).sum(axis=-1)
+    np.fill_diagonal(wins, 0)
+    return wins
+
+
+def bradley_terry(
+    wins: np.ndarray | Sequence[Sequence[float]],
+    *,
+    prior: float = 1.0,
+    tolerance: float = 1e-10,
+    max_iterations: int = 10_000,
+) -> np.ndarray:
+    """Fit Bradley-Terry strengths to a pairwise win matrix.
+
+    Uses the minorise-maximise updates, one matrix expression per iteration.
+    ``prior`` adds that many virtual games, split evenly, between every pair
+    so versions that never win still get a finite strength.
+
+    Returns:
+        Strengths normalised to a geometric mean of 1.
+    """
+    np = _numpy()
+    wins = np.asarray(wins, dtype=np.float64) + prior / 2
+    np.fill_diagonal(wins, 0)
+    games = wins + wins.T
+    total_wins = wins.sum(axis=1)
+    strengths = np.ones(len(wins))
+    for _ in range(max_iterations):
+        updated = total_wins / (games / (strengths[:, None] + strengths[None, :])).sum(axis=1)
+        updated /= np.exp(np.log(updated).mean())
+        converged = np.abs(updated - strengths).max() < tolerance
+        strengths = updated
+        if converged:
+            break
+    return strengths
+
+
+def rank_versions(
+    version_ids: Sequence[str],
+    totals: np.ndarray | Sequence[Sequence[float]],
+    passed: np.ndarray | Sequence[Sequence[bool]],
+    *,
+    method: str = "bradley-terry",
+) -> tuple[list[LeaderboardEntry], np.ndarray]:
+    """Rank versions scored on a shared test set.
+
+    Args:
+        version_ids: IDs of the versions, one per row.
+        totals: ``(versions, tests)`` matrix of summed scores.
+        passed: ``(versions, tests)`` matrix of pass flags.
+        method: ``"bradley-terry"`` ranks by fitted strength, ``"mean"`` by
+            mean score. Equal values keep input order.
+
+    Returns:
+        The entries ordered by rank, and the pairwise win matrix.
+
+    Raises:
+        ValueError: If ``method`` is unknown.
+    """
+    if method not in ("mean", "bradley-terry"):
+        raise ValueError(f"Unknown ranking method: {method}")
+    np = _numpy()
+    totals = np.asarray(totals, dtype=np.float64)
+    passed = np.asarray(passed, dtype=bool)
+    wins = pairwise_wins(totals)
+    ratings = 1500 + 400 * np.log10(bradley_terry(wins))
+    means = totals.mean(axis=1) if totals.shape[1] else np.zeros(len(version_ids))
+    pass_rates = passed.mean(axis=1) if passed.shape[1] else np.zeros(len(version_ids))
+    key = ratings if method == "bradley-terry" else means
+    order = np.argsort(-key, kind="stable")
+    entries = [
+        LeaderboardEntry(
+            prompt_id=version_ids[i],
+            rank=rank,
+            mean_score=float(means[i]),
+            pass_rate=float(pass_rates[i]),
+            wins=float(wins[i].sum()),
+            rating=float(ratings[i]),
+        )
+        for rank, i in enumerate(order, start=1)
+    ]
+    return entries, wins
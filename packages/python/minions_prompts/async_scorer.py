@@ -0,0 +1,230 @@
+"""
+AsyncPromptScorer — asyncio-native counterpart of PromptScorer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any
+
+from minions import Minion, Relation
+
+from .async_storage import AsyncPromptStorage, AsyncStorageAdapter
+from .evaluation import Evaluator, evaluate_all
+from .prompt_scorer import _build_result, _build_results, _compare_results, _content, _test_rows
+from .render_cache import RenderCache
+from .storage import PromptStorage
+from .types import ComparisonResult, RenderedPrompt, TestRunResult
+
+
+class AsyncPromptScorer:
+    """Runs test cases against prompt versions from async code.
+
+    Behaves like :class:`PromptScorer`, but every storage call is awaited,
+    and suites are rendered in a worker thread. A semaphore bounds how many
+    runs are in flight against storage at once, so thousands of calls can be
+    scheduled without one thread each. The scorer can be reused across event
+    loops; each loop gets its own semaphore, created on first use.
+
+    Args:
+        storage: An async backend, or a sync :class:`PromptStorage`, which is
+            wrapped in an :class:`AsyncStorageAdapter`.
+        max_concurrency: Maximum number of runs talking to storage at once,
+            per event loop.
+        render_cache: Cache of rendered prompts to use; may be shared with
+            other scorers. Defaults to a new
+            :class:`~minions_prompts.render_cache.RenderCache`.
+
+    Example::
+
+        scorer = AsyncPromptScorer(SQLitePromptStorage("prompts.db"))
+        result = await scorer.run_test(
+            prompt_id,
+            test_id,
+            scores={"relevance": 85},
+            passed=True,
+        )
+    """
+
+    def __init__(
+        self,
+        storage: AsyncPromptStorage | PromptStorage,
+        *,
+        max_concurrency: int = 32,
+        render_cache: RenderCache | None = None,
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+        if isinstance(storage, PromptStorage):
+            storage = AsyncStorageAdapter(storage)
+        self._storage = storage
+        self._render_cache = render_cache if render_cache is not None else RenderCache()
+        self._max_concurrency = max_concurrency
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = weakref.WeakKeyDictionary()
+
+    async def run_test(
+        self,
+        prompt_id: str,
+        test_id: str,
+        *,
+        scores: dict[str, float],
+        passed: bool,
+        output: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> TestRunResult:
+        """Run a single test case against a prompt and record the result.
+
+        Args:
+            prompt_id: The ID of the prompt-template or prompt-version.
+            test_id: The ID of the prompt-test minion.
+            scores: Map of dimension names to scores (0–100).
+            passed: Whether the test passes.
+            output: Actual LLM output (if captured).
+            metadata: Extra metadata (model, temperature, tokens, etc.).
+
+        Returns:
+            A TestRunResult with the created prompt-result minion.
+        """
+        async with self._semaphore():
+            prompt, [test] = await self._load(prompt_id, [test_id])
+            [rendered_prompt] = await self._render(prompt, [test])
+            result, relations = _build_result(
+                prompt,
+                test,
+                rendered_prompt.text,
+                prompt_hash=rendered_prompt.hash,
+                scores=scores,
+                passed=passed,
+                output=output,
+                metadata=metadata,
+            )
+            await self._storage.save_minion(result.result)
+            await self._storage.save_relations(relations)
+        return result
+
+    async def run_test_suite(
+        self,
+        prompt_id: str,
+        test_ids: list[str],
+        evaluations: list[dict[str, Any]] | None = None,
+        *,
+        evaluator: Evaluator | None = None,
+        concurrency: int = 8,
+        timeout: float | None = None,
+        retries: int = 0,
+    ) -> list[TestRunResult]:
+        """Run multiple test cases against a prompt.
+
+        Scores come either precomputed in ``evaluations`` or from an
+        ``evaluator``, as in :meth:`PromptScorer.run_test_suite`.
+
+        Args:
+            prompt_id: The ID of the prompt to test.
+            test_ids: List of test-case IDs.
+            evaluations: List of evaluation dicts with ``scores`` and ``passed`` keys.
+            evaluator: Sync or async callable returning an evaluation dict
+                for ``(rendered_prompt, test)``. Replaces ``evaluations``.
+            concurrency: Maximum evaluator calls in flight.
+            timeout: Seconds allowed per evaluator call.
+            retries: Extra attempts for a failed or timed-out evaluator call.
+
+        Returns:
+            List of TestRunResult objects, in the order of ``test_ids``.
+
+        Raises:
+            ValueError: If both or neither of ``evaluations`` and ``evaluator``
+                are given.
+            EvaluationError: If an evaluator call still fails after all retries.
+        """
+        if (evaluations is None) == (evaluator is None):
+            raise ValueError("Pass exactly one of evaluations or evaluator")
+        async with self._semaphore():
+            if evaluator is not None:
+                prompt, tests = await self._load(prompt_id, test_ids)
+                rendered = await self._render(prompt, tests)
+                evaluations = await evaluate_all(
+                    evaluator,
+                    [r.text for r in rendered],
+                    tests,
+                    concurrency=concurrency,
+                    timeout=timeout,
+                    retries=retries,
+                )
+                results, relations = _build_results(prompt, tests, evaluations, rendered)
+            else:
+                results, relations = await self._build_suite(prompt_id, test_ids, evaluations)
+            await self._flush(results, relations)
+        return results
+
+    async def compare_versions(
+        self,
+        v1_id: str,
+        v2_id: str,
+        test_ids: list[str],
+        v1_evaluations: list[dict[str, Any]],
+        v2_evaluations: list[dict[str, Any]],
+    ) -> list[ComparisonResult]:
+        """Run A/B comparison between two versions against the same tests.
+
+        Both suites are built concurrently and written together once both
+        succeed.
+
+        Args:
+            v1_id: ID of the baseline version.
+            v2_id: ID of the comparison version.
+            test_ids: List of test IDs to run against both.
+            v1_evaluations: Evaluations for v1.
+            v2_evaluations: Evaluations for v2.
+
+        Returns:
+            List of ComparisonResult objects.
+        """
+        async with self._semaphore():
+            (v1_results, v1_relations), (v2_results, v2_relations) = await asyncio.gather(
+                self._build_suite(v1_id, test_ids, v1_evaluations),
+                self._build_suite(v2_id, test_ids, v2_evaluations),
+            )
+            await self._flush(v1_results + v2_results, v1_relations + v2_relations)
+        return _compare_results(v1_id, v2_id, test_ids, v1_results, v2_results)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Return the running loop's semaphore; a semaphore is bound to one loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self._max_concurrency)
+        return semaphore
+
+    async def _load(self, prompt_id: str, test_ids: list[str]) -> tuple[Minion, list[Minion]]:
+        prompt, tests = await asyncio.gather(
+            self._storage.get_minion(prompt_id),
+            self._storage.get_minions(test_ids),
+        )
+        if not prompt:
+            raise ValueError(f"Prompt not found: {prompt_id}")
+        for test_id, test in zip(test_ids, tests):
+            if not test:
+                raise ValueError(f"Test not found: {test_id}")
+        return prompt, tests
+
+    async def _build_suite(
+        self,
+        prompt_id: str,
+        test_ids: list[str],
+        evaluations: list[dict[str, Any]],
+    ) -> tuple[list[TestRunResult], list[Relation]]:
+        test_ids = test_ids[: len(evaluations)]
+        prompt, tests = await self._load(prompt_id, test_ids)
+        rendered = await self._render(prompt, tests)
+        return await asyncio.to_thread(_build_results, prompt, tests, evaluations[: len(tests)], rendered)
+
+    async def _render(self, prompt: Minion, tests: list[Minion]) -> list[RenderedPrompt]:
+        # Rendering is CPU work; keep it off the event loop.
+        return await asyncio.to_thread(self._render_cache.render_many, _content(prompt), _test_rows(tests))
+
+    async def _flush(self, results: list[TestRunResult], relations: list[Relation]) -> None:
+        await self._storage.save_minions([r.result for r in results])
+        await self._storage.save_relations(relations)
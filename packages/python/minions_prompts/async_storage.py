@@ -0,0 +1,121 @@
+"""
+Asyncio storage interface for minions-prompts, plus an adapter for sync backends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+
+from minions import Minion, Relation
+
+from .storage import PromptStorage
+
+
+class AsyncPromptStorage(ABC):
+    """Abstract base class for asyncio-native prompt storage backends.
+
+    Mirrors :class:`PromptStorage` with coroutine methods, so evaluation
+    services can await storage without blocking the event loop.
+    """
+
+    @abstractmethod
+    async def get_minion(self, id: str) -> Minion | None:
+        """Retrieve a minion by ID."""
+        ...
+
+    @abstractmethod
+    async def save_minion(self, minion: Minion) -> None:
+        """Persist a minion."""
+        ...
+
+    @abstractmethod
+    async def get_relations(
+        self,
+        *,
+        source_id: str | None = None,
+        target_id: str | None = None,
+        type: str | None = None,
+    ) -> list[Relation]:
+        """Retrieve relations matching the given filters."""
+        ...
+
+    @abstractmethod
+    async def save_relation(self, relation: Relation) -> None:
+        """Persist a relation."""
+        ...
+
+    async def get_minions(self, ids: Iterable[str]) -> list[Minion | None]:
+        """Retrieve many minions at once, in the order of ``ids``.
+
+        Missing IDs yield None. The default awaits each lookup in turn.
+        """
+        return [await self.get_minion(id) for id in ids]
+
+    async def save_minions(self, minions: Iterable[Minion]) -> None:
+        """Persist many minions at once. The default saves each in turn."""
+        for minion in minions:
+            await self.save_minion(minion)
+
+    async def save_relations(self, relations: Iterable[Relation]) -> None:
+        """Persist many relations at once. The default saves each in turn."""
+        for relation in relations:
+            await self.save_relation(relation)
+
+
+class AsyncStorageAdapter(AsyncPromptStorage):
+    """Expose a synchronous :class:`PromptStorage` through the async interface.
+
+    Every call runs the wrapped method in a worker thread with
+    :func:`asyncio.to_thread`, so blocking backends such as
+    :class:`SQLitePromptStorage` never stall the event loop. Bulk methods
+    forward to the wrapped backend's bulk methods in a single offload.
+
+    Args:
+        storage: The synchronous backend to wrap.
+
+    Example::
+
+        storage = AsyncStorageAdapter(SQLitePromptStorage("prompts.db"))
+        minion = await storage.get_minion(prompt_id)
+    """
+
+    def __init__(self, storage: PromptStorage) -> None:
+        self.storage = storage
+
+    async def get_minion(self, id: str) -> Minion | None:
+        """Retrieve a minion by ID, or None if not found."""
+        return await asyncio.to_thread(self.storage.get_minion, id)
+
+    async def save_minion(self, minion: Minion) -> None:
+        """Persist a minion."""
+        await asyncio.to_thread(self.storage.save_minion, minion)
+
+    async def get_relations(
+        self,
+        *,
+        source_id: str | None = None,
+        target_id: str | None = None,
+        type: str | None = None,
+    ) -> list[Relation]:
+        """Return relations matching all provided filters."""
+        return await asyncio.to_thread(
+            self.storage.get_relations, source_id=source_id, target_id=target_id, type=type
+        )
+
+    async def save_relation(self, relation: Relation) -> None:
+        """Persist a relation."""
+        await asyncio.to_thread(self.storage.save_relation, relation)
+
+    async def get_minions(self, ids: Iterable[str]) -> list[Minion | None]:
+        """Retrieve many minions in one offloaded bulk call."""
+        return await asyncio.to_thread(self.storage.get_minions, list(ids))
+
+    async def save_minions(self, minions: Iterable[Minion]) -> None:
+        """Persist many minions in one offloaded bulk call."""
+        await asyncio.to_thread(self.storage.save_minions, list(minions))
+
+    async def save_relations(self, relations: Iterable[Relation]) -> None:
+        """Persist many relations in one offloaded bulk call."""
+        await asyncio.to_thread(self.storage.save_relations, list(relations))
@@ -16,10 +16,27 @@ class PromptsPluginAPI:
         self.diff = PromptDiff()
         self.scorer = PromptScorer(self.storage)
         self.exporter = PromptExporter(self.storage)
+        self.chain = PromptChain(self.storage)
     
     def create_chain(self) -> PromptChain:
         return PromptChain(self.storage)
 
+    def get_latest_version(self, prompt_id: str) -> Any:
+        """Return the current head of a prompt's lineage from the head index."""
+        return self.chain.get_latest_version(prompt_id)
+
+    def heads(self) -> dict[str, str]:
+        """Return the head index: each lineage's root ID mapped to its latest version ID."""
+        return self.chain.heads()
+
+    def verify_heads(self, *, repair: bool = True) -> dict[str, tuple[str | None, str | None]]:
+        """Check the head index against stored relations."""
+        return self.chain.verify_heads(repair=repair)
+
+    def rebuild_heads(self) -> dict[str, str]:
+        """Rebuild the head index from stored relations."""
+        return self.chain.rebuild_heads()
+
 class PromptsPlugin(MinionPlugin):
     """
     MinionPlugin implementation that mounts Prompts capabilities onto the core Minions client.
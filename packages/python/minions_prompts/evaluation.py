@@ -0,0 +1,148 @@
+"""
+Evaluator pipeline — schedules scoring callbacks with bounded concurrency, timeouts and retries.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from collections.abc import Awaitable, Callable, Mapping
+from concurrent.futures import Executor
+from typing import Any, Union
+
+from minions import Minion
+
+Evaluation = dict[str, Any]
+"""An evaluation dict with ``scores`` and ``passed`` keys, plus optional ``output`` and ``metadata``."""
+
+Evaluator = Callable[[str, Minion], Union[Mapping[str, Any], Awaitable[Mapping[str, Any]]]]
+"""A sync or async callable scoring a rendered prompt against its prompt-test minion."""
+
+RETRY_BACKOFF = 0.1
+"""Seconds before the first retry of a failed evaluation; doubles on each further retry."""
+
+
+class EvaluationError(Exception):
+    """Raised when an evaluator keeps failing for a test after all retries.
+
+    Attributes:
+        test_id: ID of the prompt-test whose evaluation failed.
+        attempts: Number of attempts made.
+    """
+
+    def __init__(self, message: str, test_id: str, attempts: int) -> None:
+        super().__init__(message)
+        self.test_id = test_id
+        self.attempts = attempts
+
+
+async def evaluate_all(
+    evaluator: Evaluator,
+    rendered: list[str],
+    tests: list[Minion],
+    *,
+    concurrency: int = 8,
+    timeout: float | None = None,
+    retries: int = 0,
+    backoff: float = RETRY_BACKOFF,
+    executor: Executor | None = None,
+) -> list[Evaluation]:
+    """Run ``evaluator`` over rendered prompts and their tests.
+
+    Async evaluators run on the event loop; sync ones run in worker threads,
+    or on ``executor`` when one is given. At most ``concurrency`` calls are
+    in flight at once. A call that raises or exceeds ``timeout`` is retried
+    up to ``retries`` times with exponential backoff. A sync call that times out cannot be interrupted,
+    so its thread finishes in the background and its result is discarded.
+
+    Args:
+        evaluator: Called as ``evaluator(rendered_prompt, test)``. Returns an
+            evaluation mapping.
+        rendered: Rendered prompts, one per test.
+        tests: The prompt-test minions.
+        concurrency: Maximum number of evaluator calls in flight.
+        timeout: Seconds allowed per call, or None for no limit.
+        retries: Extra attempts after a failed call.
+        backoff: Seconds before the first retry.
+        executor: Pool for sync evaluator calls; defaults to the loop's
+            default thread pool.
+
+    Returns:
+        One evaluation dict per test, in input order.
+
+    Raises:
+        EvaluationError: If a test still fails after all retries. Other
+            pending calls are cancelled.
+        ValueError: If ``concurrency`` or ``retries`` is out of range.
+    """
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+    if retries < 0:
+        raise ValueError(f"retries must not be negative, got {retries}")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    is_async = inspect.iscoroutinefunction(evaluator) or inspect.iscoroutinefunction(
+        getattr(evaluator, "__call__", None)
+    )
+
+    async def call(rendered_prompt: str, test: Minion) -> Any:
+        if is_async:
+            return await evaluator(rendered_prompt, test)
+        if executor is None:
+            result = await asyncio.to_thread(evaluator, rendered_prompt, test)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(executor, evaluator, rendered_prompt, test)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    async def evaluate(rendered_prompt: str, test: Minion) -> Evaluation:
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    result = await asyncio.wait_for(call(rendered_prompt, test), timeout)
+                break
+            except Exception as exc:
+                if attempt == retries:
+                    raise EvaluationError(
+                        f"Evaluation failed for test {test.id} after {attempt + 1} attempt(s): {exc!r}",
+                        test.id,
+                        attempt + 1,
+                    ) from exc
+                await asyncio.sleep(backoff * 2**attempt)
+        if not isinstance(result, Mapping):
+            raise TypeError(
+                f"Evaluator must return a mapping, got {type(result).__name__} for test {test.id}"
+            )
+        return dict(result)
+
+    tasks = [asyncio.ensure_future(evaluate(p, t)) for p, t in zip(rendered, tests)]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+def run_evaluations(
+    evaluator: Evaluator,
+    rendered: list[str],
+    tests: list[Minion],
+    **options: Any,
+) -> list[Evaluation]:
+    """Synchronous wrapper around :func:`evaluate_all` for non-async callers.
+
+    Raises:
+        RuntimeError: If called from a running event loop; use
+            :class:`AsyncPromptScorer` there instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(evaluate_all(evaluator, rendered, tests, **options))
+    raise RuntimeError(
+        "PromptScorer cannot run an evaluator inside a running event loop; "
+        "use AsyncPromptScorer instead"
+    )
@@ -4,16 +4,147 @@ PromptChain — traverses follows relations to reconstruct complete version hist
 
 from __future__ import annotations
 
-from minions import Minion
+import threading
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
 
+from minions import Minion, Relation
+
+from .schemas import prompt_template_type, prompt_version_type
 from .storage import PromptStorage
 
+TIMESTAMP_CACHE_SIZE = 8192
+"""Maximum number of parsed ``created_at`` strings kept by the chain helpers."""
+
+CHAIN_CACHE_SIZE = 1024
+"""Default maximum number of chains a :class:`PromptChain` keeps cached."""
+
+_VERSION_TYPE_IDS = frozenset({prompt_template_type.id, prompt_version_type.id})
+"""Minion types that can be members of a version chain."""
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _epoch(created_at: str) -> float:
+    """Parse an ISO 8601 timestamp to POSIX seconds, memoised across chains."""
+    return datetime.fromisoformat(created_at).timestamp()
+
+
+def _created_at(minion: Minion) -> float:
+    return _epoch(minion.created_at)
+
+
+@dataclass
+class _ChainEntry:
+    """A cached version chain, keyed by its root ID."""
+
+    root_id: str
+    versions: list[Minion]
+    """All versions, oldest first."""
+
+    timestamps: list[float]
+    """POSIX timestamps of ``versions``, ascending, for bisection."""
+
+    member_ids: set[str]
+    leaf_ids: set[str]
+    """Members without a successor in the chain."""
+
+    head: Minion | None = None
+    """The latest leaf; computed on first use, then kept current as versions are appended."""
+
+    lookup_ids: set[str] = field(default_factory=set)
+    """IDs whose root resolved to this entry."""
+
+
+def _forest_root(start_id: str, parent_of: dict[str, str], roots: dict[str, str]) -> str:
+    """Resolve ``start_id``'s root in a parent map, memoising every node on the path."""
+    path: list[str] = []
+    seen: set[str] = set()
+    current_id = start_id
+    while current_id not in roots:
+        if current_id in seen:
+            raise ValueError(f"Cycle detected in follows chain at {current_id}")
+        seen.add(current_id)
+        path.append(current_id)
+        parent_id = parent_of.get(current_id)
+        if parent_id is None:
+            roots[current_id] = current_id
+            break
+        current_id = parent_id
+    root_id = roots[current_id]
+    for node_id in path:
+        roots[node_id] = root_id
+    return root_id
+
+
+def _descendant_ids(root_id: str, children_of: dict[str, list[str]]) -> list[str]:
+    """Return ``root_id`` and every ID reachable through ``children_of``."""
+    ids = [root_id]
+    seen = {root_id}
+    for current_id in ids:
+        for child_id in children_of.get(current_id, ()):
+            if child_id not in seen:
+                seen.add(child_id)
+                ids.append(child_id)
+    return ids
+
+
+def _forest_entry(
+    root: Minion, children_of: dict[str, list[str]], minions: dict[str, Minion | None]
+) -> _ChainEntry:
+    """Build a chain entry from an in-memory forest, matching ``_build_entry``."""
+    visited = {root.id}
+    chain = [root]
+    for current in chain:
+        for child_id in children_of.get(current.id, ()):
+            if child_id not in visited:
+                visited.add(child_id)
+                minion = minions.get(child_id)
+                # A missing minion ends its branch, as in per-node traversal.
+                if minion:
+                    chain.append(minion)
+    member_ids = {m.id for m in chain}
+    leaf_ids = {
+        m.id for m in chain
+        if not any(child_id in member_ids for child_id in children_of.get(m.id, ()))
+    }
+    chain.sort(key=_created_at)
+    return _ChainEntry(
+        root_id=root.id,
+        versions=chain,
+        timestamps=[_created_at(m) for m in chain],
+        member_ids=member_ids,
+        leaf_ids=leaf_ids,
+    )
+
 
 class PromptChain:
     """Traverses ``follows`` relations to reconstruct the complete prompt lineage.
 
+    Resolved chains are cached per root. When the storage backend reports
+    changes (``supports_change_events``), a saved ``follows`` relation
+    invalidates the chains it touches and a saved member minion is swapped
+    into its cached chain, so repeat lookups skip traversal entirely. At
+    most ``max_chains`` chains are kept, least recently used first out.
+    Writes the backend reports through
+    :meth:`~minions_prompts.storage.PromptStorage.external_version` (such as
+    another process writing the same SQLite file) drop every cached chain
+    before the next lookup.
+
+    :meth:`get_latest_version` is the "current prompt" hot path. Backends
+    with a head index (``supports_head_index``) store each lineage's head
+    and update it in the same write as every ``follows`` relation, so the
+    lookup is O(1) even for chains that were never loaded. Otherwise each
+    cached chain remembers its head and moves it when a new version is
+    appended. :meth:`heads`, :meth:`verify_heads` and :meth:`rebuild_heads`
+    read, check and rebuild the index.
+
     Args:
         storage: The storage backend to use for minion and relation retrieval.
+        cache: Cache resolved chains. Ignored for backends without change events.
+        max_chains: Maximum number of chains to keep cached.
 
     Example::
 
@@ -23,8 +154,28 @@ class PromptChain:
         latest = chain.get_latest_version(prompt_id)
     """
 
-    def __init__(self, storage: PromptStorage) -> None:
+    def __init__(
+        self,
+        storage: PromptStorage,
+        *,
+        cache: bool = True,
+        max_chains: int = CHAIN_CACHE_SIZE,
+    ) -> None:
+        if max_chains < 1:
+            raise ValueError(f"max_chains must be at least 1, got {max_chains}")
         self._storage = storage
+        self._cache_enabled = cache and storage.supports_change_events
+        self._max_chains = max_chains
+        self._lock = threading.RLock()
+        self._entries: dict[str, _ChainEntry] = {}
+        """Cached chains by root ID, least recently used first."""
+        self._root_of: dict[str, str] = {}
+        self._chains_by_member: dict[str, set[str]] = {}
+        self._generation = 0
+        self._external_version: int | None = None
+        if self._cache_enabled:
+            self._external_version = storage.external_version()
+            storage.add_listener(self)
 
     def get_version_chain(self, prompt_id: str) -> list[Minion]:
         """Return all versions in the chain, sorted oldest first.
@@ -38,27 +189,7 @@ class PromptChain:
         Returns:
             List of minions in chronological order (oldest first).
         """
-        root = self._find_root(prompt_id)
-        visited: set[str] = set()
-        chain: list[Minion] = []
-        queue = [root.id]
-        visited.add(root.id)
-        chain.append(root)
-
-        while queue:
-            current_id = queue.pop(0)
-            following = self._storage.get_relations(target_id=current_id, type="follows")
-            for rel in following:
-                if rel.source_id not in visited:
-                    visited.add(rel.source_id)
-                    minion = self._storage.get_minion(rel.source_id)
-                    if minion:
-                        chain.append(minion)
-                        queue.append(rel.source_id)
-
-        from datetime import datetime
-        chain.sort(key=lambda m: datetime.fromisoformat(m.created_at))
-        return chain
+        return list(self._entry(prompt_id).versions)
 
     def get_latest_version(self, prompt_id: str) -> Minion:
         """Return the most recently created leaf version.
@@ -72,23 +203,50 @@ class PromptChain:
         Raises:
             ValueError: If no version chain is found.
         """
-        chain = self.get_version_chain(prompt_id)
-        if not chain:
-            raise ValueError(f"No version chain found for prompt {prompt_id}")
-
-        chain_ids = {m.id for m in chain}
-        leaf_nodes = []
-        for minion in chain:
-            successors = self._storage.get_relations(target_id=minion.id, type="follows")
-            chain_successors = [r for r in successors if r.source_id in chain_ids]
-            if not chain_successors:
-                leaf_nodes.append(minion)
-
-        from datetime import datetime
-        leaf_nodes.sort(key=lambda m: datetime.fromisoformat(m.created_at), reverse=True)
-        return leaf_nodes[0]
-
-    def get_version_at_date(self, prompt_id: str, date: "datetime") -> Minion | None:
+        head_id = self._storage.get_head_id(prompt_id)
+        if head_id is not None:
+            head = self._storage.get_minion(head_id)
+            if head is not None:
+                return head
+        return self._latest(self._entry(prompt_id), prompt_id)
+
+    def get_version_chains(self, prompt_ids: Iterable[str]) -> dict[str, list[Minion]]:
+        """Return the version chains of many prompts at once.
+
+        Loads every ``follows`` relation in a single query and resolves all
+        requested chains from that in-memory forest, instead of traversing
+        each chain with per-node queries.
+
+        Args:
+            prompt_ids: IDs of minions anywhere in their chains.
+
+        Returns:
+            Mapping of each prompt ID to its chain, oldest first.
+
+        Raises:
+            ValueError: If a prompt is not found or its chain has a cycle.
+        """
+        entries = self._entries_for(prompt_ids)
+        return {prompt_id: list(entry.versions) for prompt_id, entry in entries.items()}
+
+    def get_latest_versions(self, prompt_ids: Iterable[str]) -> dict[str, Minion]:
+        """Return the latest version of many prompts at once.
+
+        Resolves chains in bulk like :meth:`get_version_chains`.
+
+        Args:
+            prompt_ids: IDs of minions anywhere in their chains.
+
+        Returns:
+            Mapping of each prompt ID to the latest version in its chain.
+
+        Raises:
+            ValueError: If a prompt is not found or its chain has a cycle.
+        """
+        entries = self._entries_for(prompt_ids)
+        return {prompt_id: self._latest(entry, prompt_id) for prompt_id, entry in entries.items()}
+
+    def get_version_at_date(self, prompt_id: str, date: datetime) -> Minion | None:
         """Return the version that was active at a specific date.
 
         Args:
@@ -98,19 +256,367 @@ class PromptChain:
         Returns:
             The active version at that date, or None if none existed yet.
         """
-        from datetime import datetime
-        chain = self.get_version_chain(prompt_id)
-        target_ts = date.timestamp()
-
-        candidates = [
-            m for m in chain
-            if datetime.fromisoformat(m.created_at).timestamp() <= target_ts
-        ]
-        if not candidates:
+        entry = self._entry(prompt_id)
+        index = bisect_right(entry.timestamps, date.timestamp()) - 1
+        if index < 0:
             return None
+        # Among versions sharing that timestamp, the earliest in chain order wins.
+        return entry.versions[bisect_left(entry.timestamps, entry.timestamps[index])]
+
+    def get_versions_at_dates(
+        self, prompt_id: str, dates: Iterable[datetime]
+    ) -> list[Minion | None]:
+        """Return the version active at each of many dates.
+
+        Sorted ``dates`` are resolved in a single merge pass over the chain;
+        unsorted input is sorted first.
+
+        Args:
+            prompt_id: The ID of any minion in the chain.
+            dates: The target datetimes.
+
+        Returns:
+            The active version (or None) for each date, in input order.
+        """
+        entry = self._entry(prompt_id)
+        timestamps = entry.timestamps
+        targets = [d.timestamp() for d in dates]
+        order = sorted(range(len(targets)), key=targets.__getitem__)
+
+        results: list[Minion | None] = [None] * len(targets)
+        index = 0
+        for position in order:
+            while index < len(timestamps) and timestamps[index] <= targets[position]:
+                index += 1
+            if index:
+                results[position] = entry.versions[bisect_left(timestamps, timestamps[index - 1])]
+        return results
+
+    def heads(self) -> dict[str, str]:
+        """Return the latest version of every lineage with a ``follows`` relation.
+
+        Reads the backend's head index when it has one; otherwise every
+        lineage is resolved in bulk, as in :meth:`get_latest_versions`.
+
+        Returns:
+            Mapping of root ID to the ID of its latest version.
+        """
+        if self._storage.supports_head_index:
+            return self._storage.get_heads()
+        return self._resolve_heads()
+
+    def rebuild_heads(self) -> dict[str, str]:
+        """Rebuild the head index from the stored relations and drop cached chains.
+
+        Backends without a head index re-resolve every lineage instead,
+        leaving the chain cache warm.
+
+        Returns:
+            Mapping of root ID to the ID of its latest version.
+        """
+        self.invalidate()
+        if self._storage.supports_head_index:
+            return self._storage.rebuild_head_index()
+        return self._resolve_heads()
+
+    def verify_heads(self, *, repair: bool = True) -> dict[str, tuple[str | None, str | None]]:
+        """Check each recorded head against a fresh traversal of its chain.
+
+        Checks the backend's head index, including lineages it has no head
+        for, or the cached heads for backends without one.
+
+        Args:
+            repair: Rebuild the head index and drop stale cached chains.
+
+        Returns:
+            Mapping of root ID to ``(recorded_head_id, actual_head_id)`` for
+            every stale head. Either is None where there is no head: the
+            index lacks the lineage, or the root no longer exists.
+        """
+        recorded: dict[str, str | None]
+        if self._storage.supports_head_index:
+            recorded = dict.fromkeys(self._root_ids())
+            recorded.update(self._storage.get_heads())
+        else:
+            with self._lock:
+                recorded = {
+                    entry.root_id: entry.head.id
+                    for entry in self._entries.values()
+                    if entry.head is not None
+                }
+        stale: dict[str, tuple[str | None, str | None]] = {}
+        for root_id, head_id in recorded.items():
+            root = self._storage.get_minion(root_id)
+            try:
+                actual = self._latest(self._build_entry(root), root_id).id if root else None
+            except ValueError:
+                # A cycle leaves the lineage without a head.
+                actual = None
+            if head_id != actual:
+                stale[root_id] = (head_id, actual)
+        if repair and stale:
+            if self._storage.supports_head_index:
+                self._storage.rebuild_head_index()
+            with self._lock:
+                for root_id in stale:
+                    self._drop_chains_containing(root_id)
+        return stale
+
+    def _root_ids(self) -> list[str]:
+        """Return every stored root of a lineage with a ``follows`` relation."""
+        follows = self._storage.get_relations(type="follows")
+        sources = {rel.source_id for rel in follows}
+        candidates = [id for id in dict.fromkeys(rel.target_id for rel in follows) if id not in sources]
+        return [id for id, minion in zip(candidates, self._storage.get_minions(candidates)) if minion]
+
+    def _resolve_heads(self) -> dict[str, str]:
+        entries = self._entries_for(self._root_ids())
+        return {root_id: self._latest(entry, root_id).id for root_id, entry in entries.items()}
+
+    def invalidate(self) -> None:
+        """Drop every cached chain."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._root_of.clear()
+            self._chains_by_member.clear()
+
+    # ─── Storage change events ────────────────────────────────────────────────
+
+    def on_minion_saved(self, minion: Minion) -> None:
+        with self._lock:
+            roots = self._chains_by_member.get(minion.id)
+            if roots:
+                entries = [self._entries[root_id] for root_id in roots]
+                entry = entries[0]
+                index = next(i for i, m in enumerate(entry.versions) if m.id == minion.id)
+                # Compare with the recorded timestamp, not the cached minion:
+                # the caller may have mutated and re-saved that same object.
+                if entry.timestamps[index] != _created_at(minion):
+                    # A moved timestamp reorders the chain; rebuild it from
+                    # storage so it matches a fresh traversal exactly.
+                    self._drop_chains_containing(minion.id)
+                    return
+                self._generation += 1
+                for entry in entries:
+                    self._replace_member(entry, minion)
+                return
+            if not self._entries or minion.minion_type_id not in _VERSION_TYPE_IDS:
+                return
+        # A version saved after the relations pointing at it joins those
+        # chains now; traversal skipped it while it was missing. Other
+        # minions, such as scorer results, never need the lookup.
+        for rel in self._storage.get_relations(source_id=minion.id, type="follows"):
+            with self._lock:
+                self._drop_chains_containing(rel.target_id)
+
+    def on_relation_saved(self, relation: Relation) -> None:
+        if relation.type != "follows":
+            return
+        with self._lock:
+            if relation.source_id in self._chains_by_member:
+                appendable = None
+            else:
+                appendable = self._chains_by_member.get(relation.target_id)
+            generation = self._generation
+        if appendable and len(appendable) == 1:
+            # The common case: a brand-new version follows a cached chain.
+            # Append it and move the head instead of dropping the chain.
+            minion = self._storage.get_minion(relation.source_id)
+            if (
+                minion is not None
+                and not self._storage.get_relations(target_id=minion.id, type="follows")
+                and self._storage.get_relations(source_id=minion.id, type="follows") == [relation]
+            ):
+                with self._lock:
+                    if generation == self._generation and not self._chains_by_member.get(minion.id):
+                        (root_id,) = appendable
+                        if self._append_version(self._entries[root_id], minion, relation.target_id):
+                            return
+        with self._lock:
+            self._drop_chains_containing(relation.source_id)
+            self._drop_chains_containing(relation.target_id)
+            self._root_of.pop(relation.source_id, None)
+
+    def on_cleared(self) -> None:
+        self.invalidate()
+
+    # ─── Internals ────────────────────────────────────────────────────────────
+
+    def _entry(self, prompt_id: str) -> _ChainEntry:
+        if self._cache_enabled:
+            self._sync_external()
+            with self._lock:
+                root_id = self._root_of.get(prompt_id)
+                if root_id is not None:
+                    return self._touch(root_id)
+                generation = self._generation
+
+        root = self._find_root(prompt_id)
+        if self._cache_enabled:
+            with self._lock:
+                entry = self._entries.get(root.id)
+                if entry is not None:
+                    self._remember(entry, prompt_id)
+                    return entry
+
+        entry = self._build_entry(root)
+        if self._cache_enabled:
+            entry = self._publish(entry, prompt_id, generation)
+        return entry
+
+    def _publish(self, entry: _ChainEntry, prompt_id: str, generation: int) -> _ChainEntry:
+        with self._lock:
+            existing = self._entries.get(entry.root_id)
+            if existing is not None:
+                self._remember(existing, prompt_id)
+                return existing
+            # Only publish if no write happened while traversing.
+            if generation == self._generation:
+                self._entries[entry.root_id] = entry
+                for member_id in entry.member_ids:
+                    self._chains_by_member.setdefault(member_id, set()).add(entry.root_id)
+                self._remember(entry, prompt_id)
+                while len(self._entries) > self._max_chains:
+                    self._drop_entry(next(iter(self._entries)))
+        return entry
+
+    def _touch(self, root_id: str) -> _ChainEntry:
+        """Return a cached entry, marking it most recently used."""
+        entry = self._entries[root_id] = self._entries.pop(root_id)
+        return entry
+
+    def _sync_external(self) -> None:
+        """Drop every cached chain if the backend reports writes made elsewhere."""
+        version = self._storage.external_version()
+        with self._lock:
+            if version != self._external_version:
+                self._external_version = version
+                self.invalidate()
+
+    def _entries_for(self, prompt_ids: Iterable[str]) -> dict[str, _ChainEntry]:
+        found: dict[str, _ChainEntry] = {}
+        pending = list(dict.fromkeys(prompt_ids))
+        generation = 0
+        if self._cache_enabled:
+            self._sync_external()
+            with self._lock:
+                generation = self._generation
+                unresolved = []
+                for prompt_id in pending:
+                    root_id = self._root_of.get(prompt_id)
+                    if root_id is None:
+                        unresolved.append(prompt_id)
+                    else:
+                        found[prompt_id] = self._touch(root_id)
+                pending = unresolved
+        if not pending:
+            return found
+
+        parent_of: dict[str, str] = {}
+        children_of: dict[str, list[str]] = {}
+        for rel in self._storage.get_relations(type="follows"):
+            # The first relation wins, as in _find_root; children keep
+            # insertion order, as in _build_entry's traversal.
+            parent_of.setdefault(rel.source_id, rel.target_id)
+            children_of.setdefault(rel.target_id, []).append(rel.source_id)
+
+        roots: dict[str, str] = {}
+        root_of = {prompt_id: _forest_root(prompt_id, parent_of, roots) for prompt_id in pending}
+
+        reachable: dict[str, list[str]] = {}
+        for root_id in dict.fromkeys(root_of.values()):
+            reachable[root_id] = _descendant_ids(root_id, children_of)
+        all_ids = [id for ids in reachable.values() for id in ids]
+        minions = dict(zip(all_ids, self._storage.get_minions(all_ids)))
+
+        built: dict[str, _ChainEntry] = {}
+        for root_id in reachable:
+            root = minions.get(root_id)
+            if root is None:
+                raise ValueError(f"Minion not found: {root_id}")
+            built[root_id] = _forest_entry(root, children_of, minions)
+
+        for prompt_id, root_id in root_of.items():
+            entry = built[root_id]
+            if self._cache_enabled:
+                entry = self._publish(entry, prompt_id, generation)
+            found[prompt_id] = entry
+        return found
+
+    def _latest(self, entry: _ChainEntry, prompt_id: str) -> Minion:
+        head = entry.head
+        if head is None:
+            if not entry.versions:
+                raise ValueError(f"No version chain found for prompt {prompt_id}")
+            leaf_nodes = [m for m in entry.versions if m.id in entry.leaf_ids]
+            head = entry.head = max(leaf_nodes, key=_created_at)
+        return head
+
+    def _build_entry(self, root: Minion) -> _ChainEntry:
+        descendants, relations = self._storage.get_descendant_graph(root.id, type="follows")
+        chain = [root, *descendants]
+        chain.sort(key=_created_at)
+        member_ids = {m.id for m in chain}
+        return _ChainEntry(
+            root_id=root.id,
+            versions=chain,
+            timestamps=[_created_at(m) for m in chain],
+            member_ids=member_ids,
+            leaf_ids=member_ids - {rel.target_id for rel in relations},
+        )
+
+    def _remember(self, entry: _ChainEntry, prompt_id: str) -> None:
+        entry.lookup_ids.add(prompt_id)
+        self._root_of[prompt_id] = entry.root_id
+
+    def _replace_member(self, entry: _ChainEntry, minion: Minion) -> None:
+        # Same created_at, so the order is unchanged. Swap in a new list so
+        # readers never see a half-updated chain.
+        entry.versions = [minion if m.id == minion.id else m for m in entry.versions]
+        if entry.head is not None and entry.head.id == minion.id:
+            entry.head = minion
+
+    def _append_version(self, entry: _ChainEntry, minion: Minion, parent_id: str) -> bool:
+        """Append a new leaf version in place; False if the chain must be rebuilt instead."""
+        created_at = _created_at(minion)
+        index = bisect_left(entry.timestamps, created_at)
+        if index < len(entry.timestamps) and entry.timestamps[index] == created_at:
+            # Equal timestamps keep traversal order, which only a fresh
+            # build knows, so the order and head are left to a rebuild.
+            return False
+        self._generation += 1
+        entry.versions = entry.versions[:index] + [minion] + entry.versions[index:]
+        entry.timestamps = entry.timestamps[:index] + [created_at] + entry.timestamps[index:]
+        entry.member_ids = entry.member_ids | {minion.id}
+        entry.leaf_ids = (entry.leaf_ids - {parent_id}) | {minion.id}
+        head = entry.head
+        if head is not None:
+            if head.id == parent_id:
+                entry.head = None
+            elif created_at > _created_at(head):
+                entry.head = minion
+        self._chains_by_member[minion.id] = {entry.root_id}
+        return True
+
+    def _drop_chains_containing(self, member_id: str) -> None:
+        roots = self._chains_by_member.get(member_id)
+        if not roots:
+            return
+        self._generation += 1
+        for root_id in list(roots):
+            self._drop_entry(root_id)
 
-        candidates.sort(key=lambda m: datetime.fromisoformat(m.created_at), reverse=True)
-        return candidates[0]
+    def _drop_entry(self, root_id: str) -> None:
+        entry = self._entries.pop(root_id)
+        for lookup_id in entry.lookup_ids:
+            self._root_of.pop(lookup_id, None)
+        for other_id in entry.member_ids:
+            other_roots = self._chains_by_member.get(other_id)
+            if other_roots is not None:
+                other_roots.discard(root_id)
+                if not other_roots:
+                    del self._chains_by_member[other_id]
 
     def _find_root(self, start_id: str) -> Minion:
         """Walk backwards via follows to find the chain root."""
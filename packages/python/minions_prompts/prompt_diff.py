@@ -1,17 +1,47 @@
 """
-PromptDiff — field-level and line-level diff between two prompt versions.
+PromptDiff — field-level and line-, word- or character-level diff between two prompt versions.
 """
 
 from __future__ import annotations
 
 import json
+import math
+import re
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from typing import Literal
 from minions import Minion
 from .types import DiffResult, DiffLine
 
+DiffAlgorithm = Literal["myers", "lcs"]
+DiffGranularity = Literal["line", "word", "char"]
+
+# (minion, content, tokens, interned token IDs)
+_Prepared = tuple[Minion, str, list[str], list[int]]
+
+_WORD_RE = re.compile(r"\w+|\s+|[^\w\s]")
+
+MYERS_MIN_COST = 256
+"""Edit distance a Myers middle-snake search always explores before it may
+settle for a good-enough split; larger inputs allow ``sqrt(N + M)``."""
+
 
 class PromptDiff:
     """Computes structured diffs between two prompt minions.
 
+    Args:
+        algorithm: Line-diff engine. ``"myers"`` (default) runs in
+            O((N+M)·D) time and linear space, where D is the number of
+            changed lines; lines found on only one side are set aside first,
+            and past an edit cost of ``MYERS_MIN_COST`` (or sqrt(N+M)) the
+            search splits at its furthest-reaching path, so heavy rewrites
+            stay fast but may not be minimal. ``"lcs"`` fills the full
+            dynamic-programming table and is always minimal.
+        granularity: Unit of the content diff. ``"line"`` (default) yields one
+            DiffLine per line; ``"word"`` and ``"char"`` yield DiffLine spans
+            of consecutive words (and whitespace) or characters that were
+            added, removed or kept. Joining the non-``add`` spans gives the
+            old content and the non-``remove`` spans the new content.
+
     Example::
 
         differ = PromptDiff()
@@ -19,6 +49,19 @@ class PromptDiff:
         print(differ.format(result, colored=True))
     """
 
+    def __init__(
+        self,
+        algorithm: DiffAlgorithm = "myers",
+        *,
+        granularity: DiffGranularity = "line",
+    ) -> None:
+        if algorithm not in ("myers", "lcs"):
+            raise ValueError(f"Unknown diff algorithm: {algorithm}")
+        if granularity not in ("line", "word", "char"):
+            raise ValueError(f"Unknown diff granularity: {granularity}")
+        self.algorithm = algorithm
+        self.granularity = granularity
+
     def diff(self, v1: Minion, v2: Minion) -> DiffResult:
         """Compute the difference between two prompt minions.
 
@@ -29,6 +72,57 @@ class PromptDiff:
         Returns:
             A structured DiffResult.
         """
+        interned: dict[str, int] = {}
+        return self._diff_prepared(self._prepare(v1, interned), self._prepare(v2, interned))
+
+    def diff_chain(self, versions: Iterable[Minion]) -> Iterator[DiffResult]:
+        """Diff every adjacent pair in a version chain, lazily.
+
+        Each version's content is split and interned once, with one intern
+        table shared across the whole chain, so a chain of N versions costs
+        N splits instead of 2·(N−1).
+
+        Args:
+            versions: Minions in chain order, e.g. from ``PromptChain.get_version_chain``.
+
+        Yields:
+            DiffResult for ``versions[i]`` → ``versions[i + 1]``, in order.
+        """
+        interned: dict[str, int] = {}
+        previous: _Prepared | None = None
+        for version in versions:
+            current = self._prepare(version, interned)
+            if previous is not None:
+                yield self._diff_prepared(previous, current)
+            previous = current
+
+    def cumulative_diff(self, versions: Sequence[Minion]) -> DiffResult:
+        """Diff the first version of a chain against the last (root to leaf).
+
+        Args:
+            versions: Minions in chain order; must not be empty.
+
+        Returns:
+            DiffResult from ``versions[0]`` to ``versions[-1]``.
+        """
+        if not versions:
+            raise ValueError("Cannot diff an empty version chain")
+        return self.diff(versions[0], versions[-1])
+
+    def _prepare(self, version: Minion, interned: dict[str, int]) -> _Prepared:
+        text = str((version.fields or {}).get("content", "") or "")
+        if self.granularity == "line":
+            tokens = text.split("\n")
+        elif self.granularity == "word":
+            tokens = _WORD_RE.findall(text)
+        else:
+            tokens = list(text)
+        ids = [interned.setdefault(token, len(interned)) for token in tokens]
+        return version, text, tokens, ids
+
+    def _diff_prepared(self, p1: _Prepared, p2: _Prepared) -> DiffResult:
+        v1, text1, tokens1, ids1 = p1
+        v2, text2, tokens2, ids2 = p2
         f1 = v1.fields or {}
         f2 = v2.fields or {}
 
@@ -51,11 +145,23 @@ class PromptDiff:
         if v1.title != v2.title:
             changed.append({"field": "title", "from": v1.title, "to": v2.title})
 
-        content1 = f1.get("content", "") or ""
-        content2 = f2.get("content", "") or ""
-        content_diff = self._line_diff(str(content1), str(content2))
+        if self.granularity == "line":
+            if text1 == text2:
+                content_diff = [DiffLine(type="context", text=line) for line in tokens1]
+            else:
+                content_diff = self._diff_ids(tokens1, tokens2, ids1, ids2)
+        elif text1 == text2:
+            content_diff = [DiffLine(type="context", text=text1)] if text1 else []
+        else:
+            content_diff = _merge_spans(self._diff_ids(tokens1, tokens2, ids1, ids2))
 
-        return DiffResult(added=added, removed=removed, changed=changed, content_diff=content_diff)
+        return DiffResult(
+            added=added,
+            removed=removed,
+            changed=changed,
+            content_diff=content_diff,
+            granularity=self.granularity,
+        )
 
     def format(self, result: DiffResult, *, colored: bool = False) -> str:
         """Format a DiffResult as a human-readable string.
@@ -82,7 +188,18 @@ class PromptDiff:
                 continue
             lines.append(f"{YELLOW}~ [{item['field']}] {json.dumps(item['from'])} → {json.dumps(item['to'])}{RESET}")
 
-        if result.content_diff:
+        if result.content_diff and result.granularity != "line":
+            lines.append("--- content ---")
+            inline = []
+            for span in result.content_diff:
+                if span.type == "add":
+                    inline.append(f"{GREEN}{{+{span.text}+}}{RESET}")
+                elif span.type == "remove":
+                    inline.append(f"{RED}[-{span.text}-]{RESET}")
+                else:
+                    inline.append(span.text)
+            lines.append("".join(inline))
+        elif result.content_diff:
             lines.append("--- content ---")
             for line in result.content_diff:
                 if line.type == "add":
@@ -94,35 +211,51 @@ class PromptDiff:
 
         return "\n".join(lines)
 
-    def _line_diff(self, text1: str, text2: str) -> list[DiffLine]:
-        lines1 = text1.split("\n")
-        lines2 = text2.split("\n")
-        lcs = self._compute_lcs(lines1, lines2)
+    def _diff_ids(
+        self,
+        lines1: list[str],
+        lines2: list[str],
+        ids1: list[int],
+        ids2: list[int],
+    ) -> list[DiffLine]:
+        """Diff two line lists whose lines were interned to integer IDs.
+
+        The identical head and tail are emitted as context directly; only the
+        differing middle goes through the diff engine, comparing ints.
+        """
+        n1, n2 = len(ids1), len(ids2)
+        head = 0
+        while head < n1 and head < n2 and ids1[head] == ids2[head]:
+            head += 1
+        tail = 0
+        while tail < n1 - head and tail < n2 - head and ids1[n1 - 1 - tail] == ids2[n2 - 1 - tail]:
+            tail += 1
 
-        result: list[DiffLine] = []
+        a = ids1[head : n1 - tail]
+        b = ids2[head : n2 - tail]
+        if self.algorithm == "myers":
+            lcs = [a[i] for i, _ in _myers_matches(a, b)]
+        else:
+            lcs = self._compute_lcs(a, b)
+
+        result = [DiffLine(type="context", text=line) for line in lines1[:head]]
         i = j = k = 0
-        while i < len(lines1) or j < len(lines2):
-            if (
-                i < len(lines1)
-                and j < len(lines2)
-                and k < len(lcs)
-                and lines1[i] == lcs[k]
-                and lines2[j] == lcs[k]
-            ):
-                result.append(DiffLine(type="context", text=lines1[i]))
+        while i < len(a) or j < len(b):
+            if i < len(a) and j < len(b) and k < len(lcs) and a[i] == lcs[k] and b[j] == lcs[k]:
+                result.append(DiffLine(type="context", text=lines1[head + i]))
                 i += 1
                 j += 1
                 k += 1
-            elif j < len(lines2) and (k >= len(lcs) or lines2[j] != lcs[k]):
-                result.append(DiffLine(type="add", text=lines2[j]))
+            elif j < len(b) and (k >= len(lcs) or b[j] != lcs[k]):
+                result.append(DiffLine(type="add", text=lines2[head + j]))
                 j += 1
-            elif i < len(lines1):
-                result.append(DiffLine(type="remove", text=lines1[i]))
+            elif i < len(a):
+                result.append(DiffLine(type="remove", text=lines1[head + i]))
                 i += 1
-
+        result.extend(DiffLine(type="context", text=line) for line in lines1[n1 - tail :])
         return result
 
-    def _compute_lcs(self, a: list[str], b: list[str]) -> list[str]:
+    def _compute_lcs(self, a: Sequence[Hashable], b: Sequence[Hashable]) -> list[Hashable]:
         m, n = len(a), len(b)
         dp = [[0] * (n + 1) for _ in range(m + 1)]
         for i in range(1, m + 1):
@@ -132,7 +265,7 @@ class PromptDiff:
                 else:
                     dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
 
-        lcs: list[str] = []
+        lcs: list[Hashable] = []
         i, j = m, n
         while i > 0 and j > 0:
             if a[i - 1] == b[j - 1]:
@@ -146,3 +279,136 @@ class PromptDiff:
 
         lcs.reverse()
         return lcs
+
+
+def _merge_spans(tokens: list[DiffLine]) -> list[DiffLine]:
+    """Join runs of same-typed token entries into single spans."""
+    spans: list[DiffLine] = []
+    run: list[str] = []
+    for token in tokens:
+        if spans and run and spans[-1].type != token.type:
+            spans[-1].text = "".join(run)
+            run = []
+        if not run:
+            spans.append(DiffLine(type=token.type, text=""))
+        run.append(token.text)
+    if run:
+        spans[-1].text = "".join(run)
+    return spans
+
+
+# ─── Myers diff ───────────────────────────────────────────────────────────────
+
+
+def _myers_matches(a: Sequence, b: Sequence) -> list[tuple[int, int]]:
+    """Return index pairs of a longest common subsequence of ``a`` and ``b``.
+
+    Uses Myers' O((N+M)·D) algorithm with the linear-space middle-snake
+    refinement, so memory stays proportional to the input size. Items that
+    appear in only one sequence can never match, so they are dropped before
+    the search and the result is mapped back to the original indices.
+    """
+    common = set(a).intersection(b)
+    if not common:
+        return []
+    a_index = [i for i, item in enumerate(a) if item in common]
+    b_index = [j for j, item in enumerate(b) if item in common]
+    a_kept = [a[i] for i in a_index]
+    b_kept = [b[j] for j in b_index]
+    max_cost = max(MYERS_MIN_COST, math.isqrt(len(a_kept) + len(b_kept)))
+    matches: list[tuple[int, int]] = []
+    _myers_range(a_kept, 0, len(a_kept), b_kept, 0, len(b_kept), matches, max_cost)
+    return [(a_index[i], b_index[j]) for i, j in matches]
+
+
+def _myers_range(
+    a: Sequence,
+    a_lo: int,
+    a_hi: int,
+    b: Sequence,
+    b_lo: int,
+    b_hi: int,
+    matches: list[tuple[int, int]],
+    max_cost: int,
+) -> None:
+    while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+        matches.append((a_lo, b_lo))
+        a_lo += 1
+        b_lo += 1
+    suffix: list[tuple[int, int]] = []
+    while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+        a_hi -= 1
+        b_hi -= 1
+        suffix.append((a_hi, b_hi))
+
+    # With both ends trimmed, a non-empty range needs at least two edits, so
+    # the middle snake always splits it into two strictly smaller ranges.
+    if a_lo < a_hi and b_lo < b_hi:
+        x, y, u, v = _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi, max_cost)
+        _myers_range(a, a_lo, x, b, b_lo, y, matches, max_cost)
+        matches.extend((x + k, y + k) for k in range(u - x))
+        _myers_range(a, u, a_hi, b, v, b_hi, matches, max_cost)
+
+    matches.extend(reversed(suffix))
+
+
+def _middle_snake(
+    a: Sequence, a_lo: int, a_hi: int, b: Sequence, b_lo: int, b_hi: int, max_cost: int
+) -> tuple[int, int, int, int]:
+    """Find the middle snake of an optimal edit path, as (x, y, u, v) in absolute indices.
+
+    Once the search passes ``max_cost`` edits in each direction without the
+    paths meeting, the last snake of the furthest-reaching forward path is
+    returned instead. It splits the range into two strictly smaller ones.
+    """
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    delta = n - m
+    odd = delta % 2 == 1
+    max_d = (n + m + 1) // 2
+    offset = max_d + 1
+    forward = [0] * (2 * offset + 1)
+    backward = [0] * (2 * offset + 1)
+    best = (-1, 0, 0, 0, 0)
+
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and forward[offset + k - 1] < forward[offset + k + 1]):
+                x = forward[offset + k + 1]
+            else:
+                x = forward[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            forward[offset + k] = x
+            kb = delta - k
+            if odd and -(d - 1) <= kb <= d - 1 and x + backward[offset + kb] >= n:
+                return a_lo + x0, b_lo + y0, a_lo + x, b_lo + y
+            if x + y > best[0] and x <= n and 0 <= y <= m:
+                best = (x + y, x0, y0, x, y)
+
+        for kb in range(-d, d + 1, 2):
+            if kb == -d or (kb != d and backward[offset + kb - 1] < backward[offset + kb + 1]):
+                x = backward[offset + kb + 1]
+            else:
+                x = backward[offset + kb - 1] + 1
+            y = x - kb
+            x0, y0 = x, y
+            while x < n and y < m and a[a_hi - 1 - x] == b[b_hi - 1 - y]:
+                x += 1
+                y += 1
+            backward[offset + kb] = x
+            k = delta - kb
+            if not odd and -d <= k <= d and x + forward[offset + k] >= n:
+                return a_hi - x, b_hi - y, a_hi - x0, b_hi - y0
+
+        if d >= max_cost:
+            # The paths have not met, so the edit distance exceeds 2·d and
+            # the forward path is still short of the end: both halves shrink.
+            _, x0, y0, x, y = best
+            return a_lo + x0, b_lo + y0, a_lo + x, b_lo + y
+        best = (-1, 0, 0, 0, 0)
+
+    raise AssertionError("unreachable: no middle snake found")
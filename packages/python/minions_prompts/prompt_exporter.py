@@ -4,6 +4,7 @@ PromptExporter — export prompt templates to external formats.
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 from minions import Minion, Relation
@@ -48,6 +49,29 @@ class PromptExporter:
         content = str((prompt.fields or {}).get("content", "") or "")
         return self._renderer.render(content, variables or {}, strict=False)
 
+    def to_raw_many(
+        self,
+        prompt_id: str,
+        rows: Iterable[dict[str, Any] | None],
+        *,
+        workers: int | None = None,
+    ) -> Iterator[str]:
+        """Render the prompt once per variable set, lazily and in order.
+
+        Args:
+            prompt_id: The ID of the prompt to render.
+            rows: Variable dicts, one per rendered output.
+            workers: Worker processes for large batches (see ``PromptRenderer.render_many``).
+
+        Returns:
+            An iterator of rendered prompt strings.
+        """
+        prompt = self._storage.get_minion(prompt_id)
+        if not prompt:
+            raise ValueError(f"Prompt not found: {prompt_id}")
+        content = str((prompt.fields or {}).get("content", "") or "")
+        return self._renderer.render_many(content, rows, workers=workers)
+
     def to_lang_chain(self, prompt_id: str) -> LangChainExport:
         """Export to LangChain PromptTemplate format.
 
@@ -4,9 +4,49 @@ PromptRenderer — variable interpolation engine for prompt templates.
 
 from __future__ import annotations
 
+import io
+import os
 import re
 import json
-from typing import Any
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Union
+
+from .types import VariableManifest
+
+_EACH_RE = re.compile(r"\{\{#each\s+(\w+)\}\}([\s\S]*?)\{\{/each\}\}")
+_IF_RE = re.compile(r"\{\{#if\s+(\w+)\}\}([\s\S]*?)\{\{/if\}\}")
+_VAR_RE = re.compile(r"(?<!\\)\{\{([^#/][^}]*?)\}\}")
+_IF_TAG_RE = re.compile(r"\{\{#if\s+\w+\}\}|\{\{/if\}\}")
+_IF_OPEN_RE = re.compile(r"\{\{#if\s+(\w+)\}\}")
+# Matches a trailing fragment that may still grow into an ``{{#if name}}`` tag.
+_IF_OPEN_PREFIX_RE = re.compile(r"\{(?:\{(?:#(?:i(?:f(?:\s+(?:\w+\}?)?)?)?)?)?)?\Z")
+_IF_CLOSE = "{{/if}}"
+# A complete placeholder opener; only a later ``}`` can decide its match.
+_VAR_OPEN_RE = re.compile(r"\{\{[^#/}]")
+
+# A text fragment ending in one of these could combine with whatever follows
+# it into a new placeholder (or escape one), so it must not sit next to a
+# block boundary in a compiled template.
+_OPEN_TAIL_RE = re.compile(r"(?:\\|\{|\{\{\}?[^}]*\}?)\Z")
+
+# Text a streamed regex pass holds back at a complete opening tag is
+# rescanned on every new fragment until it grows past this many characters;
+# after that, only when a fragment could close the tag.
+_STREAM_HOLD = 256
+
+_EACH_MARK = "\x00"
+_THIS = "{{this}}"
+
+COMPILE_CACHE_SIZE = 512
+"""Maximum number of compiled templates kept by :meth:`PromptRenderer.compile`."""
+
+MANIFEST_CACHE_SIZE = 1024
+"""Maximum number of variable manifests kept by :meth:`PromptRenderer.variable_manifest`."""
 
 
 class RendererError(Exception):
@@ -21,6 +61,556 @@ class RendererError(Exception):
         self.missing_variables = missing_variables or []
 
 
+# ─── Nodes ────────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True, slots=True)
+class _Var:
+    key: str
+    raw: str
+
+
+@dataclass(frozen=True, slots=True)
+class _If:
+    name: str
+    body: tuple[_Node, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class _Each:
+    name: str
+    body: tuple[_Node, ...]
+    keys: frozenset[str]
+    uses_this: bool
+
+
+_Node = Union[str, _Var, _If, _Each]
+
+
+class CompiledTemplate:
+    """A prompt template parsed once into text, variable, if and each nodes.
+
+    Rendering walks the node list instead of re-scanning the template with
+    regular expressions, and produces exactly the same output as the
+    regex-based passes. Templates whose blocks are ambiguous (nested ``#if``
+    blocks, tags split across block boundaries) and each-items whose values
+    contain braces or backslashes are rendered with the regex passes instead.
+
+    Obtain instances through :meth:`PromptRenderer.compile`.
+
+    Example::
+
+        compiled = PromptRenderer().compile("Hello, {{name}}!")
+        compiled.render({"name": "World"})
+        # → "Hello, World!"
+    """
+
+    __slots__ = ("template", "_nodes", "_eaches")
+
+    def __init__(self, template: str) -> None:
+        self.template = template
+        self._nodes = _parse(template)
+        self._eaches: tuple[_Each, ...] = (
+            tuple(_collect_eaches(self._nodes)) if self._nodes is not None else ()
+        )
+
+    @property
+    def is_compiled(self) -> bool:
+        """Whether the template was parsed into nodes (False means regex fallback)."""
+        return self._nodes is not None
+
+    def render(self, variables: dict[str, Any] | None = None) -> str:
+        """Render the compiled template with the given variables.
+
+        Args:
+            variables: Key/value pairs to substitute.
+
+        Returns:
+            The rendered string.
+        """
+        variables = variables or {}
+        if self._nodes is None or not self._items_safe(variables):
+            return _render_passes(self.template, variables)
+        out: list[str] = []
+        _emit(self._nodes, variables, None, out)
+        return "".join(out).replace("\\{{", "{{")
+
+    def iter_render(self, variables: dict[str, Any] | None = None) -> Iterator[str]:
+        """Render the compiled template as a stream of fragments.
+
+        Joining the fragments gives exactly :meth:`render`'s output. When the
+        template or its each-items need the regex passes, those passes are
+        streamed too: output is held back only while a tag that may still be
+        completed by later text is open.
+
+        Args:
+            variables: Key/value pairs to substitute.
+
+        Yields:
+            Consecutive pieces of the rendered output.
+        """
+        variables = variables or {}
+        if self._nodes is None or not self._items_safe(variables):
+            yield from _iter_render_passes(self.template, variables)
+            return
+        yield from _unescape_stream(_iter_nodes(self._nodes, variables, None))
+
+    def _items_safe(self, variables: dict[str, Any]) -> bool:
+        """Check that no each-item value can be re-read as template syntax."""
+        for node in self._eaches:
+            collection = variables.get(node.name)
+            if not isinstance(collection, list):
+                continue
+            for item in collection:
+                if isinstance(item, dict):
+                    for key in node.keys:
+                        if key in item and not _is_inert(_stringify(item[key])):
+                            return False
+                elif node.uses_this and not _is_inert(str(item)):
+                    return False
+        return True
+
+
+def _emit(nodes: tuple[_Node, ...], variables: dict[str, Any], item: Any, out: list[str]) -> None:
+    for node in nodes:
+        if type(node) is str:
+            out.append(node)
+        elif type(node) is _Var:
+            out.append(_resolve(node, variables, item))
+        elif type(node) is _If:
+            if _is_truthy(variables.get(node.name)):
+                _emit(node.body, variables, item, out)
+        else:
+            collection = variables.get(node.name)
+            if isinstance(collection, list):
+                for each_item in collection:
+                    _emit(node.body, variables, (each_item,), out)
+
+
+def _iter_nodes(nodes: tuple[_Node, ...], variables: dict[str, Any], item: Any) -> Iterator[str]:
+    for node in nodes:
+        if type(node) is str:
+            yield node
+        elif type(node) is _Var:
+            yield _resolve(node, variables, item)
+        elif type(node) is _If:
+            if _is_truthy(variables.get(node.name)):
+                yield from _iter_nodes(node.body, variables, item)
+        else:
+            collection = variables.get(node.name)
+            if isinstance(collection, list):
+                for each_item in collection:
+                    yield from _iter_nodes(node.body, variables, (each_item,))
+
+
+def _unescape_stream(fragments: Iterator[str]) -> Iterator[str]:
+    """Apply the ``\\{{`` → ``{{`` unescape to a stream, across fragment boundaries."""
+    carry = ""
+    for fragment in fragments:
+        text = carry + fragment
+        # Hold back a trailing prefix of ``\{{`` until the next fragment.
+        keep = 2 if text.endswith("\\{") else 1 if text.endswith("\\") else 0
+        carry = text[len(text) - keep:]
+        text = text[: len(text) - keep]
+        if text:
+            yield text.replace("\\{{", "{{")
+    if carry:
+        yield carry
+
+
+def _resolve(node: _Var, variables: dict[str, Any], item: Any) -> str:
+    # ``item`` is None outside each blocks, else a 1-tuple holding the item.
+    if item is not None:
+        value = item[0]
+        if isinstance(value, dict):
+            if node.key in value:
+                return _stringify(value[node.key])
+        elif node.raw == _THIS:
+            return str(value)
+    if node.key in variables:
+        return _stringify(variables[node.key])
+    return node.raw
+
+
+# ─── Parsing ──────────────────────────────────────────────────────────────────
+
+
+class _Uncompilable(Exception):
+    pass
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile(template: str) -> CompiledTemplate:
+    return CompiledTemplate(template)
+
+
+@lru_cache(maxsize=MANIFEST_CACHE_SIZE)
+def _manifest(template: str) -> VariableManifest:
+    nodes = _compile(template)._nodes
+    uses = _node_uses(nodes, None) if nodes is not None else _template_uses(template)
+    variables: dict[str, None] = {}
+    groups: dict[str, dict[str, None]] = {"var": {}, "if": {}, "each": {}}
+    items: dict[str, dict[str, None]] = {}
+    for kind, name, scope in uses:
+        variables[name] = None
+        if kind == "var" and scope is not None:
+            items.setdefault(scope, {})[name] = None
+        else:
+            groups[kind][name] = None
+    return VariableManifest(
+        variables=tuple(variables),
+        scalars=tuple(groups["var"]),
+        conditionals=tuple(groups["if"]),
+        collections=tuple(groups["each"]),
+        item_variables=tuple((name, tuple(names)) for name, names in items.items()),
+    )
+
+
+def _node_uses(nodes: tuple[_Node, ...], scope: str | None) -> Iterator[tuple[str, str, str | None]]:
+    """Yield ``(kind, name, each scope)`` for every name a node tree uses, in order."""
+    for node in nodes:
+        if type(node) is _Var:
+            yield "var", node.key, scope
+        elif type(node) is _If:
+            yield "if", node.name, None
+            yield from _node_uses(node.body, scope)
+        elif type(node) is _Each:
+            yield "each", node.name, None
+            yield from _node_uses(node.body, node.name)
+
+
+def _template_uses(template: str) -> Iterator[tuple[str, str, str | None]]:
+    """Like :func:`_node_uses`, for templates only the regex passes can render."""
+    uses: list[tuple[int, str, str, str | None]] = []
+    blocks = list(_EACH_RE.finditer(template))
+    for m in _VAR_RE.finditer(template):
+        block = next((b for b in blocks if b.start(2) <= m.start() < b.end(2)), None)
+        uses.append((m.start(), "var", m.group(1).strip(), block and block.group(1)))
+    uses += [(m.start(), "if", m.group(1), None) for m in _IF_OPEN_RE.finditer(template)]
+    uses += [(b.start(), "each", b.group(1), None) for b in blocks]
+    for _, kind, name, scope in sorted(uses, key=lambda use: use[0]):
+        yield kind, name, scope
+
+
+def _parse(template: str) -> tuple[_Node, ...] | None:
+    """Parse a template into nodes, or return None if only the regex passes are exact."""
+    if _EACH_MARK in template:
+        return None
+    eaches: list[re.Match] = []
+
+    def mark(match: re.Match) -> str:
+        eaches.append(match)
+        return _EACH_MARK
+
+    skeleton = _EACH_RE.sub(mark, template)
+    try:
+        return tuple(_parse_region(skeleton, iter(eaches)))
+    except _Uncompilable:
+        return None
+
+
+def _parse_region(text: str, eaches: Any) -> list[_Node]:
+    nodes: list[_Node] = []
+    pos = 0
+    for m in _IF_RE.finditer(text):
+        before = text[pos:m.start()]
+        body = m.group(2)
+        _check_tail(before)
+        _check_tail(body)
+        nodes.extend(_parse_text(before, eaches))
+        nodes.append(_If(m.group(1), tuple(_parse_text(body, eaches, in_if=True))))
+        pos = m.end()
+    nodes.extend(_parse_text(text[pos:], eaches))
+    return nodes
+
+
+def _parse_text(text: str, eaches: Any, *, in_if: bool = False) -> list[_Node]:
+    if _IF_TAG_RE.search(text):
+        raise _Uncompilable
+    pieces = text.split(_EACH_MARK)
+    nodes = _parse_vars(pieces[0])
+    for piece in pieces[1:]:
+        match = next(eaches)
+        body = match.group(2)
+        # An if block around an each block would be closed by the first
+        # ``{{/if}}`` inside the expanded items.
+        if in_if and _IF_TAG_RE.search(body):
+            raise _Uncompilable
+        nodes.append(_parse_each(match.group(1), body))
+        nodes.extend(_parse_vars(piece))
+    return nodes
+
+
+def _parse_each(name: str, body: str) -> _Each:
+    _check_tail(body)
+    body_nodes = tuple(_parse_region(body, iter(())))
+    keys: set[str] = set()
+    this_tokens = 0
+    for var in _collect_vars(body_nodes):
+        keys.add(var.key)
+        this_tokens += var.raw == _THIS
+    # Scalar items substitute ``{{this}}`` by plain string replacement, so
+    # every occurrence must be a placeholder of its own.
+    if this_tokens != body.count(_THIS):
+        raise _Uncompilable
+    # Placeholders inside each blocks are substituted twice (item, then
+    # outer variables); the text before each one must not be able to merge
+    # with what follows if it renders to nothing.
+    prev: _Node | None = None
+    for node in _walk(body_nodes):
+        if type(node) is _Var and type(prev) is str:
+            _check_tail(prev)
+        prev = node
+    return _Each(name, body_nodes, frozenset(keys), this_tokens > 0)
+
+
+def _parse_vars(text: str) -> list[_Node]:
+    _check_tail(text)
+    nodes: list[_Node] = []
+    pos = 0
+    for m in _VAR_RE.finditer(text):
+        if m.start() > pos:
+            nodes.append(text[pos:m.start()])
+        nodes.append(_Var(m.group(1).strip(), m.group(0)))
+        pos = m.end()
+    if pos < len(text):
+        nodes.append(text[pos:])
+    return nodes
+
+
+def _check_tail(text: str) -> None:
+    if _OPEN_TAIL_RE.search(text):
+        raise _Uncompilable
+
+
+def _walk(nodes: tuple[_Node, ...]):
+    for node in nodes:
+        yield node
+        if type(node) in (_If, _Each):
+            yield from _walk(node.body)
+
+
+def _collect_vars(nodes: tuple[_Node, ...]) -> list[_Var]:
+    return [node for node in _walk(nodes) if type(node) is _Var]
+
+
+def _collect_eaches(nodes: tuple[_Node, ...]) -> list[_Each]:
+    return [node for node in _walk(nodes) if type(node) is _Each]
+
+
+# ─── Regex passes ─────────────────────────────────────────────────────────────
+
+
+def _render_passes(template: str, variables: dict[str, Any]) -> str:
+    result = template
+    result = _process_each_blocks(result, variables)
+    result = _process_if_blocks(result, variables)
+    result = _process_variables(result, variables)
+    result = result.replace(r"\{{", "{{")
+    return result
+
+
+def _process_each_blocks(template: str, variables: dict[str, Any]) -> str:
+    def replace_each(match: re.Match) -> str:
+        return "".join(_iter_each(match, variables))
+
+    return _EACH_RE.sub(replace_each, template)
+
+
+def _iter_each(match: re.Match, variables: dict[str, Any]) -> Iterator[str]:
+    collection = variables.get(match.group(1))
+    if not isinstance(collection, list):
+        return
+    body = match.group(2)
+    for item in collection:
+        if isinstance(item, dict):
+            yield _process_variables(body, item)
+        else:
+            yield body.replace("{{this}}", str(item))
+
+
+def _process_if_blocks(template: str, variables: dict[str, Any]) -> str:
+    return _IF_RE.sub(_if_replacer(variables), template)
+
+
+def _if_replacer(variables: dict[str, Any]) -> Any:
+    def replace_if(match: re.Match) -> str:
+        name = match.group(1)
+        body = match.group(2)
+        value = variables.get(name)
+        return body if _is_truthy(value) else ""
+
+    return replace_if
+
+
+def _process_variables(template: str, variables: dict[str, Any]) -> str:
+    return _VAR_RE.sub(_var_replacer(variables), template)
+
+
+def _var_replacer(variables: dict[str, Any]) -> Any:
+    def replace_var(match: re.Match) -> str:
+        key = match.group(1).strip()
+        if key in variables:
+            return _stringify(variables[key])
+        return match.group(0)
+
+    return replace_var
+
+
+# ─── Streamed regex passes ────────────────────────────────────────────────────
+
+
+def _iter_render_passes(template: str, variables: dict[str, Any]) -> Iterator[str]:
+    """Stream :func:`_render_passes`, one each-item at a time."""
+    fragments = _iter_each_blocks(template, variables)
+    fragments = _stream_sub(
+        fragments, _IF_RE, _if_replacer(variables), _if_pending, _IF_OPEN_RE, _IF_CLOSE
+    )
+    fragments = _stream_sub(
+        fragments, _VAR_RE, _var_replacer(variables), _var_pending, _VAR_OPEN_RE, "}"
+    )
+    return _unescape_stream(fragments)
+
+
+def _iter_each_blocks(template: str, variables: dict[str, Any]) -> Iterator[str]:
+    pos = 0
+    for match in _EACH_RE.finditer(template):
+        yield template[pos:match.start()]
+        yield from _iter_each(match, variables)
+        pos = match.end()
+    yield template[pos:]
+
+
+def _stream_sub(
+    fragments: Iterator[str],
+    pattern: re.Pattern,
+    repl: Any,
+    pending: Any,
+    opener: re.Pattern,
+    closer: str,
+) -> Iterator[str]:
+    """Apply ``pattern.sub(repl, ...)`` to a stream, exactly as to the joined text.
+
+    Text is held back from the first ``{`` at which ``pending`` says a match
+    could still start and end in text not seen yet. One character before it
+    is kept as context for look-behinds. A long held region that starts at
+    a complete ``opener`` is rescanned only once a fragment contains
+    ``closer``, which every match ends with; anything else is rescanned on
+    every fragment, so output up to the first pending position flows on.
+    """
+    held: list[str] = []
+    held_len = 0
+    emitted = 0  # Leading characters of the held text already yielded.
+    waiting = False  # Whether the held text starts at a complete opener.
+    tail = ""
+    for fragment in fragments:
+        if not fragment:
+            continue
+        held.append(fragment)
+        held_len += len(fragment)
+        window = tail + fragment
+        tail = window[-len(closer):]
+        if waiting and held_len > _STREAM_HOLD and closer not in window:
+            continue
+        text = "".join(held)
+        out, stop = _sub_until_pending(text, emitted, pattern, repl, pending)
+        if out:
+            yield out
+        keep = max(stop - 1, 0)
+        held = [text[keep:]]
+        held_len = len(text) - keep
+        emitted = stop - keep
+        waiting = opener.match(held[0], emitted) is not None
+    if held:
+        out, _ = _sub_until_pending("".join(held), emitted, pattern, repl, None)
+        if out:
+            yield out
+
+
+def _sub_until_pending(
+    text: str,
+    pos: int,
+    pattern: re.Pattern,
+    repl: Any,
+    pending: Any,
+) -> tuple[str, int]:
+    """Substitute matches in ``text[pos:]`` up to the first undecided position.
+
+    Returns the output and the position where it stopped. With ``pending``
+    None, the text is final and everything is substituted.
+    """
+    out: list[str] = []
+    stop = _first_pending(text, pos, pending) if pending else None
+    while stop != pos:
+        m = pattern.search(text, pos)
+        if m is None or (stop is not None and m.start() >= stop):
+            end = len(text) if stop is None else stop
+            out.append(text[pos:end])
+            pos = end
+            break
+        out.append(text[pos:m.start()])
+        out.append(repl(m))
+        pos = m.end()
+        if stop is not None and stop < pos:
+            stop = _first_pending(text, pos, pending)
+    return "".join(out), pos
+
+
+def _first_pending(text: str, start: int, pending: Any) -> int | None:
+    i = text.find("{", start)
+    while i != -1:
+        if pending(text, i):
+            return i
+        i = text.find("{", i + 1)
+    return None
+
+
+def _if_pending(text: str, i: int) -> bool:
+    """Whether an ``#if`` block starting at ``i`` may still match with more text."""
+    if _IF_OPEN_PREFIX_RE.match(text, i):
+        return True
+    opening = _IF_OPEN_RE.match(text, i)
+    return opening is not None and text.find(_IF_CLOSE, opening.end()) == -1
+
+
+def _var_pending(text: str, i: int) -> bool:
+    """Whether a placeholder starting at ``i`` may still match with more text."""
+    if text[i - 1:i] == "\\":
+        return False
+    if i + 2 >= len(text):
+        return text[i + 1:i + 2] in ("", "{")
+    if text[i + 1] != "{" or text[i + 2] in "#/":
+        return False
+    # ``[^}]*?\}\}`` fails or succeeds at the first ``}`` after the name.
+    close = text.find("}", i + 3)
+    return close == -1 or close + 1 == len(text)
+
+
+def _render_chunk(template: str, rows: list[dict[str, Any]]) -> list[str]:
+    compiled = _compile(template)
+    return [compiled.render(row) for row in rows]
+
+
+def _stringify(val: Any) -> str:
+    if val is None:
+        return ""
+    if isinstance(val, (dict, list)):
+        return json.dumps(val)
+    return str(val)
+
+
+def _is_inert(text: str) -> bool:
+    return "{" not in text and "}" not in text and "\\" not in text
+
+
+def _is_truthy(value: Any) -> bool:
+    if value is None or value is False or value == "" or value == 0:
+        return False
+    if isinstance(value, list) and len(value) == 0:
+        return False
+    return True
+
+
 class PromptRenderer:
     """Renders prompt templates with variable substitution and block support.
 
@@ -29,6 +619,9 @@ class PromptRenderer:
     - ``{{#if variable}}...{{/if}}`` — conditional blocks
     - ``{{#each array}}...{{/each}}`` — iteration blocks
 
+    Templates are compiled once and kept in a bounded LRU cache keyed by
+    template text, so repeated renders of the same template skip parsing.
+
     Example::
 
         renderer = PromptRenderer()
@@ -62,21 +655,170 @@ class PromptRenderer:
             RendererError: If required variables are missing.
         """
         variables = variables or {}
-        required_variables = required_variables or []
+        self._check_required(variables, required_variables)
+        return self.compile(template).render(variables)
 
-        missing = [v for v in required_variables if variables.get(v) is None]
-        if missing:
-            raise RendererError(
-                f"Missing required variables: {', '.join(missing)}",
-                missing_variables=missing,
-            )
+    def compile(self, template: str) -> CompiledTemplate:
+        """Parse a template once for repeated rendering.
+
+        Results are cached by template text (up to ``COMPILE_CACHE_SIZE`` entries).
+
+        Args:
+            template: The prompt template string.
+
+        Returns:
+            A CompiledTemplate whose ``render`` matches :meth:`render`.
+        """
+        return _compile(template)
+
+    def render_many(
+        self,
+        template: str,
+        rows: Iterable[dict[str, Any] | None],
+        *,
+        required_variables: list[str] | None = None,
+        workers: int | None = None,
+        executor: Executor | None = None,
+        chunk_size: int = 256,
+    ) -> Iterator[str]:
+        """Render one template against many variable sets.
+
+        The template is compiled once and rendered strings are yielded lazily,
+        in input order. With ``workers`` greater than 1 or an ``executor``,
+        rows are sent in chunks to a pool; only a few chunks per worker are
+        in flight at a time, so ``rows`` may be an unbounded iterator.
+
+        Args:
+            template: The prompt template string.
+            rows: Variable dicts, one per rendered output.
+            required_variables: Variables that must be present in every row.
+            workers: Number of worker processes; ``None`` or 1 renders in-process.
+            executor: An existing thread or process pool to render on instead.
+                It is not shut down afterwards.
+            chunk_size: Rows per task sent to a worker.
+
+        Yields:
+            The rendered string for each row.
+
+        Raises:
+            RendererError: When a row is missing required variables. Raised
+                lazily, when that row is reached.
+        """
+        if executor is None and (not workers or workers <= 1):
+            compiled = self.compile(template)
+            for row in rows:
+                row = row or {}
+                self._check_required(row, required_variables)
+                yield compiled.render(row)
+            return
+
+        def chunks() -> Iterator[list[dict[str, Any]]]:
+            it = iter(rows)
+            while chunk := list(islice(it, chunk_size)):
+                chunk = [row or {} for row in chunk]
+                for row in chunk:
+                    self._check_required(row, required_variables)
+                yield chunk
+
+        own_pool = executor is None
+        pool = ProcessPoolExecutor(max_workers=workers) if own_pool else executor
+        max_pending = (workers or os.cpu_count() or 1) * 2
+        pending: deque[Future[list[str]]] = deque()
+        try:
+            for chunk in chunks():
+                pending.append(pool.submit(_render_chunk, template, chunk))
+                if len(pending) >= max_pending:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            if own_pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                for future in pending:
+                    future.cancel()
+
+    def render_iter(
+        self,
+        template: str,
+        variables: dict[str, Any] | None = None,
+        *,
+        required_variables: list[str] | None = None,
+    ) -> Iterator[str]:
+        """Render a template as a stream of fragments instead of one string.
+
+        ``"".join(render_iter(...))`` equals :meth:`render` byte for byte, but
+        large ``{{#each}}`` expansions are never held in memory all at once.
+
+        Args:
+            template: The prompt template string.
+            variables: Key/value pairs to substitute.
+            required_variables: Variables that must be present; raises RendererError if missing.
+
+        Returns:
+            An iterator over consecutive pieces of the rendered output.
+
+        Raises:
+            RendererError: If required variables are missing.
+        """
+        variables = variables or {}
+        self._check_required(variables, required_variables)
+        return self.compile(template).iter_render(variables)
+
+    def render_to(
+        self,
+        template: str,
+        variables: dict[str, Any] | None,
+        sink: Any,
+        *,
+        required_variables: list[str] | None = None,
+        encoding: str = "utf-8",
+        buffer_size: int = 65536,
+    ) -> int:
+        """Stream a rendered template into a file-like object or socket.
+
+        Text files receive ``str`` writes; binary files and sockets (anything
+        with ``sendall``) receive bytes encoded with ``encoding``. Fragments are
+        coalesced into writes of roughly ``buffer_size`` characters.
+
+        Args:
+            template: The prompt template string.
+            variables: Key/value pairs to substitute.
+            sink: Destination with a ``write`` or ``sendall`` method.
+            required_variables: Variables that must be present; raises RendererError if missing.
+            encoding: Encoding used for binary sinks.
+            buffer_size: Approximate number of characters per write.
 
-        result = template
-        result = self._process_each_blocks(result, variables)
-        result = self._process_if_blocks(result, variables)
-        result = self._process_variables(result, variables)
-        result = result.replace(r"\{{", "{{")
-        return result
+        Returns:
+            The number of characters rendered.
+
+        Raises:
+            RendererError: If required variables are missing.
+        """
+        if hasattr(sink, "sendall"):
+            def write(text: str) -> None:
+                sink.sendall(text.encode(encoding))
+        elif isinstance(sink, (io.RawIOBase, io.BufferedIOBase)):
+            def write(text: str) -> None:
+                sink.write(text.encode(encoding))
+        else:
+            write = sink.write
+
+        total = 0
+        buffered: list[str] = []
+        pending = 0
+        for fragment in self.render_iter(template, variables, required_variables=required_variables):
+            buffered.append(fragment)
+            pending += len(fragment)
+            if pending >= buffer_size:
+                write("".join(buffered))
+                total += pending
+                buffered.clear()
+                pending = 0
+        if buffered:
+            write("".join(buffered))
+            total += pending
+        return total
 
     def extract_variables(self, template: str) -> list[str]:
         """Extract all variable names referenced in a template.
@@ -87,63 +829,27 @@ class PromptRenderer:
         Returns:
             List of unique variable names.
         """
-        names: set[str] = set()
-
-        for m in re.finditer(r"\{\{([^#/][^}]*?)\}\}", template):
-            names.add(m.group(1).strip())
+        return list(self.variable_manifest(template).variables)
 
-        for m in re.finditer(r"\{\{#if\s+(\w+)\}\}", template):
-            names.add(m.group(1).strip())
+    def variable_manifest(self, template: str) -> VariableManifest:
+        """Describe how a template uses each of its variables.
 
-        for m in re.finditer(r"\{\{#each\s+(\w+)\}\}", template):
-            names.add(m.group(1).strip())
+        The manifest is computed once per template text and cached (up to
+        ``MANIFEST_CACHE_SIZE`` entries).
 
-        return list(names)
+        Args:
+            template: The prompt template string.
 
-    def _process_each_blocks(self, template: str, variables: dict[str, Any]) -> str:
-        def replace_each(match: re.Match) -> str:
-            name = match.group(1)
-            body = match.group(2)
-            collection = variables.get(name)
-            if not isinstance(collection, list):
-                return ""
-            parts = []
-            for item in collection:
-                if isinstance(item, dict):
-                    parts.append(self._process_variables(body, item))
-                else:
-                    parts.append(body.replace("{{this}}", str(item)))
-            return "".join(parts)
-
-        return re.sub(r"\{\{#each\s+(\w+)\}\}([\s\S]*?)\{\{/each\}\}", replace_each, template)
-
-    def _process_if_blocks(self, template: str, variables: dict[str, Any]) -> str:
-        def replace_if(match: re.Match) -> str:
-            name = match.group(1)
-            body = match.group(2)
-            value = variables.get(name)
-            return body if self._is_truthy(value) else ""
-
-        return re.sub(r"\{\{#if\s+(\w+)\}\}([\s\S]*?)\{\{/if\}\}", replace_if, template)
-
-    def _process_variables(self, template: str, variables: dict[str, Any]) -> str:
-        def replace_var(match: re.Match) -> str:
-            key = match.group(1).strip()
-            if key in variables:
-                val = variables[key]
-                if val is None:
-                    return ""
-                if isinstance(val, (dict, list)):
-                    return json.dumps(val)
-                return str(val)
-            return match.group(0)
-
-        return re.sub(r"(?<!\\)\{\{([^#/][^}]*?)\}\}", replace_var, template)
+        Returns:
+            A VariableManifest listing scalar, ``#if`` and ``#each`` variables.
+        """
+        return _manifest(template)
 
     @staticmethod
-    def _is_truthy(value: Any) -> bool:
-        if value is None or value is False or value == "" or value == 0:
-            return False
-        if isinstance(value, list) and len(value) == 0:
-            return False
-        return True
+    def _check_required(variables: dict[str, Any], required_variables: list[str] | None) -> None:
+        missing = [v for v in required_variables or [] if variables.get(v) is None]
+        if missing:
+            raise RendererError(
+                f"Missing required variables: {', '.join(missing)}",
+                missing_variables=missing,
+            )
@@ -4,14 +4,25 @@ PromptScorer — execute test cases against prompt versions and produce scored r
 
 from __future__ import annotations
 
+import math
+import os
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
 from typing import Any
 
 from minions import Minion, create_minion, generate_id, now, Relation
 
+from .analytics import rank_versions
+from .evaluation import Evaluator, run_evaluations
 from .storage import PromptStorage
-from .schemas import prompt_result_type
-from .prompt_renderer import PromptRenderer
-from .types import TestRunResult, ComparisonResult
+from .schemas import prompt_leaderboard_type, prompt_result_type
+from .render_cache import RenderCache, content_hash
+from .result_table import ResultTable
+from .sequential import SequentialProbabilityRatioTest
+from .types import TestRunResult, ComparisonResult, Leaderboard, RenderedPrompt, SequentialComparison
+
+_MAX_CHUNK_SIZE = 64
+"""Upper bound on tests per task when a suite renders on a pool."""
 
 
 class PromptScorer:
@@ -19,6 +30,12 @@ class PromptScorer:
 
     Args:
         storage: The storage backend to use.
+        result_table: Also append every recorded result to this columnar table.
+        save_result_minions: Save prompt-result minions and their relations to
+            ``storage``. Set to False to record results in ``result_table`` only.
+        render_cache: Cache of rendered prompts to use; pass one cache to
+            several scorers to share renders. Defaults to a new
+            :class:`~minions_prompts.render_cache.RenderCache`.
 
     Example::
 
@@ -31,9 +48,20 @@ class PromptScorer:
         )
     """
 
-    def __init__(self, storage: PromptStorage) -> None:
+    def __init__(
+        self,
+        storage: PromptStorage,
+        *,
+        result_table: ResultTable | None = None,
+        save_result_minions: bool = True,
+        render_cache: RenderCache | None = None,
+    ) -> None:
+        if result_table is None and not save_result_minions:
+            raise ValueError("save_result_minions=False requires a result_table")
         self._storage = storage
-        self._renderer = PromptRenderer()
+        self._render_cache = render_cache if render_cache is not None else RenderCache()
+        self._result_table = result_table
+        self._save_result_minions = save_result_minions
 
     def run_test(
         self,
@@ -58,83 +86,118 @@ class PromptScorer:
         Returns:
             A TestRunResult with the created prompt-result minion.
         """
-        prompt = self._storage.get_minion(prompt_id)
-        test = self._storage.get_minion(test_id)
-        if not prompt:
-            raise ValueError(f"Prompt not found: {prompt_id}")
-        if not test:
-            raise ValueError(f"Test not found: {test_id}")
-
-        content = (prompt.fields or {}).get("content", "") or ""
-        input_variables = (test.fields or {}).get("inputVariables", {}) or {}
-
-        rendered_prompt = self._renderer.render(str(content), dict(input_variables), strict=False)
-
-        result_minion, _ = create_minion(
-            {
-                "title": f"Result: {test.title} on {prompt.title}",
-                "fields": {
-                    "renderedPrompt": rendered_prompt,
-                    "output": output,
-                    "scores": scores,
-                    "metadata": metadata,
-                    "passed": passed,
-                },
-            },
-            prompt_result_type,
-        )
-        self._storage.save_minion(result_minion)
-
-        # Create references
-        for target_id in [test_id, prompt_id]:
-            rel = Relation(
-                id=generate_id(),
-                source_id=result_minion.id,
-                target_id=target_id,
-                type="references",
-                created_at=now(),
-            )
-            self._storage.save_relation(rel)
-
-        return TestRunResult(
-            prompt_id=prompt_id,
-            test_id=test_id,
-            rendered_prompt=rendered_prompt,
+        prompt = self._get_prompt(prompt_id)
+        test = self._get_test(test_id)
+        [rendered_prompt] = self._render_all(prompt, [test])
+        result, relations = _build_result(
+            prompt,
+            test,
+            rendered_prompt.text,
+            prompt_hash=rendered_prompt.hash,
             scores=scores,
             passed=passed,
-            result=result_minion,
+            output=output,
+            metadata=metadata,
         )
+        if self._save_result_minions:
+            self._storage.save_minion(result.result)
+            for rel in relations:
+                self._storage.save_relation(rel)
+        if self._result_table is not None:
+            self._result_table.extend([result])
+        return result
 
     def run_test_suite(
         self,
         prompt_id: str,
         test_ids: list[str],
-        evaluations: list[dict[str, Any]],
+        evaluations: list[dict[str, Any]] | None = None,
+        *,
+        evaluator: Evaluator | None = None,
+        concurrency: int = 8,
+        timeout: float | None = None,
+        retries: int = 0,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> list[TestRunResult]:
         """Run multiple test cases against a prompt.
 
+        Scores come either precomputed in ``evaluations`` or from an
+        ``evaluator``, which the scorer calls with each rendered prompt and
+        its prompt-test minion (see :func:`~minions_prompts.evaluation.evaluate_all`).
+
+        With ``max_workers`` greater than 1 or an ``executor``, prompts not
+        already in the render cache are rendered concurrently, in chunks.
+        Results keep the order of ``test_ids`` and are saved in one batch
+        once every prompt is rendered.
+
         Args:
             prompt_id: The ID of the prompt to test.
             test_ids: List of test-case IDs.
             evaluations: List of evaluation dicts with ``scores`` and ``passed`` keys.
+            evaluator: Sync or async callable returning an evaluation dict
+                for ``(rendered_prompt, test)``. Replaces ``evaluations``.
+            concurrency: Maximum evaluator calls in flight.
+            timeout: Seconds allowed per evaluator call.
+            retries: Extra attempts for a failed or timed-out evaluator call.
+            max_workers: Worker processes to use; ``None`` or 1 runs in-process.
+            executor: An existing thread or process pool to use instead; with
+                an evaluator, it runs the sync evaluator calls. It is not
+                shut down afterwards.
 
         Returns:
             List of TestRunResult objects.
+
+        Raises:
+            ValueError: If both or neither of ``evaluations`` and ``evaluator``
+                are given.
+            EvaluationError: If an evaluator call still fails after all retries.
+                Nothing is saved in that case.
         """
-        results = []
-        for test_id, evaluation in zip(test_ids, evaluations):
-            results.append(
-                self.run_test(
-                    prompt_id,
-                    test_id,
-                    scores=evaluation.get("scores", {}),
-                    passed=evaluation.get("passed", False),
-                    output=evaluation.get("output"),
-                    metadata=evaluation.get("metadata"),
-                )
+        if (evaluations is None) == (evaluator is None):
+            raise ValueError("Pass exactly one of evaluations or evaluator")
+        if evaluator is not None:
+            prompt = self._get_prompt(prompt_id)
+            tests = [self._get_test(test_id) for test_id in test_ids]
+            rendered = self._render_all(prompt, tests, workers=max_workers, executor=executor)
+            evaluations = run_evaluations(
+                evaluator,
+                [r.text for r in rendered],
+                tests,
+                concurrency=concurrency,
+                timeout=timeout,
+                retries=retries,
+                executor=executor,
+            )
+            results, relations = _build_results(prompt, tests, evaluations, rendered)
+        else:
+            results, relations = self._build_suite(
+                prompt_id, test_ids, evaluations, max_workers=max_workers, executor=executor
             )
+        self._flush(results, relations)
         return results
 
+    def render_tests(
+        self,
+        prompt_id: str,
+        test_ids: list[str],
+        *,
+        workers: int | None = None,
+    ) -> list[str]:
+        """Render a prompt against the input variables of many tests, without recording results.
+
+        Args:
+            prompt_id: The ID of the prompt to render.
+            test_ids: List of test-case IDs.
+            workers: Worker processes for large batches (see ``PromptRenderer.render_many``).
+
+        Returns:
+            Rendered prompts, in the same order as ``test_ids``.
+        """
+        prompt = self._get_prompt(prompt_id)
+        tests = [self._get_test(test_id) for test_id in test_ids]
+        return [r.text for r in self._render_all(prompt, tests, workers=workers)]
+
     def compare_versions(
         self,
         v1_id: str,
@@ -142,6 +205,9 @@ class PromptScorer:
         test_ids: list[str],
         v1_evaluations: list[dict[str, Any]],
         v2_evaluations: list[dict[str, Any]],
+        *,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
     ) -> list[ComparisonResult]:
         """Run A/B comparison between two versions against the same tests.
 
@@ -151,35 +217,465 @@ class PromptScorer:
             test_ids: List of test IDs to run against both.
             v1_evaluations: Evaluations for v1.
             v2_evaluations: Evaluations for v2.
+            max_workers: Worker processes to use; see :meth:`run_test_suite`.
+            executor: An existing pool to use; see :meth:`run_test_suite`.
 
         Returns:
             List of ComparisonResult objects.
         """
-        v1_results = self.run_test_suite(v1_id, test_ids, v1_evaluations)
-        v2_results = self.run_test_suite(v2_id, test_ids, v2_evaluations)
-
-        comparisons = []
-        for i, test_id in enumerate(test_ids):
-            v1_result = v1_results[i]
-            v2_result = v2_results[i]
-
-            all_dims = set(v1_result.scores) | set(v2_result.scores)
-            deltas = {
-                dim: v2_result.scores.get(dim, 0) - v1_result.scores.get(dim, 0)
-                for dim in all_dims
-            }
-            total_delta = sum(deltas.values())
-            winner = "v2" if total_delta > 0 else "v1" if total_delta < 0 else "tie"
-
-            comparisons.append(
-                ComparisonResult(
-                    v1_id=v1_id,
-                    v2_id=v2_id,
-                    test_id=test_id,
-                    v1_result=v1_result,
-                    v2_result=v2_result,
-                    deltas=deltas,
-                    winner=winner,
+        own_pool = executor is None and max_workers is not None and max_workers > 1
+        if own_pool:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            v1_results, v1_relations = self._build_suite(
+                v1_id, test_ids, v1_evaluations, max_workers=max_workers, executor=executor
+            )
+            v2_results, v2_relations = self._build_suite(
+                v2_id, test_ids, v2_evaluations, max_workers=max_workers, executor=executor
+            )
+        finally:
+            if own_pool:
+                executor.shutdown(cancel_futures=True)
+        self._flush(v1_results + v2_results, v1_relations + v2_relations)
+
+        return _compare_results(v1_id, v2_id, test_ids, v1_results, v2_results)
+
+    def compare_versions_sequential(
+        self,
+        v1_id: str,
+        v2_id: str,
+        test_ids: list[str],
+        evaluations: Iterable[tuple[dict[str, Any], dict[str, Any]]] | None = None,
+        *,
+        evaluator: Evaluator | None = None,
+        timeout: float | None = None,
+        retries: int = 0,
+        win_rate: float = 0.6,
+        alpha: float = 0.05,
+        beta: float = 0.05,
+    ) -> SequentialComparison:
+        """Compare two versions test by test, stopping once a winner is decided.
+
+        Paired evaluations are consumed lazily, one test at a time, and fed
+        to a :class:`~minions_prompts.sequential.SequentialProbabilityRatioTest`.
+        Each look renders only its own test. Nothing more is rendered,
+        pulled from ``evaluations`` or asked of ``evaluator`` after the test
+        decides, so a generator that calls the model on demand skips the
+        remaining calls. Only the evaluated pairs are recorded.
+
+        Args:
+            v1_id: ID of the baseline version.
+            v2_id: ID of the comparison version.
+            test_ids: Test IDs, in the order to evaluate them.
+            evaluations: Iterable of ``(v1_evaluation, v2_evaluation)`` pairs.
+            evaluator: Callable scoring each rendered prompt instead, as in
+                :meth:`run_test_suite`. Both versions of a test are evaluated
+                concurrently, or once if they render identically.
+            timeout: Seconds allowed per evaluator call.
+            retries: Extra attempts for a failed or timed-out evaluator call.
+            win_rate: Win probability of the better version to detect.
+            alpha: Error rate for wrongly declaring v2 the winner.
+            beta: Error rate for wrongly declaring v1 the winner.
+
+        Returns:
+            A SequentialComparison.
+
+        Raises:
+            ValueError: If both or neither of ``evaluations`` and ``evaluator``
+                are given.
+        """
+        if (evaluations is None) == (evaluator is None):
+            raise ValueError("Pass exactly one of evaluations or evaluator")
+        sprt = SequentialProbabilityRatioTest(win_rate=win_rate, alpha=alpha, beta=beta)
+        v1 = self._get_prompt(v1_id)
+        v2 = self._get_prompt(v2_id)
+        tests = [self._get_test(test_id) for test_id in test_ids]
+        pending = iter(evaluations) if evaluations is not None else None
+
+        results: list[TestRunResult] = []
+        relations: list[Relation] = []
+        comparisons: list[ComparisonResult] = []
+        for test in tests:
+            [v1_prompt] = self._render_all(v1, [test])
+            [v2_prompt] = self._render_all(v2, [test])
+            if pending is None:
+                v1_eval, v2_eval = _evaluate_distinct(
+                    evaluator,
+                    [v1_prompt, v2_prompt],
+                    [test, test],
+                    concurrency=2,
+                    timeout=timeout,
+                    retries=retries,
                 )
+            else:
+                pair = next(pending, None)
+                if pair is None:
+                    break
+                v1_eval, v2_eval = pair
+            v1_results, v1_relations = _build_results(v1, [test], [v1_eval], [v1_prompt])
+            v2_results, v2_relations = _build_results(v2, [test], [v2_eval], [v2_prompt])
+            results += v1_results + v2_results
+            relations += v1_relations + v2_relations
+            comparisons += _compare_results(v1_id, v2_id, [test.id], v1_results, v2_results)
+            if sprt.update(comparisons[-1].winner):
+                break
+        self._flush(results, relations)
+
+        # Versions with the same content render every test identically, so
+        # each skipped test would have cost one evaluation instead of two.
+        per_test = 1 if _content(v1) == _content(v2) else 2
+        skipped = len(tests) - len(comparisons) if sprt.decision is not None else 0
+        return SequentialComparison(
+            v1_id=v1_id,
+            v2_id=v2_id,
+            winner=sprt.decision or "tie",
+            decided=sprt.decision is not None,
+            log_likelihood_ratio=sprt.log_likelihood_ratio,
+            wins=dict(sprt.wins),
+            comparisons=comparisons,
+            evaluations_saved=per_test * skipped,
+        )
+
+    def run_leaderboard(
+        self,
+        version_ids: list[str],
+        test_ids: list[str],
+        evaluations: Mapping[str, list[dict[str, Any]]] | None = None,
+        *,
+        evaluator: Evaluator | None = None,
+        concurrency: int = 8,
+        timeout: float | None = None,
+        retries: int = 0,
+        method: str = "bradley-terry",
+    ) -> Leaderboard:
+        """Rank many versions against a shared test set, evaluating each once.
+
+        Every version runs the suite once; rankings come from the resulting
+        ``(versions, tests)`` score matrix, so the cost grows linearly with
+        the number of versions instead of with the number of pairs. Results
+        are recorded as in :meth:`run_test_suite`, and the rankings are saved
+        as a single prompt-leaderboard minion that ``references`` each ranked
+        version. Needs NumPy (the ``analytics`` extra).
+
+        Args:
+            version_ids: IDs of the versions to rank.
+            test_ids: The shared test-case IDs.
+            evaluations: Evaluation dicts per version ID, one per test.
+            evaluator: Callable scoring each rendered prompt instead, as in
+                :meth:`run_test_suite`. All versions are evaluated in one
+                bounded-concurrency batch; versions that render a test
+                identically share one call.
+            concurrency: Maximum evaluator calls in flight.
+            timeout: Seconds allowed per evaluator call.
+            retries: Extra attempts for a failed or timed-out evaluator call.
+            method: ``"bradley-terry"`` (pairwise strength, reported on the
+                Elo scale) or ``"mean"`` (mean summed score).
+
+        Returns:
+            A Leaderboard.
+
+        Raises:
+            ValueError: If both or neither of ``evaluations`` and ``evaluator``
+                are given, version IDs repeat, an evaluation list does not
+                match ``test_ids``, or ``method`` is unknown.
+        """
+        if (evaluations is None) == (evaluator is None):
+            raise ValueError("Pass exactly one of evaluations or evaluator")
+        if method not in ("mean", "bradley-terry"):
+            raise ValueError(f"Unknown ranking method: {method}")
+        if len(set(version_ids)) != len(version_ids):
+            raise ValueError("Leaderboard version IDs must be unique")
+        prompts = [self._get_prompt(version_id) for version_id in version_ids]
+        tests = [self._get_test(test_id) for test_id in test_ids]
+        rendered = [self._render_all(prompt, tests) for prompt in prompts]
+
+        if evaluator is not None:
+            flat = _evaluate_distinct(
+                evaluator,
+                [p for version in rendered for p in version],
+                tests * len(prompts),
+                concurrency=concurrency,
+                timeout=timeout,
+                retries=retries,
+            )
+            per_version = [flat[i * len(tests):(i + 1) * len(tests)] for i in range(len(prompts))]
+        else:
+            per_version = []
+            for version_id in version_ids:
+                version_evaluations = evaluations.get(version_id)
+                if version_evaluations is None or len(version_evaluations) != len(tests):
+                    raise ValueError(f"Expected {len(tests)} evaluations for version {version_id}")
+                per_version.append(version_evaluations)
+
+        results: list[list[TestRunResult]] = []
+        relations: list[Relation] = []
+        for prompt, version_rendered, version_evaluations in zip(prompts, rendered, per_version):
+            version_results, version_relations = _build_results(
+                prompt, tests, version_evaluations, version_rendered
+            )
+            results.append(version_results)
+            relations.extend(version_relations)
+
+        entries, wins = rank_versions(
+            version_ids,
+            [[sum(r.scores.values()) for r in version] for version in results],
+            [[r.passed for r in version] for version in results],
+            method=method,
+        )
+        record, _ = create_minion(
+            {
+                "title": f"Leaderboard: {len(version_ids)} versions on {len(tests)} tests",
+                "fields": {
+                    "method": method,
+                    "versionIds": list(version_ids),
+                    "testIds": list(test_ids),
+                    "rankings": [
+                        {
+                            "promptId": entry.prompt_id,
+                            "rank": entry.rank,
+                            "meanScore": entry.mean_score,
+                            "passRate": entry.pass_rate,
+                            "wins": entry.wins,
+                            "rating": entry.rating,
+                        }
+                        for entry in entries
+                    ],
+                },
+            },
+            prompt_leaderboard_type,
+        )
+        record_relations = [
+            Relation(
+                id=generate_id(),
+                source_id=record.id,
+                target_id=version_id,
+                type="references",
+                created_at=now(),
             )
-        return comparisons
+            for version_id in version_ids
+        ]
+        self._flush(
+            [r for version in results for r in version],
+            relations,
+            records=[record],
+            record_relations=record_relations,
+        )
+        return Leaderboard(
+            method=method,
+            test_ids=list(test_ids),
+            entries=entries,
+            win_matrix=wins.tolist(),
+            record=record,
+        )
+
+    def _get_prompt(self, prompt_id: str) -> Minion:
+        prompt = self._storage.get_minion(prompt_id)
+        if not prompt:
+            raise ValueError(f"Prompt not found: {prompt_id}")
+        return prompt
+
+    def _get_test(self, test_id: str) -> Minion:
+        test = self._storage.get_minion(test_id)
+        if not test:
+            raise ValueError(f"Test not found: {test_id}")
+        return test
+
+    def _render_all(
+        self,
+        prompt: Minion,
+        tests: list[Minion],
+        *,
+        workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> list[RenderedPrompt]:
+        if executor is None and (workers is None or workers <= 1):
+            return self._render_cache.render_many(_content(prompt), _test_rows(tests))
+        pool_size = workers or os.cpu_count() or 1
+        # A few chunks per worker keeps them busy without per-test overhead.
+        size = max(1, min(_MAX_CHUNK_SIZE, math.ceil(len(tests) / (pool_size * 4))))
+        return self._render_cache.render_many(
+            _content(prompt), _test_rows(tests), workers=workers, executor=executor, chunk_size=size
+        )
+
+    def _build_suite(
+        self,
+        prompt_id: str,
+        test_ids: list[str],
+        evaluations: list[dict[str, Any]],
+        *,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> tuple[list[TestRunResult], list[Relation]]:
+        prompt = self._get_prompt(prompt_id)
+        tests = [self._get_test(test_id) for test_id, _ in zip(test_ids, evaluations)]
+        evaluations = evaluations[: len(tests)]
+        # Only cache misses go to the pool; building results is cheap and
+        # stays in-process.
+        rendered = self._render_all(prompt, tests, workers=max_workers, executor=executor)
+        return _build_results(prompt, tests, evaluations, rendered)
+
+    def _flush(
+        self,
+        results: list[TestRunResult],
+        relations: list[Relation],
+        *,
+        records: list[Minion] | None = None,
+        record_relations: list[Relation] | None = None,
+    ) -> None:
+        """Write buffered result minions and relations with the bulk storage API.
+
+        ``records`` and ``record_relations`` are always saved, in the same
+        batch as the results, even when result minions go to a result table.
+        """
+        minions = list(records or ())
+        saved_relations = list(record_relations or ())
+        if self._save_result_minions:
+            minions = [r.result for r in results] + minions
+            saved_relations = relations + saved_relations
+        if minions or self._save_result_minions:
+            self._storage.save_minions(minions)
+            self._storage.save_relations(saved_relations)
+        if self._result_table is not None:
+            self._result_table.extend(results)
+
+
+def _content(prompt: Minion) -> str:
+    return str((prompt.fields or {}).get("content", "") or "")
+
+
+def _test_rows(tests: list[Minion]) -> list[dict[str, Any]]:
+    return [dict((test.fields or {}).get("inputVariables", {}) or {}) for test in tests]
+
+
+def _build_result(
+    prompt: Minion,
+    test: Minion,
+    rendered_prompt: str,
+    *,
+    scores: dict[str, float],
+    passed: bool,
+    output: str | None = None,
+    metadata: dict[str, Any] | None = None,
+    prompt_hash: str | None = None,
+) -> tuple[TestRunResult, list[Relation]]:
+    """Build a result minion plus its relations without saving them."""
+    if prompt_hash is None:
+        prompt_hash = content_hash(rendered_prompt)
+    result_minion, _ = create_minion(
+        {
+            "title": f"Result: {test.title} on {prompt.title}",
+            "fields": {
+                "renderedPrompt": rendered_prompt,
+                "promptHash": prompt_hash,
+                "output": output,
+                "scores": scores,
+                "metadata": metadata,
+                "passed": passed,
+            },
+        },
+        prompt_result_type,
+    )
+
+    # Create references
+    relations = [
+        Relation(
+            id=generate_id(),
+            source_id=result_minion.id,
+            target_id=target_id,
+            type="references",
+            created_at=now(),
+        )
+        for target_id in [test.id, prompt.id]
+    ]
+
+    result = TestRunResult(
+        prompt_id=prompt.id,
+        test_id=test.id,
+        rendered_prompt=rendered_prompt,
+        scores=scores,
+        passed=passed,
+        result=result_minion,
+        prompt_hash=prompt_hash,
+    )
+    return result, relations
+
+
+def _build_results(
+    prompt: Minion,
+    tests: list[Minion],
+    evaluations: list[dict[str, Any]],
+    rendered: list[RenderedPrompt],
+) -> tuple[list[TestRunResult], list[Relation]]:
+    """Build results for a run of already rendered tests."""
+    results: list[TestRunResult] = []
+    relations: list[Relation] = []
+    for test, rendered_prompt, evaluation in zip(tests, rendered, evaluations):
+        result, rels = _build_result(
+            prompt,
+            test,
+            rendered_prompt.text,
+            prompt_hash=rendered_prompt.hash,
+            scores=evaluation.get("scores", {}),
+            passed=evaluation.get("passed", False),
+            output=evaluation.get("output"),
+            metadata=evaluation.get("metadata"),
+        )
+        results.append(result)
+        relations.extend(rels)
+    return results, relations
+
+
+def _evaluate_distinct(
+    evaluator: Evaluator,
+    rendered: list[RenderedPrompt],
+    tests: list[Minion],
+    **options: Any,
+) -> list[dict[str, Any]]:
+    """Run ``evaluator`` once per distinct (prompt hash, test) pair and fan the results out."""
+    keys = [(r.hash, test.id) for r, test in zip(rendered, tests)]
+    distinct: dict[tuple[str, str], int] = {}
+    for i, key in enumerate(keys):
+        distinct.setdefault(key, i)
+    evaluations = run_evaluations(
+        evaluator,
+        [rendered[i].text for i in distinct.values()],
+        [tests[i] for i in distinct.values()],
+        **options,
+    )
+    by_key = dict(zip(distinct, evaluations))
+    return [dict(by_key[key]) for key in keys]
+
+
+def _compare_results(
+    v1_id: str,
+    v2_id: str,
+    test_ids: list[str],
+    v1_results: list[TestRunResult],
+    v2_results: list[TestRunResult],
+) -> list[ComparisonResult]:
+    """Pair up two suites' results and score each test's winner."""
+    comparisons = []
+    for i, test_id in enumerate(test_ids):
+        v1_result = v1_results[i]
+        v2_result = v2_results[i]
+
+        all_dims = set(v1_result.scores) | set(v2_result.scores)
+        deltas = {
+            dim: v2_result.scores.get(dim, 0) - v1_result.scores.get(dim, 0)
+            for dim in all_dims
+        }
+        total_delta = sum(deltas.values())
+        winner = "v2" if total_delta > 0 else "v1" if total_delta < 0 else "tie"
+
+        comparisons.append(
+            ComparisonResult(
+                v1_id=v1_id,
+                v2_id=v2_id,
+                test_id=test_id,
+                v1_result=v1_result,
+                v2_result=v2_result,
+                deltas=deltas,
+                winner=winner,
+            )
+        )
+    return comparisons
@@ -0,0 +1,193 @@
+"""
+RenderCache — content-addressed cache of rendered prompts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from concurrent.futures import Executor
+from typing import Any
+
+from .prompt_renderer import PromptRenderer
+from .types import RenderedPrompt
+
+RENDER_CACHE_SIZE = 4096
+"""Default maximum number of rendered prompts kept by a :class:`RenderCache`."""
+
+
+def content_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of ``text``, as stored in a result's ``promptHash``."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class _Unencodable(Exception):
+    """Raised for a value :func:`_encode` cannot represent losslessly."""
+
+
+def _encode(value: Any) -> Any:
+    """Encode ``value`` as JSON-ready data tagged with its exact type.
+
+    Tags keep values JSON would conflate apart: tuples from lists, ``1`` from
+    ``1.0`` and ``True``, and ``{1: ...}`` from ``{"1": ...}``. Mapping items
+    are ordered by their encoded key, so key order does not matter.
+    """
+    kind = type(value)
+    if value is None:
+        return ["n"]
+    if kind is str:
+        return ["s", value]
+    if kind is bool:
+        return ["b", value]
+    if kind is int:
+        return ["i", str(value)]
+    if kind is float:
+        return ["f", repr(value)]
+    if kind is list or kind is tuple:
+        return ["l" if kind is list else "t", [_encode(item) for item in value]]
+    if kind is dict:
+        items = [(_dumps(_encode(k)), _encode(v)) for k, v in value.items()]
+        items.sort(key=lambda item: item[0])
+        return ["d", items]
+    raise _Unencodable(kind.__name__)
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def variables_hash(variables: Mapping[str, Any] | None) -> str | None:
+    """Return a hash of ``variables`` that ignores key order.
+
+    Every value is encoded with its exact type, so two variable sets share
+    a hash only if they are equal and built from the same types. Only
+    ``None``, ``str``, ``bool``, ``int``, ``float``, ``list``, ``tuple`` and
+    ``dict`` are supported, without subclasses.
+
+    Returns:
+        The hex digest, or None if a value has no lossless encoding and the
+        render must not be cached.
+    """
+    try:
+        encoded = _encode(dict(variables or {}))
+    except _Unencodable:
+        return None
+    return content_hash(_dumps(encoded))
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered prompts, keyed by content.
+
+    Entries are keyed by the hash of the template text plus the canonical
+    hash of the input variables, so edits to a prompt or test produce new
+    keys and nothing needs invalidating. Each entry keeps the rendered text
+    and its own hash. The cache is safe to share between scorers and threads.
+
+    Args:
+        maxsize: Maximum number of rendered prompts to keep.
+        renderer: Renderer used for cache misses.
+
+    Example::
+
+        cache = RenderCache()
+        scorer = PromptScorer(storage, render_cache=cache)
+        scorer.compare_versions(v1_id, v2_id, test_ids, v1_evals, v2_evals)
+        print(cache.hits, cache.misses)
+    """
+
+    def __init__(self, maxsize: int = RENDER_CACHE_SIZE, *, renderer: PromptRenderer | None = None) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize must not be negative, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._renderer = renderer or PromptRenderer()
+        self._entries: OrderedDict[tuple[str, str], RenderedPrompt] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every cached render and reset the hit and miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def render(self, template: str, variables: Mapping[str, Any] | None = None) -> RenderedPrompt:
+        """Render one template, reusing a cached render of the same content."""
+        [rendered] = self.render_many(template, [variables])
+        return rendered
+
+    def render_many(
+        self,
+        template: str,
+        rows: Sequence[Mapping[str, Any] | None],
+        *,
+        workers: int | None = None,
+        executor: Executor | None = None,
+        chunk_size: int = 256,
+    ) -> list[RenderedPrompt]:
+        """Render one template against many variable sets.
+
+        Only rows without a cached render are rendered, each distinct one
+        once, through :meth:`PromptRenderer.render_many`. Rows that
+        :func:`variables_hash` cannot encode are rendered every time and
+        never cached.
+
+        Args:
+            template: The prompt template string.
+            rows: Variable dicts, one per rendered output.
+            workers: Worker processes for rendering the misses.
+            executor: An existing pool to render the misses on instead.
+            chunk_size: Rows per task sent to a worker.
+
+        Returns:
+            One RenderedPrompt per row, in input order.
+        """
+        template_key = content_hash(template)
+        keys: list[tuple[str, str] | None] = []
+        for row in rows:
+            row_key = variables_hash(row)
+            keys.append(None if row_key is None else (template_key, row_key))
+        uncached = [row for key, row in zip(keys, rows) if key is None]
+        found: dict[tuple[str, str], RenderedPrompt] = {}
+        missing: dict[tuple[str, str], Mapping[str, Any] | None] = {}
+        with self._lock:
+            for key, row in zip(keys, rows):
+                if key is None or key in found or key in missing:
+                    continue
+                entry = self._entries.get(key)
+                if entry is None:
+                    missing[key] = row
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = entry
+            self.hits += len(keys) - len(uncached) - len(missing)
+            self.misses += len(missing) + len(uncached)
+
+        if not missing and not uncached:
+            return [found[key] for key in keys]
+        pending = [*missing.values(), *uncached]
+        texts = self._renderer.render_many(
+            template,
+            [dict(row or {}) for row in pending],
+            workers=workers,
+            executor=executor,
+            chunk_size=chunk_size,
+        )
+        prompts = [RenderedPrompt(text=text, hash=content_hash(text)) for text in texts]
+        rendered = dict(zip(missing, prompts))
+        found.update(rendered)
+        if rendered:
+            with self._lock:
+                self._entries.update(rendered)
+                for key in rendered:
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        bypassed = iter(prompts[len(missing):])
+        return [next(bypassed) if key is None else found[key] for key in keys]
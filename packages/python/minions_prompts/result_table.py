@@ -0,0 +1,324 @@
+"""
+ResultTable — compact columnar store for prompt-result scores.
+
+Requires NumPy, available through the ``analytics`` extra.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from collections.abc import Iterable, Mapping
+from os import PathLike
+from typing import TYPE_CHECKING, Any
+
+from .analytics import ResultFrame, _numpy
+from .types import TestRunResult
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_MAGIC = b"MPRT"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sIQ")
+"""Magic, format version and metadata length."""
+
+_ALIGN = 64
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+class ResultTable:
+    """Array-backed table of test results, one column per scoring dimension.
+
+    Prompt and test IDs are interned to int32 codes, pass/fail is a packed
+    bitmap and scores are float32 columns (NaN where a result has no score
+    for that dimension): about 9 bytes plus 4 per dimension for each result,
+    versus a full minion and two relations.
+
+    Tables grow by appending, slice without copying score columns, and save
+    to a binary file whose columns can be memory-mapped on load.
+
+    Args:
+        dimensions: Score dimensions to create up front; others are added
+            as they first appear.
+        capacity: Rows to allocate up front.
+
+    Example::
+
+        table = ResultTable()
+        scorer = PromptScorer(storage, result_table=table, save_result_minions=False)
+        scorer.run_test_suite(prompt_id, test_ids, evaluations)
+        table.save("results.mprt")
+        summaries = summarize_results(ResultTable.load("results.mprt").to_frame())
+    """
+
+    def __init__(self, dimensions: Iterable[str] = (), *, capacity: int = 1024) -> None:
+        np = _numpy()
+        self._np = np
+        self._size = 0
+        self._capacity = max(int(capacity), 0)
+        self._prompt_ids: list[str] = []
+        self._prompt_index: dict[str, int] = {}
+        self._test_ids: list[str] = []
+        self._test_index: dict[str, int] = {}
+        self._prompt_codes = np.empty(self._capacity, dtype=np.int32)
+        self._test_codes = np.empty(self._capacity, dtype=np.int32)
+        self._passed = np.zeros(-(-self._capacity // 8), dtype=np.uint8)
+        self._columns: dict[str, np.ndarray] = {}
+        for dim in dimensions:
+            self._add_dimension(dim)
+
+    # ─── Access ───────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dimensions(self) -> list[str]:
+        """Score dimensions, in the order they were added."""
+        return list(self._columns)
+
+    @property
+    def prompt_ids(self) -> list[str]:
+        """Distinct prompt IDs; :attr:`prompt_codes` index into this list."""
+        return list(self._prompt_ids)
+
+    @property
+    def test_ids(self) -> list[str]:
+        """Distinct test IDs; :attr:`test_codes` index into this list."""
+        return list(self._test_ids)
+
+    @property
+    def prompt_codes(self) -> np.ndarray:
+        """Interned prompt ID of each row (a view)."""
+        return self._prompt_codes[: self._size]
+
+    @property
+    def test_codes(self) -> np.ndarray:
+        """Interned test ID of each row (a view)."""
+        return self._test_codes[: self._size]
+
+    @property
+    def passed(self) -> np.ndarray:
+        """Pass flag of each row, unpacked from the bitmap."""
+        return self._np.unpackbits(self._passed, count=self._size, bitorder="little").astype(bool)
+
+    def column(self, dimension: str) -> np.ndarray:
+        """Return the float32 scores of one dimension (a view).
+
+        Raises:
+            KeyError: If no result has that dimension.
+        """
+        return self._columns[dimension][: self._size]
+
+    def __getitem__(self, key: slice) -> ResultTable:
+        """Return rows ``key`` as a new table.
+
+        Code and score columns are views into this table until the slice is
+        appended to, which reallocates them. Only step-1 slices are supported.
+        """
+        if not isinstance(key, slice):
+            raise TypeError(f"ResultTable indices must be slices, not {type(key).__name__}")
+        start, stop, step = key.indices(self._size)
+        if step != 1:
+            raise ValueError("ResultTable slices must have step 1")
+        stop = max(start, stop)
+        np = self._np
+        table = ResultTable.__new__(ResultTable)
+        table._np = np
+        table._size = table._capacity = stop - start
+        table._prompt_ids = list(self._prompt_ids)
+        table._prompt_index = dict(self._prompt_index)
+        table._test_ids = list(self._test_ids)
+        table._test_index = dict(self._test_index)
+        table._prompt_codes = self._prompt_codes[start:stop]
+        table._test_codes = self._test_codes[start:stop]
+        table._passed = np.packbits(self.passed[start:stop], bitorder="little")
+        table._columns = {dim: column[start:stop] for dim, column in self._columns.items()}
+        return table
+
+    def to_frame(self) -> ResultFrame:
+        """Return the rows as a :class:`ResultFrame` for the analytics functions."""
+        np = self._np
+        return ResultFrame(
+            prompt_ids=list(self._prompt_ids),
+            test_ids=list(self._test_ids),
+            prompt_codes=self.prompt_codes,
+            test_codes=self.test_codes,
+            passed=self.passed,
+            scores={dim: self.column(dim).astype(np.float64) for dim in self._columns},
+        )
+
+    # ─── Writing ──────────────────────────────────────────────────────────────
+
+    def append(
+        self,
+        prompt_id: str,
+        test_id: str,
+        scores: Mapping[str, float],
+        passed: bool,
+    ) -> None:
+        """Append one result row."""
+        self._extend_rows([(prompt_id, test_id, scores, passed)])
+
+    def extend(self, results: Iterable[TestRunResult]) -> None:
+        """Append many scorer results at once."""
+        self._extend_rows((r.prompt_id, r.test_id, r.scores, r.passed) for r in results)
+
+    def _extend_rows(self, rows: Iterable[tuple[str, str, Mapping[str, float], bool]]) -> None:
+        np = self._np
+        prompt_codes: list[int] = []
+        test_codes: list[int] = []
+        passed: list[bool] = []
+        values: dict[str, dict[int, float]] = {}
+        for i, (prompt_id, test_id, scores, ok) in enumerate(rows):
+            prompt_codes.append(self._intern(prompt_id, self._prompt_ids, self._prompt_index))
+            test_codes.append(self._intern(test_id, self._test_ids, self._test_index))
+            passed.append(bool(ok))
+            for dim, value in (scores or {}).items():
+                values.setdefault(dim, {})[i] = float(value)
+        count = len(passed)
+        if not count:
+            return
+
+        start, stop = self._size, self._size + count
+        self._reserve(stop)
+        for dim in values:
+            if dim not in self._columns:
+                self._add_dimension(dim)
+        self._prompt_codes[start:stop] = prompt_codes
+        self._test_codes[start:stop] = test_codes
+        for dim, column in self._columns.items():
+            column[start:stop] = np.nan
+            dim_values = values.get(dim)
+            if dim_values:
+                rows_with_dim = np.fromiter(dim_values.keys(), dtype=np.int64, count=len(dim_values))
+                column[start + rows_with_dim] = np.fromiter(
+                    dim_values.values(), dtype=np.float32, count=len(dim_values)
+                )
+
+        index = np.arange(start, stop)
+        bits = np.asarray(passed, dtype=np.uint8) << (index & 7).astype(np.uint8)
+        np.bitwise_or.at(self._passed, index >> 3, bits)
+        self._size = stop
+
+    @staticmethod
+    def _intern(id: str, ids: list[str], index: dict[str, int]) -> int:
+        code = index.get(id)
+        if code is None:
+            code = index[id] = len(ids)
+            ids.append(id)
+        return code
+
+    def _add_dimension(self, dim: str) -> None:
+        np = self._np
+        column = np.empty(self._capacity, dtype=np.float32)
+        column[: self._size] = np.nan
+        self._columns[dim] = column
+
+    def _reserve(self, size: int) -> None:
+        if size <= self._capacity and self._prompt_codes.flags.writeable:
+            return
+        np = self._np
+        capacity = max(size, 2 * self._capacity, 64)
+
+        def grow(array: np.ndarray, length: int, fill: Any = 0) -> np.ndarray:
+            grown = np.full(length, fill, dtype=array.dtype)
+            grown[: len(array)] = array
+            return grown
+
+        n = self._size
+        self._prompt_codes = grow(self._prompt_codes[:n], capacity)
+        self._test_codes = grow(self._test_codes[:n], capacity)
+        self._passed = grow(self._passed[: -(-n // 8)], -(-capacity // 8))
+        self._columns = {
+            dim: grow(column[:n], capacity, np.nan) for dim, column in self._columns.items()
+        }
+        self._capacity = capacity
+
+    # ─── Persistence ──────────────────────────────────────────────────────────
+
+    def save(self, path: str | PathLike[str]) -> None:
+        """Write the table to a binary file.
+
+        The file holds a small JSON header (row count, dimensions and the
+        interned ID lists) followed by each column as raw little-endian
+        data, 64-byte aligned so it can be memory-mapped by :meth:`load`.
+        """
+        np = self._np
+        n = self._size
+        arrays: list[tuple[str, np.ndarray]] = [
+            ("prompt_codes", self.prompt_codes.astype("<i4", copy=False)),
+            ("test_codes", self.test_codes.astype("<i4", copy=False)),
+            ("passed", self._passed[: -(-n // 8)]),
+        ]
+        arrays += [(f"score:{dim}", self.column(dim).astype("<f4", copy=False)) for dim in self._columns]
+
+        offsets: dict[str, int] = {}
+        offset = 0
+        for name, array in arrays:
+            offsets[name] = offset
+            offset = _aligned(offset + array.nbytes)
+        meta = json.dumps(
+            {
+                "rows": n,
+                "dimensions": list(self._columns),
+                "prompt_ids": self._prompt_ids,
+                "test_ids": self._test_ids,
+                "offsets": offsets,
+            }
+        ).encode("utf-8")
+        data_start = _aligned(_HEADER.size + len(meta))
+
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(meta)))
+            f.write(meta)
+            for name, array in arrays:
+                f.seek(data_start + offsets[name])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+
+    @classmethod
+    def load(cls, path: str | PathLike[str], *, mmap: bool = True) -> ResultTable:
+        """Read a table written by :meth:`save`.
+
+        Args:
+            path: The file to read.
+            mmap: Memory-map the columns instead of reading them into memory.
+                Mapped columns are read-only; the first append copies them.
+
+        Raises:
+            ValueError: If the file is not a result table.
+        """
+        np = _numpy()
+        with open(path, "rb") as f:
+            magic, version, meta_length = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != _MAGIC or version != _FORMAT_VERSION:
+                raise ValueError(f"Not a result table file: {path}")
+            meta = json.loads(f.read(meta_length))
+        data_start = _aligned(_HEADER.size + meta_length)
+        n = meta["rows"]
+
+        def column(name: str, dtype: str, count: int) -> np.ndarray:
+            offset = data_start + meta["offsets"][name]
+            if not count:
+                return np.empty(0, dtype=dtype)
+            if mmap:
+                return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+            return np.fromfile(path, dtype=dtype, count=count, offset=offset)
+
+        table = cls.__new__(cls)
+        table._np = np
+        table._size = table._capacity = n
+        table._prompt_ids = list(meta["prompt_ids"])
+        table._prompt_index = {id: i for i, id in enumerate(table._prompt_ids)}
+        table._test_ids = list(meta["test_ids"])
+        table._test_index = {id: i for i, id in enumerate(table._test_ids)}
+        table._prompt_codes = column("prompt_codes", "<i4", n)
+        table._test_codes = column("test_codes", "<i4", n)
+        table._passed = column("passed", "u1", -(-n // 8))
+        table._columns = {dim: column(f"score:{dim}", "<f4", n) for dim in meta["dimensions"]}
+        return table
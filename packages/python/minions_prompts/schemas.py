@@ -1,5 +1,5 @@
 """
-Minion Type definitions for the five prompt primitive types.
+Minion Type definitions for the prompt primitive types.
 """
 
 from __future__ import annotations
@@ -162,6 +162,11 @@ prompt_result_type = MinionType(
             label="Rendered Prompt",
             required=True,
         ),
+        FieldDefinition(
+            name="promptHash",
+            type="string",
+            label="Prompt Hash",
+        ),
         FieldDefinition(
             name="output",
             type="textarea",
@@ -190,12 +195,53 @@ prompt_result_type = MinionType(
     is_system=False,
 )
 
+prompt_leaderboard_type = MinionType(
+    id="minions-prompts/prompt-leaderboard",
+    name="Prompt Leaderboard",
+    slug="prompt-leaderboard",
+    description="Rankings of several prompt versions evaluated against a shared test set.",
+    icon="🏆",
+    schema=[
+        FieldDefinition(
+            name="method",
+            type="select",
+            label="Ranking Method",
+            options=["mean", "bradley-terry"],
+            required=True,
+            default_value="bradley-terry",
+        ),
+        FieldDefinition(
+            name="versionIds",
+            type="json",
+            label="Version IDs",
+            required=True,
+            default_value=[],
+        ),
+        FieldDefinition(
+            name="testIds",
+            type="json",
+            label="Test IDs",
+            required=True,
+            default_value=[],
+        ),
+        FieldDefinition(
+            name="rankings",
+            type="json",
+            label="Rankings",
+            required=True,
+            default_value=[],
+        ),
+    ],
+    is_system=False,
+)
+
 prompt_types = [
     prompt_template_type,
     prompt_version_type,
     prompt_variable_type,
     prompt_test_type,
     prompt_result_type,
+    prompt_leaderboard_type,
 ]
 
 
@@ -0,0 +1,79 @@
+"""
+Sequential testing — stopping rules for comparing prompt versions on a stream of paired results.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Literal
+
+
+class SequentialProbabilityRatioTest:
+    """Wald's sequential probability ratio test on paired A/B winners.
+
+    Each paired test is a Bernoulli trial on whether v2 beats v1; ties carry
+    no information and are skipped. The test weighs "v2 wins with probability
+    ``win_rate``" against the mirror hypothesis "v1 wins with probability
+    ``win_rate``" and stops once the log-likelihood ratio crosses either
+    boundary. ``alpha`` bounds the chance of wrongly declaring v2 and
+    ``beta`` the chance of wrongly declaring v1.
+
+    Args:
+        win_rate: Win probability of the better version that the test should
+            detect; must be in (0.5, 1).
+        alpha: Error rate for declaring v2 the winner.
+        beta: Error rate for declaring v1 the winner.
+
+    Example::
+
+        sprt = SequentialProbabilityRatioTest(win_rate=0.65)
+        for comparison in comparisons:
+            if sprt.update(comparison.winner):
+                break
+        print(sprt.decision, sprt.wins)
+    """
+
+    def __init__(self, *, win_rate: float = 0.6, alpha: float = 0.05, beta: float = 0.05) -> None:
+        if not 0.5 < win_rate < 1:
+            raise ValueError(f"win_rate must be between 0.5 and 1, got {win_rate}")
+        for name, value in (("alpha", alpha), ("beta", beta)):
+            if not 0 < value < 1:
+                raise ValueError(f"{name} must be between 0 and 1, got {value}")
+        self.win_rate = win_rate
+        self.alpha = alpha
+        self.beta = beta
+        self.upper = math.log((1 - beta) / alpha)
+        """Log-likelihood ratio at or above which v2 is declared the winner."""
+        self.lower = math.log(beta / (1 - alpha))
+        """Log-likelihood ratio at or below which v1 is declared the winner."""
+        self.log_likelihood_ratio = 0.0
+        self.wins: dict[Literal["v1", "v2", "tie"], int] = {"v1": 0, "v2": 0, "tie": 0}
+        self.decision: Literal["v1", "v2"] | None = None
+        self._step = math.log(win_rate / (1 - win_rate))
+
+    @property
+    def observations(self) -> int:
+        """Number of paired results seen, including ties."""
+        return sum(self.wins.values())
+
+    def update(self, winner: Literal["v1", "v2", "tie"]) -> Literal["v1", "v2"] | None:
+        """Record one paired result and return the decision, if reached.
+
+        Raises:
+            RuntimeError: If the test has already reached a decision.
+            ValueError: If ``winner`` is not ``"v1"``, ``"v2"`` or ``"tie"``.
+        """
+        if self.decision is not None:
+            raise RuntimeError(f"Test already decided for {self.decision}")
+        if winner not in self.wins:
+            raise ValueError(f"Unknown winner: {winner!r}")
+        self.wins[winner] += 1
+        if winner == "v2":
+            self.log_likelihood_ratio += self._step
+        elif winner == "v1":
+            self.log_likelihood_ratio -= self._step
+        if self.log_likelihood_ratio >= self.upper:
+            self.decision = "v2"
+        elif self.log_likelihood_ratio <= self.lower:
+            self.decision = "v1"
+        return self.decision
@@ -0,0 +1,365 @@
+"""
+SQLite-backed storage implementation for minions-prompts.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+from minions import Minion, Relation
+
+from .storage import PromptStorage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS minions (
+    id TEXT PRIMARY KEY,
+    minion_type_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS relations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    source_id TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_relations_source_type ON relations (source_id, type);
+CREATE INDEX IF NOT EXISTS idx_relations_target_type ON relations (target_id, type);
+CREATE INDEX IF NOT EXISTS idx_relations_type ON relations (type);
+CREATE TABLE IF NOT EXISTS lineage (
+    member_id TEXT PRIMARY KEY,
+    root_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_lineage_root ON lineage (root_id);
+CREATE TABLE IF NOT EXISTS heads (
+    root_id TEXT PRIMARY KEY,
+    head_id TEXT,
+    branched INTEGER NOT NULL DEFAULT 0
+);
+"""
+_SCHEMA_VERSION = 1
+"""``PRAGMA user_version`` of a database whose head index is populated."""
+
+_GET_MINION = "SELECT data FROM minions WHERE id = ?"
+_SAVE_MINION = (
+    "INSERT OR REPLACE INTO minions (id, minion_type_id, created_at, data) VALUES (?, ?, ?, ?)"
+)
+_SAVE_RELATION = (
+    "INSERT OR REPLACE INTO relations (id, source_id, target_id, type, data) VALUES (?, ?, ?, ?, ?)"
+)
+_ALL_MINIONS = "SELECT data FROM minions ORDER BY rowid"
+# Walks relations against their direction from the root. UNION (not UNION ALL)
+# makes cycles terminate; joining minions inside the recursion stops the
+# walk at missing minions, like the breadth-first default. Returns every
+# relation between reached nodes with its source minion, in save order, so
+# the breadth-first order and the chain's leaves follow without more queries.
+# CROSS JOIN fixes the join order so every step probes relations through the
+# (target_id, type) index from the nodes reached so far, instead of scanning
+# every relation of the type.
+_GET_DESCENDANT_GRAPH = """
+WITH RECURSIVE descendants(id) AS (
+    SELECT ?
+    UNION
+    SELECT r.source_id
+    FROM descendants d
+    CROSS JOIN relations r ON r.target_id = d.id AND r.type = ?
+    CROSS JOIN minions m ON m.id = r.source_id
+)
+SELECT r.data, m.data
+FROM descendants d
+CROSS JOIN relations r ON r.target_id = d.id AND r.type = ?
+CROSS JOIN minions m ON m.id = r.source_id
+WHERE r.source_id IN (SELECT id FROM descendants)
+ORDER BY r.seq
+"""
+_GET_MINIONS_BATCH = 500
+"""IDs bound per ``IN (...)`` query; stays under SQLite's parameter limit."""
+_RELATION_COLUMNS = ("source_id", "target_id", "type")
+
+
+def _relations_query(source: bool, target: bool, type: bool) -> str:
+    clauses = [
+        f"{column} = ?"
+        for column, present in zip(_RELATION_COLUMNS, (source, target, type))
+        if present
+    ]
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    return f"SELECT data FROM relations{where} ORDER BY seq"
+
+
+# One fixed SQL string per filter combination, so sqlite3's statement cache
+# always hits and queries are only prepared once per connection.
+_RELATION_QUERIES = {
+    (s, t, ty): _relations_query(s, t, ty)
+    for s in (False, True)
+    for t in (False, True)
+    for ty in (False, True)
+}
+
+
+def _minion_row(minion: Minion) -> tuple[Any, ...]:
+    return (minion.id, minion.minion_type_id, minion.created_at, json.dumps(minion.to_dict()))
+
+
+def _relation_row(relation: Relation) -> tuple[Any, ...]:
+    return (
+        relation.id,
+        relation.source_id,
+        relation.target_id,
+        relation.type,
+        json.dumps(relation.to_dict()),
+    )
+
+
+class SQLitePromptStorage(PromptStorage):
+    """Persistent storage backed by a local SQLite database.
+
+    Minions and relations live in separate tables; relations are indexed on
+    ``(source_id, type)`` and ``(target_id, type)`` so chain traversal stays
+    fast on stores much larger than memory. File databases use WAL journaling.
+
+    The head index lives in the ``lineage`` (member to root) and ``heads``
+    (root to latest version) tables, written in the same transaction as
+    each relation or minion. Databases created before the index existed
+    are indexed when first opened.
+
+    Writes from other connections to the same file (other processes, or
+    another instance in this one) raise no change events; they are reported
+    through :meth:`external_version`, which reads ``PRAGMA data_version``.
+
+    Args:
+        path: Database file path, or ``":memory:"`` for a transient database.
+        cache_size_kib: Size of SQLite's page cache in KiB.
+        cached_statements: Number of prepared statements kept per connection.
+
+    Example::
+
+        storage = SQLitePromptStorage("prompts.db")
+        chain = PromptChain(storage)
+        ...
+        storage.close()
+    """
+
+    supports_change_events = True
+    supports_head_index = True
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        *,
+        cache_size_kib: int = 65536,
+        cached_statements: int = 128,
+    ) -> None:
+        self._path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            cached_statements=cached_statements,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA cache_size=-{int(cache_size_kib)}")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            with self._lock, self._conn:
+                self.rebuild_head_index()
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def get_minion(self, id: str) -> Minion | None:
+        """Retrieve a minion by ID, or None if not found."""
+        with self._lock:
+            row = self._conn.execute(_GET_MINION, (id,)).fetchone()
+        return Minion.from_dict(json.loads(row[0])) if row else None
+
+    def get_minions(self, ids: Iterable[str]) -> list[Minion | None]:
+        """Retrieve many minions with batched ``IN`` queries; missing IDs yield None."""
+        ids = list(ids)
+        found: dict[str, str] = {}
+        unique = list(dict.fromkeys(ids))
+        with self._lock:
+            for start in range(0, len(unique), _GET_MINIONS_BATCH):
+                batch = unique[start:start + _GET_MINIONS_BATCH]
+                sql = f"SELECT id, data FROM minions WHERE id IN ({','.join('?' * len(batch))})"
+                found.update(self._conn.execute(sql, batch).fetchall())
+        return [Minion.from_dict(json.loads(found[id])) if id in found else None for id in ids]
+
+    def get_descendant_graph(
+        self, root_id: str, *, type: str = "follows"
+    ) -> tuple[list[Minion], list[Relation]]:
+        """Fetch descendants and their relations with one recursive query.
+
+        The breadth-first order is rebuilt from the returned relations.
+        """
+        with self._lock:
+            rows = self._conn.execute(_GET_DESCENDANT_GRAPH, (root_id, type, type)).fetchall()
+        relations: list[Relation] = []
+        children_of: dict[str, list[str]] = {}
+        minion_data: dict[str, str] = {}
+        for relation_data, source_data in rows:
+            rel = Relation.from_dict(json.loads(relation_data))
+            relations.append(rel)
+            children_of.setdefault(rel.target_id, []).append(rel.source_id)
+            minion_data[rel.source_id] = source_data
+        descendants: list[Minion] = []
+        visited = {root_id}
+        queue = deque([root_id])
+        while queue:
+            for child_id in children_of.get(queue.popleft(), ()):
+                if child_id not in visited:
+                    visited.add(child_id)
+                    descendants.append(Minion.from_dict(json.loads(minion_data[child_id])))
+                    queue.append(child_id)
+        return descendants, relations
+
+    def external_version(self) -> int | None:
+        """Return SQLite's ``data_version``, which moves when another connection commits."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def save_minion(self, minion: Minion) -> None:
+        """Store a minion, overwriting any existing entry with the same ID."""
+        with self._lock, self._conn:
+            self._conn.execute(_SAVE_MINION, _minion_row(minion))
+            self._index_minions([minion])
+        self._notify_minion_saved(minion)
+
+    def save_minions(self, minions: Iterable[Minion]) -> None:
+        """Store many minions in a single transaction."""
+        minions = list(minions)
+        with self._lock, self._conn:
+            self._conn.executemany(_SAVE_MINION, map(_minion_row, minions))
+            self._index_minions(minions)
+        for minion in minions:
+            self._notify_minion_saved(minion)
+
+    def get_relations(
+        self,
+        *,
+        source_id: str | None = None,
+        target_id: str | None = None,
+        type: str | None = None,
+    ) -> list[Relation]:
+        """Return relations matching all provided filters, in insertion order."""
+        filters = (source_id, target_id, type)
+        sql = _RELATION_QUERIES[tuple(f is not None for f in filters)]
+        params = [f for f in filters if f is not None]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [Relation.from_dict(json.loads(row[0])) for row in rows]
+
+    def save_relation(self, relation: Relation) -> None:
+        """Persist a relation, replacing any existing relation with the same ID."""
+        with self._lock, self._conn:
+            self._conn.execute(_SAVE_RELATION, _relation_row(relation))
+            self._index_relations([relation])
+        self._notify_relation_saved(relation)
+
+    def save_relations(self, relations: Iterable[Relation]) -> None:
+        """Store many relations in a single transaction."""
+        relations = list(relations)
+        with self._lock, self._conn:
+            self._conn.executemany(_SAVE_RELATION, map(_relation_row, relations))
+            self._index_relations(relations)
+        for relation in relations:
+            self._notify_relation_saved(relation)
+
+    def get_all_minions(self) -> list[Minion]:
+        """Return all stored minions."""
+        with self._lock:
+            rows = self._conn.execute(_ALL_MINIONS).fetchall()
+        return [Minion.from_dict(json.loads(row[0])) for row in rows]
+
+    def get_all_relations(self) -> list[Relation]:
+        """Return all stored relations."""
+        return self.get_relations()
+
+    def clear(self) -> None:
+        """Clear all stored data."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM minions")
+            self._conn.execute("DELETE FROM relations")
+            self._conn.execute("DELETE FROM lineage")
+            self._conn.execute("DELETE FROM heads")
+        self._notify_cleared()
+
+    def get_heads(self) -> dict[str, str]:
+        """Return the head index, root ID to latest version ID."""
+        with self._lock:
+            rows = self._conn.execute("SELECT root_id, head_id FROM heads WHERE head_id IS NOT NULL")
+            return dict(rows.fetchall())
+
+    def _index_root(self, member_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT root_id FROM lineage WHERE member_id = ?", (member_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _index_head(self, root_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT head_id FROM heads WHERE root_id = ?", (root_id,)).fetchone()
+        return row[0] if row else None
+
+    def _index_is_root(self, root_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM heads WHERE root_id = ?", (root_id,)).fetchone()
+        return row is not None
+
+    def _index_set_root(self, member_id: str, root_id: str) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO lineage (member_id, root_id) VALUES (?, ?)", (member_id, root_id)
+        )
+
+    def _index_is_branched(self, root_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT branched FROM heads WHERE root_id = ?", (root_id,)).fetchone()
+        return bool(row and row[0])
+
+    def _index_set_branched(self, root_id: str) -> None:
+        self._conn.execute("UPDATE heads SET branched = 1 WHERE root_id = ?", (root_id,))
+
+    def _index_set_head(self, root_id: str, head_id: str | None) -> None:
+        self._conn.execute(
+            "INSERT INTO heads (root_id, head_id) VALUES (?, ?) "
+            "ON CONFLICT (root_id) DO UPDATE SET head_id = excluded.head_id",
+            (root_id, head_id),
+        )
+
+    def _index_reroot(self, old_root_id: str, new_root_id: str) -> None:
+        self._conn.execute("UPDATE lineage SET root_id = ? WHERE root_id = ?", (new_root_id, old_root_id))
+        self._index_set_root(old_root_id, new_root_id)
+        if self._index_is_branched(old_root_id):
+            self._index_set_branched(new_root_id)
+        self._conn.execute("DELETE FROM heads WHERE root_id = ?", (old_root_id,))
+
+    def _index_reset(
+        self, root_of: dict[str, str], heads: dict[str, str | None], branched: set[str]
+    ) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM lineage")
+            self._conn.execute("DELETE FROM heads")
+            self._conn.executemany("INSERT INTO lineage (member_id, root_id) VALUES (?, ?)", root_of.items())
+            self._conn.executemany(
+                "INSERT INTO heads (root_id, head_id, branched) VALUES (?, ?, ?)",
+                [(root_id, head_id, root_id in branched) for root_id, head_id in heads.items()],
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> SQLitePromptStorage:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -4,13 +4,72 @@ Storage interface and in-memory implementation for minions-prompts.
 
 from __future__ import annotations
 
+import weakref
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Protocol
 
 from minions import Minion, Relation
 
 
+class StorageListener(Protocol):
+    """Receives change events from a storage backend.
+
+    Register with :meth:`PromptStorage.add_listener`. Callbacks run
+    synchronously in the writing thread, after the write has been applied.
+    """
+
+    def on_minion_saved(self, minion: Minion) -> None: ...
+
+    def on_relation_saved(self, relation: Relation) -> None: ...
+
+    def on_cleared(self) -> None: ...
+
+
+def _epoch(minion: Minion) -> float:
+    return datetime.fromisoformat(minion.created_at).timestamp()
+
+
+def _lineage_head(
+    root: Minion, descendants: list[Minion], relations: list[Relation]
+) -> Minion | None:
+    """Return the latest leaf of a lineage, as ``PromptChain.get_latest_version`` picks it.
+
+    ``descendants`` and ``relations`` are as from
+    :meth:`PromptStorage.get_descendant_graph`. Ties on ``created_at`` go
+    to the leaf reached first, which is also the first in chain order.
+    Returns None if a cycle leaves the lineage without leaves.
+    """
+    has_successor = {rel.target_id for rel in relations}
+    leaves = [m for m in (root, *descendants) if m.id not in has_successor]
+    if not leaves:
+        return None
+    return max(leaves, key=_epoch)
+
+
 class PromptStorage(ABC):
-    """Abstract base class for prompt storage backends."""
+    """Abstract base class for prompt storage backends.
+
+    Backends that report every write to registered listeners set
+    ``supports_change_events`` to True; caches such as ``PromptChain``'s
+    are only enabled for those backends.
+
+    Backends that set ``supports_head_index`` keep a materialised head
+    index: every lineage's root mapped to its latest version, plus every
+    member mapped to its root. They update it in the same write as each
+    ``follows`` relation or member minion, by calling
+    :meth:`_index_relations` and :meth:`_index_minions` and implementing
+    the ``_index_*`` primitives.
+    """
+
+    supports_change_events: bool = False
+
+    supports_head_index: bool = False
+
+    _listeners: weakref.WeakSet[StorageListener] | None = None
+    """Registered listeners; created by the first :meth:`add_listener` call."""
 
     @abstractmethod
     def get_minion(self, id: str) -> Minion | None:
@@ -38,6 +97,327 @@ class PromptStorage(ABC):
         """Persist a relation."""
         ...
 
+    def add_listener(self, listener: StorageListener) -> None:
+        """Register a listener for change events.
+
+        Listeners are held by weak reference, so registering does not keep
+        them alive.
+        """
+        if self._listeners is None:
+            self._listeners = weakref.WeakSet()
+        self._listeners.add(listener)
+
+    def external_version(self) -> int | None:
+        """Return a counter that changes whenever data is written elsewhere.
+
+        Change events only cover writes made through this instance. Backends
+        whose data can also change underneath it, such as a database file
+        shared with other connections or processes, return a value that
+        differs after each such write so caches know to drop what they hold.
+        The default, None, means every write goes through this instance.
+        """
+        return None
+
+    def _notify_minion_saved(self, minion: Minion) -> None:
+        for listener in list(self._listeners or ()):
+            listener.on_minion_saved(minion)
+
+    def _notify_relation_saved(self, relation: Relation) -> None:
+        for listener in list(self._listeners or ()):
+            listener.on_relation_saved(relation)
+
+    def _notify_cleared(self) -> None:
+        for listener in list(self._listeners or ()):
+            listener.on_cleared()
+
+    def get_minions(self, ids: Iterable[str]) -> list[Minion | None]:
+        """Retrieve many minions at once, in the order of ``ids``.
+
+        Missing IDs yield None. Backends with a query language should
+        override this to fetch the batch in bulk. The default looks up each
+        ID in turn.
+        """
+        return [self.get_minion(id) for id in ids]
+
+    def get_descendants(self, root_id: str, *, type: str = "follows") -> list[Minion]:
+        """Return every minion reachable from ``root_id`` against ``type`` relations.
+
+        A minion is a child of ``X`` when it has a ``type`` relation whose
+        target is ``X``. The root itself is excluded, and a child whose minion
+        is missing is skipped along with everything only reachable through it.
+        Minions are returned in breadth-first order, children in the order
+        their relations were saved.
+        """
+        return self.get_descendant_graph(root_id, type=type)[0]
+
+    def get_descendant_graph(
+        self, root_id: str, *, type: str = "follows"
+    ) -> tuple[list[Minion], list[Relation]]:
+        """Return :meth:`get_descendants` plus the relations that link them.
+
+        Backends with a query language should override this with a native
+        traversal, such as a recursive query. The default is a breadth-first
+        walk over :meth:`get_relations`.
+
+        Returns:
+            The descendants, as from :meth:`get_descendants`, and every
+            ``type`` relation whose source is one of them and whose target is
+            the root or one of them.
+        """
+        descendants: list[Minion] = []
+        relations: list[Relation] = []
+        visited = {root_id}
+        members = {root_id}
+        queue = deque([root_id])
+        while queue:
+            current_id = queue.popleft()
+            for rel in self.get_relations(target_id=current_id, type=type):
+                if rel.source_id not in visited:
+                    visited.add(rel.source_id)
+                    minion = self.get_minion(rel.source_id)
+                    if minion:
+                        descendants.append(minion)
+                        members.add(minion.id)
+                        queue.append(minion.id)
+                if rel.source_id in members:
+                    relations.append(rel)
+        return descendants, relations
+
+    def get_head_id(self, prompt_id: str) -> str | None:
+        """Return the ID of the latest version in ``prompt_id``'s lineage.
+
+        Reads the head index in O(1). Returns None when the backend has no
+        head index, or when the lineage has no indexed head: a minion with
+        no ``follows`` relations, a missing root, or a cycle. Callers fall
+        back to traversal in that case.
+        """
+        if not self.supports_head_index:
+            return None
+        return self._index_head(self._index_root(prompt_id) or prompt_id)
+
+    def get_heads(self) -> dict[str, str]:
+        """Return the head index: root ID to latest version ID, per lineage.
+
+        Only lineages with at least one ``follows`` relation are indexed.
+        Empty for backends without a head index.
+        """
+        return {}
+
+    def rebuild_head_index(self) -> dict[str, str]:
+        """Recompute the head index from the stored ``follows`` relations.
+
+        Returns:
+            The rebuilt index, as from :meth:`get_heads`.
+
+        Raises:
+            NotImplementedError: If the backend has no head index.
+        """
+        if not self.supports_head_index:
+            raise NotImplementedError(f"{type(self).__name__} has no head index")
+        follows = self.get_relations(type="follows")
+        parent_of: dict[str, str] = {}
+        children_of: dict[str, list[Relation]] = {}
+        sources_with_several: set[str] = set()
+        for rel in follows:
+            # A member's root is reached through its first follows relation.
+            if rel.source_id in parent_of:
+                sources_with_several.add(rel.source_id)
+            parent_of.setdefault(rel.source_id, rel.target_id)
+            children_of.setdefault(rel.target_id, []).append(rel)
+        root_of: dict[str, str] = {}
+        for source_id in parent_of:
+            path: dict[str, None] = {}
+            current_id = source_id
+            while current_id in parent_of and current_id not in root_of and current_id not in path:
+                path[current_id] = None
+                current_id = parent_of[current_id]
+            root_id = root_of.get(current_id, current_id)
+            for member_id in path:
+                root_of[member_id] = root_id
+        # Every target without a follows relation of its own roots a lineage,
+        # including one only reached through a member's later relations.
+        root_ids = [id for id in children_of if id not in parent_of]
+        ids = list(dict.fromkeys([*root_ids, *parent_of]))
+        minions = dict(zip(ids, self.get_minions(ids)))
+        heads: dict[str, str | None] = dict.fromkeys(root_ids)
+        for root_id in root_ids:
+            root = minions.get(root_id)
+            if root is None:
+                continue
+            descendants: list[Minion] = []
+            relations: list[Relation] = []
+            members = {root_id}
+            visited = {root_id}
+            queue = deque([root_id])
+            while queue:
+                for rel in children_of.get(queue.popleft(), ()):
+                    if rel.source_id not in visited:
+                        visited.add(rel.source_id)
+                        minion = minions.get(rel.source_id)
+                        if minion:
+                            descendants.append(minion)
+                            members.add(minion.id)
+                            queue.append(minion.id)
+                    if rel.source_id in members:
+                        relations.append(rel)
+            head = _lineage_head(root, descendants, relations)
+            if head is not None:
+                heads[root_id] = head.id
+        branched = {root_of[source_id] for source_id in sources_with_several}
+        self._index_reset(root_of, heads, branched)
+        return {root_id: head_id for root_id, head_id in heads.items() if head_id is not None}
+
+    def _index_relations(self, relations: Iterable[Relation]) -> None:
+        """Update the head index for newly saved relations.
+
+        Backends call this inside the write that saved them. Appending a
+        later version to the current head moves the head directly; any
+        other change recomputes the head of each lineage it touches.
+        """
+        for relation in relations:
+            if relation.type != "follows":
+                continue
+            source_id = relation.source_id
+            target_id = relation.target_id
+            root_id = self._index_root(target_id)
+            if root_id is None:
+                root_id = target_id
+                if not self._index_is_root(target_id):
+                    self._index_set_head(target_id, None)
+            is_new = self._index_root(source_id) is None
+            if is_new:
+                if root_id == source_id:
+                    # A cycle has no root, so it gets no head.
+                    self._index_set_root(source_id, source_id)
+                    self._index_set_head(source_id, None)
+                else:
+                    self._index_reroot(source_id, root_id)
+            else:
+                # Not the source's first follows relation, so its root stays,
+                # but its subtree now also joins the target's lineages.
+                self._index_set_branched(self._index_root(source_id))
+            lineages = self._index_lineages_of(target_id)
+            source = target = None
+            if is_new and any(self._index_head(root_id) == target_id for root_id in lineages):
+                source, target = self.get_minions([source_id, target_id])
+                if source is not None and self.get_relations(target_id=source_id, type="follows"):
+                    source = None
+            for root_id in lineages:
+                if (
+                    source is not None
+                    and target is not None
+                    and self._index_head(root_id) == target_id
+                    and _epoch(source) > _epoch(target)
+                ):
+                    # A new version of the head, later than it, is the new head.
+                    self._index_set_head(root_id, source_id)
+                else:
+                    self._index_refresh(root_id)
+
+    def _index_minions(self, minions: Iterable[Minion]) -> None:
+        """Update the head index for newly saved minions.
+
+        Backends call this inside the write that saved them. A saved member
+        may have moved in time or joined its lineages late, so each lineage
+        it belongs to is recomputed.
+        """
+        for minion in minions:
+            for root_id in self._index_lineages_of(minion.id):
+                self._index_refresh(root_id)
+
+    def _index_lineages_of(self, member_id: str) -> list[str]:
+        """Return the indexed roots whose lineage contains ``member_id``.
+
+        A lineage whose members each have one ``follows`` relation is found
+        through the member's root. Otherwise the relations are walked
+        towards every root they reach.
+        """
+        root_id = self._index_root(member_id)
+        if root_id is None:
+            return [member_id] if self._index_is_root(member_id) else []
+        if self._index_is_root(root_id) and not self._index_is_branched(root_id):
+            return [root_id]
+        roots: list[str] = []
+        visited = {member_id}
+        queue = deque([member_id])
+        while queue:
+            current_id = queue.popleft()
+            if self._index_is_root(current_id):
+                roots.append(current_id)
+            for rel in self.get_relations(source_id=current_id, type="follows"):
+                if rel.target_id not in visited:
+                    visited.add(rel.target_id)
+                    queue.append(rel.target_id)
+        return roots
+
+    def _index_refresh(self, root_id: str) -> None:
+        """Recompute one lineage's head from a traversal."""
+        root = self.get_minion(root_id)
+        if root is None or self._index_root(root_id) is not None:
+            # A missing root, or a "root" inside a cycle, has no head.
+            self._index_set_head(root_id, None)
+            return
+        descendants, relations = self.get_descendant_graph(root_id, type="follows")
+        head = _lineage_head(root, descendants, relations)
+        self._index_set_head(root_id, head.id if head is not None else None)
+
+    def _index_root(self, member_id: str) -> str | None:
+        """Return the indexed root of a member with a follows relation, else None."""
+        raise NotImplementedError
+
+    def _index_head(self, root_id: str) -> str | None:
+        """Return the indexed head of a root, or None."""
+        raise NotImplementedError
+
+    def _index_is_root(self, root_id: str) -> bool:
+        """Return whether ``root_id`` is indexed as a lineage root, with or without a head."""
+        raise NotImplementedError
+
+    def _index_is_branched(self, root_id: str) -> bool:
+        """Return whether a member of ``root_id``'s lineage has several follows relations."""
+        raise NotImplementedError
+
+    def _index_set_branched(self, root_id: str) -> None:
+        raise NotImplementedError
+
+    def _index_set_root(self, member_id: str, root_id: str) -> None:
+        raise NotImplementedError
+
+    def _index_set_head(self, root_id: str, head_id: str | None) -> None:
+        """Record a root and its head; None records that it has no head."""
+        raise NotImplementedError
+
+    def _index_reroot(self, old_root_id: str, new_root_id: str) -> None:
+        """Move ``old_root_id`` and all its members under ``new_root_id``; drop its head.
+
+        ``new_root_id`` becomes branched if ``old_root_id`` was.
+        """
+        raise NotImplementedError
+
+    def _index_reset(
+        self, root_of: dict[str, str], heads: dict[str, str | None], branched: set[str]
+    ) -> None:
+        """Replace the whole index."""
+        raise NotImplementedError
+
+    def save_minions(self, minions: Iterable[Minion]) -> None:
+        """Persist many minions at once.
+
+        Backends with transactions should override this to write the whole
+        batch in one transaction. The default saves each minion in turn.
+        """
+        for minion in minions:
+            self.save_minion(minion)
+
+    def save_relations(self, relations: Iterable[Relation]) -> None:
+        """Persist many relations at once.
+
+        Backends with transactions should override this to write the whole
+        batch in one transaction. The default saves each relation in turn.
+        """
+        for relation in relations:
+            self.save_relation(relation)
+
 
 class InMemoryStorage(PromptStorage):
     """In-memory storage implementation for development and testing.
@@ -50,9 +430,24 @@ class InMemoryStorage(PromptStorage):
         chain = PromptChain(storage)
     """
 
+    supports_change_events = True
+    supports_head_index = True
+
     def __init__(self) -> None:
         self._minions: dict[str, Minion] = {}
         self._relations: list[Relation] = []
+        # Secondary indexes over ``_relations`` so filtered lookups cost
+        # O(matches) instead of a full scan.
+        self._by_source: defaultdict[str, list[Relation]] = defaultdict(list)
+        self._by_target: defaultdict[str, list[Relation]] = defaultdict(list)
+        self._by_type: defaultdict[str, list[Relation]] = defaultdict(list)
+        self._by_source_type: defaultdict[tuple[str, str], list[Relation]] = defaultdict(list)
+        self._by_target_type: defaultdict[tuple[str, str], list[Relation]] = defaultdict(list)
+        # Head index: lineage root by member, members by root, head by root.
+        self._root_of: dict[str, str] = {}
+        self._members_of: defaultdict[str, set[str]] = defaultdict(set)
+        self._heads: dict[str, str | None] = {}
+        self._branched: set[str] = set()
 
     def get_minion(self, id: str) -> Minion | None:
         """Retrieve a minion by ID, or None if not found."""
@@ -61,6 +456,58 @@ class InMemoryStorage(PromptStorage):
     def save_minion(self, minion: Minion) -> None:
         """Store a minion, overwriting any existing entry with the same ID."""
         self._minions[minion.id] = minion
+        self._index_minions([minion])
+        self._notify_minion_saved(minion)
+
+    def get_heads(self) -> dict[str, str]:
+        """Return the head index, root ID to latest version ID."""
+        return {root_id: head_id for root_id, head_id in self._heads.items() if head_id is not None}
+
+    def _index_root(self, member_id: str) -> str | None:
+        return self._root_of.get(member_id)
+
+    def _index_head(self, root_id: str) -> str | None:
+        return self._heads.get(root_id)
+
+    def _index_is_root(self, root_id: str) -> bool:
+        return root_id in self._heads
+
+    def _index_is_branched(self, root_id: str) -> bool:
+        return root_id in self._branched
+
+    def _index_set_branched(self, root_id: str) -> None:
+        self._branched.add(root_id)
+
+    def _index_set_root(self, member_id: str, root_id: str) -> None:
+        old_root_id = self._root_of.get(member_id)
+        if old_root_id is not None:
+            self._members_of[old_root_id].discard(member_id)
+        self._root_of[member_id] = root_id
+        self._members_of[root_id].add(member_id)
+
+    def _index_set_head(self, root_id: str, head_id: str | None) -> None:
+        self._heads[root_id] = head_id
+
+    def _index_reroot(self, old_root_id: str, new_root_id: str) -> None:
+        members = self._members_of.pop(old_root_id, set())
+        members.add(old_root_id)
+        for member_id in members:
+            self._root_of[member_id] = new_root_id
+        self._members_of[new_root_id] |= members
+        self._heads.pop(old_root_id, None)
+        if old_root_id in self._branched:
+            self._branched.discard(old_root_id)
+            self._branched.add(new_root_id)
+
+    def _index_reset(
+        self, root_of: dict[str, str], heads: dict[str, str | None], branched: set[str]
+    ) -> None:
+        self._root_of = dict(root_of)
+        self._members_of = defaultdict(set)
+        for member_id, root_id in root_of.items():
+            self._members_of[root_id].add(member_id)
+        self._heads = dict(heads)
+        self._branched = set(branched)
 
     def get_relations(
         self,
@@ -70,20 +517,57 @@ class InMemoryStorage(PromptStorage):
         type: str | None = None,
     ) -> list[Relation]:
         """Return relations matching all provided filters."""
-        results = []
-        for r in self._relations:
-            if source_id is not None and r.source_id != source_id:
-                continue
-            if target_id is not None and r.target_id != target_id:
-                continue
-            if type is not None and r.type != type:
-                continue
-            results.append(r)
-        return results
+        if source_id is not None and type is not None:
+            candidates = self._by_source_type.get((source_id, type), [])
+        elif target_id is not None and type is not None:
+            candidates = self._by_target_type.get((target_id, type), [])
+        elif source_id is not None:
+            candidates = self._by_source.get(source_id, [])
+        elif target_id is not None:
+            candidates = self._by_target.get(target_id, [])
+        elif type is not None:
+            candidates = self._by_type.get(type, [])
+        else:
+            return list(self._relations)
+
+        # The index used above covers at most two filters; a remaining
+        # ``target_id`` is only possible when ``source_id`` was also given.
+        if source_id is not None and target_id is not None:
+            return [r for r in candidates if r.target_id == target_id]
+        return list(candidates)
+
+    def get_descendant_graph(
+        self, root_id: str, *, type: str = "follows"
+    ) -> tuple[list[Minion], list[Relation]]:
+        """Walk descendants breadth first, straight off the indexes."""
+        descendants: list[Minion] = []
+        relations: list[Relation] = []
+        visited = {root_id}
+        members = {root_id}
+        queue = deque([root_id])
+        while queue:
+            for rel in self._by_target_type.get((queue.popleft(), type), ()):
+                if rel.source_id not in visited:
+                    visited.add(rel.source_id)
+                    minion = self._minions.get(rel.source_id)
+                    if minion:
+                        descendants.append(minion)
+                        members.add(minion.id)
+                        queue.append(minion.id)
+                if rel.source_id in members:
+                    relations.append(rel)
+        return descendants, relations
 
     def save_relation(self, relation: Relation) -> None:
         """Append a relation to the store."""
         self._relations.append(relation)
+        self._by_source[relation.source_id].append(relation)
+        self._by_target[relation.target_id].append(relation)
+        self._by_type[relation.type].append(relation)
+        self._by_source_type[(relation.source_id, relation.type)].append(relation)
+        self._by_target_type[(relation.target_id, relation.type)].append(relation)
+        self._index_relations([relation])
+        self._notify_relation_saved(relation)
 
     def get_all_minions(self) -> list[Minion]:
         """Return all stored minions."""
@@ -97,3 +581,10 @@ class InMemoryStorage(PromptStorage):
         """Clear all stored data."""
         self._minions.clear()
         self._relations.clear()
+        self._by_source.clear()
+        self._by_target.clear()
+        self._by_type.clear()
+        self._by_source_type.clear()
+        self._by_target_type.clear()
+        self._index_reset({}, {}, set())
+        self._notify_cleared()
@@ -80,6 +80,43 @@ class PromptResultFields:
     passed: bool = False
     output: str | None = None
     metadata: dict[str, Any] | None = None
+    prompt_hash: str | None = None
+
+
+# ─── Renderer Types ───────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class VariableManifest:
+    """The variables a template references, grouped by how they are used.
+
+    Manifests are cached and shared between callers, so all fields are tuples.
+    """
+
+    variables: tuple[str, ...] = ()
+    """Every referenced name, in order of first appearance."""
+
+    scalars: tuple[str, ...] = ()
+    """Names used as ``{{name}}`` placeholders outside ``#each`` blocks."""
+
+    conditionals: tuple[str, ...] = ()
+    """Names used as ``{{#if name}}`` guards."""
+
+    collections: tuple[str, ...] = ()
+    """Names iterated with ``{{#each name}}``."""
+
+    item_variables: tuple[tuple[str, tuple[str, ...]], ...] = ()
+    """``(collection, names)`` pairs: the placeholders inside each ``#each``
+    block, including ``this``. They are looked up on the item first and
+    fall back to the template's variables, so callers need not supply them."""
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """A rendered prompt and the SHA-256 hex digest of its text."""
+
+    text: str
+    hash: str
 
 
 # ─── Diff Types ───────────────────────────────────────────────────────────────
@@ -87,7 +124,7 @@ class PromptResultFields:
 
 @dataclass
 class DiffLine:
-    """A single line in a content-level diff."""
+    """A single line in a content-level diff, or a span of words or characters."""
 
     type: Literal["add", "remove", "context"]
     text: str
@@ -108,7 +145,10 @@ class DiffResult:
     """Fields present in both but different."""
 
     content_diff: list[DiffLine] = field(default_factory=list)
-    """Line-level diff of the content field."""
+    """Diff of the content field: one entry per line, or per span of words/characters."""
+
+    granularity: Literal["line", "word", "char"] = "line"
+    """Unit that ``content_diff`` entries were computed over."""
 
 
 # ─── Export Types ─────────────────────────────────────────────────────────────
@@ -155,6 +195,8 @@ class TestRunResult:
     scores: dict[str, float]
     passed: bool
     result: Minion
+    prompt_hash: str = ""
+    """SHA-256 hex digest of ``rendered_prompt``; equal hashes mean identical renders."""
 
 
 @dataclass
@@ -168,3 +210,91 @@ class ComparisonResult:
     v2_result: TestRunResult
     deltas: dict[str, float]
     winner: Literal["v1", "v2", "tie"]
+
+
+@dataclass
+class VersionSummary:
+    """Aggregate statistics for every stored result of one prompt version."""
+
+    prompt_id: str
+    count: int
+    pass_rate: float
+    means: dict[str, float]
+    """Mean score per dimension, over the results that have that dimension."""
+
+    percentiles: dict[str, dict[float, float]]
+    """Score percentiles per dimension, keyed by percentile (0–100)."""
+
+
+@dataclass
+class VersionComparison:
+    """Paired A/B statistics between two versions over their shared tests."""
+
+    v1_id: str
+    v2_id: str
+    pairs: int
+    """Number of tests with results for both versions."""
+
+    mean_deltas: dict[str, float]
+    """Mean of ``v2 - v1`` per dimension; a missing score counts as 0."""
+
+    confidence_intervals: dict[str, tuple[float, float]]
+    """Bootstrap confidence interval of each mean delta."""
+
+    wins: dict[Literal["v1", "v2", "tie"], int]
+    """Per-test winners, decided by the summed delta as in ``compare_versions``."""
+
+
+@dataclass
+class SequentialComparison:
+    """Outcome of an A/B comparison that stops once a winner is decided."""
+
+    v1_id: str
+    v2_id: str
+    winner: Literal["v1", "v2", "tie"]
+    """The decided winner, or ``"tie"`` if the tests ran out first."""
+
+    decided: bool
+    log_likelihood_ratio: float
+    wins: dict[Literal["v1", "v2", "tie"], int]
+    comparisons: list[ComparisonResult]
+    """Per-test comparisons for the pairs actually evaluated, in order."""
+
+    evaluations_saved: int
+    """Evaluations skipped by stopping early: two per remaining test, or one
+    if both versions have the same content and so render identically."""
+
+
+@dataclass
+class LeaderboardEntry:
+    """One version's standing on a leaderboard."""
+
+    prompt_id: str
+    rank: int
+    """1-based position under the leaderboard's ranking method."""
+
+    mean_score: float
+    """Mean over tests of the summed score across dimensions."""
+
+    pass_rate: float
+    wins: float
+    """Head-to-head test wins against every other version; ties count half."""
+
+    rating: float
+    """Bradley-Terry strength on the Elo scale (mean 1500)."""
+
+
+@dataclass
+class Leaderboard:
+    """Rankings of several versions evaluated once each on a shared test set."""
+
+    method: Literal["mean", "bradley-terry"]
+    test_ids: list[str]
+    entries: list[LeaderboardEntry]
+    """Entries ordered by rank."""
+
+    win_matrix: list[list[float]]
+    """``win_matrix[i][j]``: tests where version i beat version j, in input order."""
+
+    record: Minion
+    """The saved prompt-leaderboard minion."""
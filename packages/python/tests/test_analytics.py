@@ -0,0 +1,209 @@
+"""Tests for the results analytics module."""
+
+import sys
+
+import pytest
+from datetime import datetime, timezone
+from minions import Minion, Relation
+from minions_prompts import PromptScorer, ResultFrame, compare_results, summarize_results
+from minions_prompts.analytics import MAX_BOOTSTRAP_SUPPORT, bootstrap_ci, bradley_terry, paired_deltas, pairwise_wins, rank_versions
+from minions_prompts.storage import InMemoryStorage
+
+np = pytest.importorskip("numpy")
+
+
+def make_minion(id: str, type_id: str, fields: dict) -> Minion:
+    now = datetime.now(timezone.utc).isoformat()
+    return Minion(id=id, title=id, minion_type_id=type_id, fields=fields, created_at=now, updated_at=now)
+
+
+@pytest.fixture
+def storage():
+    s = InMemoryStorage()
+    s.save_minion(make_minion("v1", "minions-prompts/prompt-template", {"content": "A {{x}}"}))
+    s.save_minion(make_minion("v2", "minions-prompts/prompt-version", {"content": "B {{x}}"}))
+    for i in range(4):
+        s.save_minion(make_minion(f"t{i}", "minions-prompts/prompt-test", {"inputVariables": {"x": i}}))
+    scorer = PromptScorer(s)
+    test_ids = [f"t{i}" for i in range(4)]
+    scorer.compare_versions(
+        "v1",
+        "v2",
+        test_ids,
+        [{"scores": {"q": 10 * i}, "passed": i > 1} for i in range(4)],
+        [{"scores": {"q": 10 * i + 5, "style": 1}, "passed": True} for i in range(4)],
+    )
+    return s
+
+
+def test_from_storage_loads_columns(storage):
+    frame = ResultFrame.from_storage(storage)
+    assert len(frame) == 8
+    assert set(frame.prompt_ids) == {"v1", "v2"}
+    assert np.isnan(frame.scores["style"]).sum() == 4
+
+    only_v2 = ResultFrame.from_storage(storage, prompt_ids=["v2"])
+    assert only_v2.prompt_ids == ["v2"]
+    assert len(only_v2) == 4
+
+
+def test_from_storage_tells_prompt_from_test_by_type(storage):
+    now = datetime.now(timezone.utc).isoformat()
+    storage.save_minion(
+        make_minion("r-swapped", "minions-prompts/prompt-result", {"scores": {"q": 99}, "passed": True})
+    )
+    # References written prompt first, unlike the scorer.
+    for target_id in ("v2", "t3"):
+        storage.save_relation(
+            Relation(
+                id=f"ref-{target_id}",
+                source_id="r-swapped",
+                target_id=target_id,
+                type="references",
+                created_at=now,
+            )
+        )
+
+    frame = ResultFrame.from_storage(storage, prompt_ids=["v2"])
+    assert len(frame) == 5
+    assert frame.prompt_ids == ["v2"]
+    assert frame.test_ids == ["t0", "t1", "t2", "t3"]
+    assert frame.scores["q"][-1] == 99
+
+
+def test_summarize_results(storage):
+    summaries = summarize_results(ResultFrame.from_storage(storage), percentiles=(50,))
+    v1, v2 = summaries["v1"], summaries["v2"]
+    assert v1.count == 4
+    assert v1.pass_rate == 0.5
+    assert v1.means == {"q": 15.0}
+    assert v1.percentiles == {"q": {50.0: 15.0}}
+    assert v2.means == {"q": 20.0, "style": 1.0}
+
+
+def test_paired_deltas_average_repeats_and_fill_missing_with_zero():
+    frame = ResultFrame.from_rows(
+        [
+            ("a", "t1", {"q": 1}, True),
+            ("a", "t1", {"q": 3}, True),
+            ("b", "t1", {"q": 4, "extra": 2}, True),
+            ("b", "t2", {"q": 9}, True),
+        ]
+    )
+    test_ids, deltas = paired_deltas(frame, "a", "b")
+    assert test_ids == ["t1"]
+    assert deltas["q"].tolist() == [2.0]
+    assert deltas["extra"].tolist() == [2.0]
+
+
+def test_compare_results_matches_compare_versions(storage):
+    comparison = compare_results(ResultFrame.from_storage(storage), "v1", "v2", seed=0)
+    assert comparison.pairs == 4
+    assert comparison.mean_deltas == {"q": 5.0, "style": 1.0}
+    assert comparison.wins == {"v1": 0, "v2": 4, "tie": 0}
+    assert comparison.confidence_intervals["q"] == (5.0, 5.0)
+
+
+def test_compare_results_requires_shared_tests():
+    frame = ResultFrame.from_rows([("a", "t1", {"q": 1}, True), ("b", "t2", {"q": 2}, True)])
+    with pytest.raises(ValueError, match="no tests in common"):
+        compare_results(frame, "a", "b")
+    with pytest.raises(ValueError, match="No results for prompt c"):
+        compare_results(frame, "a", "c")
+
+
+def test_bootstrap_ci_is_reproducible_and_covers_mean():
+    values = np.random.default_rng(1).integers(-10, 11, size=5000).astype(float)
+    low, high = bootstrap_ci(values, seed=42)
+    assert (low, high) == bootstrap_ci(values, seed=42)
+    assert low < values.mean() < high
+
+    continuous = np.random.default_rng(2).normal(size=5000)
+    low, high = bootstrap_ci(continuous, resamples=200, seed=3)
+    assert low < continuous.mean() < high
+
+
+def test_bootstrap_ci_over_many_distinct_values_matches_the_normal_interval():
+    values = np.random.default_rng(4).exponential(size=200_000)
+    assert np.unique(values).size > MAX_BOOTSTRAP_SUPPORT
+    low, high = bootstrap_ci(values, seed=5)
+    half_width = 1.959964 * values.std() / np.sqrt(values.size)
+    assert low == pytest.approx(values.mean() - half_width, abs=0.1 * half_width)
+    assert high == pytest.approx(values.mean() + half_width, abs=0.1 * half_width)
+
+
+def test_missing_numpy_raises_helpful_import_error(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(ImportError, match=r"minions-prompts\[analytics\]"):
+        ResultFrame.from_rows([])
+
+
+# ── Leaderboard ───────────────────────────────────────────────────────────────
+
+
+def test_pairwise_wins_counts_ties_as_half():
+    wins = pairwise_wins([[3, 1, 2], [1, 1, 5], [0, 1, 0]])
+
+    assert wins.tolist() == [[0, 1.5, 2.5], [1.5, 0, 2.5], [0.5, 0.5, 0]]
+
+
+def test_bradley_terry_orders_by_strength_and_normalises():
+    strengths = bradley_terry([[0, 8, 9], [2, 0, 7], [1, 3, 0]])
+
+    assert strengths[0] > strengths[1] > strengths[2]
+    assert np.exp(np.log(strengths).mean()) == pytest.approx(1.0)
+
+
+def test_rank_versions_by_mean_and_rejects_unknown_method():
+    entries, _ = rank_versions(["a", "b"], [[1, 1], [2, 0]], [[True, True], [True, False]], method="mean")
+
+    assert [(e.prompt_id, e.rank, e.mean_score, e.pass_rate) for e in entries] == [
+        ("a", 1, 1.0, 1.0),
+        ("b", 2, 1.0, 0.5),
+    ]
+    with pytest.raises(ValueError, match="Unknown ranking method"):
+        rank_versions(["a"], [[1]], [[True]], method="elo")
+
+
+def test_run_leaderboard_evaluates_each_version_once(storage):
+    for name in ("v3", "v4"):
+        storage.save_minion(make_minion(name, "minions-prompts/prompt-version", {"content": name + " {{x}}"}))
+    scorer = PromptScorer(storage)
+    before = len(storage.get_all_minions())
+    weights = {"A": 1, "B": 4, "v3": 3, "v4": 2}
+    calls = []
+
+    def evaluator(rendered_prompt, test):
+        calls.append(rendered_prompt)
+        version = rendered_prompt.split()[0]
+        return {"scores": {"q": weights[version] * 10 + test.fields["inputVariables"]["x"]}, "passed": True}
+
+    test_ids = [f"t{i}" for i in range(4)]
+    board = scorer.run_leaderboard(["v1", "v2", "v3", "v4"], test_ids, evaluator=evaluator)
+
+    assert len(calls) == 4 * 4
+    assert [e.prompt_id for e in board.entries] == ["v2", "v3", "v4", "v1"]
+    assert [e.rank for e in board.entries] == [1, 2, 3, 4]
+    assert board.win_matrix[1][0] == 4
+    assert board.entries[0].rating > 1500 > board.entries[-1].rating
+    assert len(storage.get_all_minions()) == before + 16 + 1
+    record = storage.get_minion(board.record.id)
+    assert record.minion_type_id == "minions-prompts/prompt-leaderboard"
+    assert record.fields["method"] == "bradley-terry"
+    assert [r["promptId"] for r in record.fields["rankings"]] == ["v2", "v3", "v4", "v1"]
+    links = storage.get_relations(source_id=record.id, type="references")
+    assert [r.target_id for r in links] == ["v1", "v2", "v3", "v4"]
+
+
+def test_run_leaderboard_validates_inputs(storage):
+    scorer = PromptScorer(storage)
+    test_ids = ["t0", "t1"]
+    evaluations = {"v1": [{"scores": {"q": 1}}] * 2, "v2": [{"scores": {"q": 2}}]}
+
+    with pytest.raises(ValueError, match="exactly one"):
+        scorer.run_leaderboard(["v1", "v2"], test_ids)
+    with pytest.raises(ValueError, match="unique"):
+        scorer.run_leaderboard(["v1", "v1"], test_ids, evaluations)
+    with pytest.raises(ValueError, match="Expected 2 evaluations for version v2"):
+        scorer.run_leaderboard(["v1", "v2"], test_ids, evaluations)
+    assert not [m for m in storage.get_all_minions() if m.minion_type_id.endswith("leaderboard")]
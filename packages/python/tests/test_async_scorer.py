@@ -0,0 +1,166 @@
+"""Tests for AsyncPromptScorer and AsyncStorageAdapter."""
+
+import asyncio
+
+import pytest
+from datetime import datetime, timezone
+from minions import Minion
+from minions_prompts import AsyncPromptScorer, AsyncStorageAdapter, SQLitePromptStorage
+from minions_prompts.storage import InMemoryStorage
+
+
+def make_minion(id: str, type_id: str, fields: dict) -> Minion:
+    now = datetime.now(timezone.utc).isoformat()
+    return Minion(
+        id=id,
+        title=id,
+        minion_type_id=type_id,
+        fields=fields,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def make_prompt(id: str, content: str) -> Minion:
+    return make_minion(id, "minions-prompts/prompt-template", {"content": content})
+
+
+def make_test(id: str, input_variables: dict) -> Minion:
+    return make_minion(id, "minions-prompts/prompt-test", {"inputVariables": input_variables})
+
+
+@pytest.fixture
+def storage():
+    s = InMemoryStorage()
+    s.save_minion(make_prompt("p1", "Hello {{name}}"))
+    s.save_minion(make_prompt("p2", "Hi {{name}}"))
+    for i in range(3):
+        s.save_minion(make_test(f"t{i}", {"name": f"n{i}"}))
+    return s
+
+
+def test_adapter_offloads_sync_storage(storage):
+    adapter = AsyncStorageAdapter(storage)
+
+    async def main():
+        minion = await adapter.get_minion("p1")
+        found = await adapter.get_minions(["t0", "missing"])
+        return minion, found
+
+    minion, found = asyncio.run(main())
+    assert minion.id == "p1"
+    assert [m.id if m else None for m in found] == ["t0", None]
+
+
+def test_run_test_records_result(storage):
+    scorer = AsyncPromptScorer(storage)
+    result = asyncio.run(scorer.run_test("p1", "t0", scores={"q": 80}, passed=True))
+
+    assert result.rendered_prompt == "Hello n0"
+    assert storage.get_minion(result.result.id) is not None
+    assert len(storage.get_relations(source_id=result.result.id, type="references")) == 2
+
+
+def test_run_test_suite_keeps_order(storage):
+    scorer = AsyncPromptScorer(storage)
+    evaluations = [{"scores": {"q": i}, "passed": True} for i in range(3)]
+    results = asyncio.run(scorer.run_test_suite("p1", ["t2", "t0", "t1"], evaluations))
+
+    assert [r.rendered_prompt for r in results] == ["Hello n2", "Hello n0", "Hello n1"]
+    assert [r.scores["q"] for r in results] == [0, 1, 2]
+
+
+def test_missing_test_raises_and_writes_nothing(storage):
+    scorer = AsyncPromptScorer(storage)
+    with pytest.raises(ValueError, match="Test not found: nope"):
+        asyncio.run(scorer.run_test_suite("p1", ["t0", "nope"], [{"scores": {}}] * 2))
+    assert storage.get_relations(type="references") == []
+
+
+def test_compare_versions_over_sqlite(tmp_path):
+    sqlite = SQLitePromptStorage(str(tmp_path / "prompts.db"))
+    sqlite.save_minions([make_prompt("v1", "A {{x}}"), make_prompt("v2", "B {{x}}"), make_test("t", {"x": "1"})])
+    scorer = AsyncPromptScorer(sqlite, max_concurrency=2)
+
+    comparisons = asyncio.run(
+        scorer.compare_versions(
+            "v1", "v2", ["t"], [{"scores": {"q": 1}}], [{"scores": {"q": 3}}]
+        )
+    )
+    assert comparisons[0].winner == "v2"
+    assert comparisons[0].deltas == {"q": 2}
+    assert len(sqlite.get_relations(type="references")) == 4
+    sqlite.close()
+
+
+class TrackingAdapter(AsyncStorageAdapter):
+    """Counts runs between their first read and their last write."""
+
+    def __init__(self, storage):
+        super().__init__(storage)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def get_minion(self, id):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        return await super().get_minion(id)
+
+    async def save_relations(self, relations):
+        await super().save_relations(relations)
+        self.in_flight -= 1
+
+
+def test_many_concurrent_runs_share_the_semaphore(storage):
+    adapter = TrackingAdapter(storage)
+    scorer = AsyncPromptScorer(adapter, max_concurrency=4)
+
+    async def main():
+        return await asyncio.gather(
+            *(scorer.run_test("p2", f"t{i % 3}", scores={"q": i}, passed=True) for i in range(200))
+        )
+
+    results = asyncio.run(main())
+    assert [r.scores["q"] for r in results] == list(range(200))
+    assert len(storage.get_relations(type="references")) == 400
+    assert adapter.peak == 4
+    assert adapter.in_flight == 0
+
+
+def test_scorer_is_reusable_across_event_loops(storage):
+    adapter = TrackingAdapter(storage)
+    scorer = AsyncPromptScorer(adapter, max_concurrency=2)
+
+    async def main():
+        return await asyncio.gather(
+            *(scorer.run_test("p1", f"t{i % 3}", scores={"q": i}, passed=True) for i in range(20))
+        )
+
+    assert len(asyncio.run(main())) == 20
+    assert len(asyncio.run(main())) == 20
+    assert adapter.peak == 2
+
+
+def test_invalid_concurrency_rejected(storage):
+    with pytest.raises(ValueError):
+        AsyncPromptScorer(storage, max_concurrency=0)
+
+
+def test_run_test_suite_with_evaluator_bounds_concurrency(storage):
+    scorer = AsyncPromptScorer(storage)
+    in_flight = 0
+    peak = 0
+
+    async def evaluator(rendered_prompt, test):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"scores": {"len": len(rendered_prompt)}, "passed": True}
+
+    test_ids = [f"t{i % 3}" for i in range(12)]
+    results = asyncio.run(scorer.run_test_suite("p1", test_ids, evaluator=evaluator, concurrency=3))
+
+    assert [r.rendered_prompt for r in results] == [f"Hello n{i % 3}" for i in range(12)]
+    assert peak == 3
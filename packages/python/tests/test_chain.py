@@ -272,3 +272,376 @@ def test_chain_of_three_middle_version_properly_included(storage, chain):
     ids = [m.id for m in result]
     assert "v2" in ids
     assert ids.index("v1") < ids.index("v2") < ids.index("v3")
+
+
+# ── Caching ────────────────────────────────────────────────────────────────────
+
+
+class MutableStorage(InMemoryStorage):
+    """Storage whose change events and head index can be muted to simulate out-of-band writes."""
+
+    def __init__(self):
+        super().__init__()
+        self.muted = False
+
+    def _notify_minion_saved(self, minion):
+        if not self.muted:
+            super()._notify_minion_saved(minion)
+
+    def _notify_relation_saved(self, relation):
+        if not self.muted:
+            super()._notify_relation_saved(relation)
+
+    def _index_minions(self, minions):
+        if not self.muted:
+            super()._index_minions(minions)
+
+    def _index_relations(self, relations):
+        if not self.muted:
+            super()._index_relations(relations)
+
+
+class UnindexedStorage(InMemoryStorage):
+    supports_head_index = False
+
+
+class CountingStorage(InMemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.relation_queries = 0
+
+    def get_relations(self, **filters):
+        self.relation_queries += 1
+        return super().get_relations(**filters)
+
+
+def test_repeat_lookups_hit_the_chain_cache():
+    storage = CountingStorage()
+    chain = PromptChain(storage)
+    storage.save_minion(make_minion("v1", {"content": "v1"}, "2025-01-01T00:00:00+00:00"))
+    storage.save_minion(make_minion("v2", {"content": "v2"}, "2025-01-02T00:00:00+00:00"))
+    storage.save_relation(make_follows("v2", "v1"))
+
+    assert [m.id for m in chain.get_version_chain("v1")] == ["v1", "v2"]
+    assert chain.get_latest_version("v1").id == "v2"
+    queries = storage.relation_queries
+    assert [m.id for m in chain.get_version_chain("v1")] == ["v1", "v2"]
+    assert chain.get_latest_version("v1").id == "v2"
+    assert storage.relation_queries == queries
+
+
+def test_new_follows_relation_invalidates_cached_chain(storage, chain):
+    storage.save_minion(make_minion("v1", {"content": "v1"}, "2025-01-01T00:00:00+00:00"))
+    storage.save_minion(make_minion("v2", {"content": "v2"}, "2025-01-02T00:00:00+00:00"))
+    storage.save_relation(make_follows("v2", "v1"))
+    assert chain.get_latest_version("v2").id == "v2"
+
+    storage.save_minion(make_minion("v3", {"content": "v3"}, "2025-01-03T00:00:00+00:00"))
+    storage.save_relation(make_follows("v3", "v2"))
+    assert [m.id for m in chain.get_version_chain("v2")] == ["v1", "v2", "v3"]
+    assert chain.get_latest_version("v1").id == "v3"
+
+
+def test_reparenting_a_root_moves_its_chain(storage, chain):
+    storage.save_minion(make_minion("a", {}, "2025-01-01T00:00:00+00:00"))
+    storage.save_minion(make_minion("b", {}, "2025-01-02T00:00:00+00:00"))
+    assert [m.id for m in chain.get_version_chain("b")] == ["b"]
+
+    storage.save_relation(make_follows("b", "a"))
+    assert [m.id for m in chain.get_version_chain("b")] == ["a", "b"]
+
+
+def test_updated_member_minion_is_reflected_in_cached_chain(storage, chain):
+    storage.save_minion(make_minion("v1", {"content": "old"}, "2025-01-01T00:00:00+00:00"))
+    assert chain.get_version_chain("v1")[0].fields["content"] == "old"
+
+    storage.save_minion(make_minion("v1", {"content": "new"}, "2025-01-01T00:00:00+00:00"))
+    assert chain.get_version_chain("v1")[0].fields["content"] == "new"
+
+
+def test_moved_created_at_matches_a_fresh_chain(storage, chain):
+    storage.save_minion(make_minion("v1", {}, "2025-01-01T00:00:00+00:00"))
+    storage.save_minion(make_minion("v2", {}, "2025-01-02T00:00:00+00:00"))
+    storage.save_minion(make_minion("v3", {}, "2025-01-03T00:00:00+00:00"))
+    storage.save_relation(make_follows("v3", "v1"))
+    storage.save_relation(make_follows("v2", "v1"))
+    assert chain.get_latest_version("v1").id == "v3"
+
+    storage.save_minion(make_minion("v2", {}, "2025-01-03T00:00:00+00:00"))
+    fresh = PromptChain(storage, cache=False)
+    assert [m.id for m in chain.get_version_chain("v1")] == [
+        m.id for m in fresh.get_version_chain("v1")
+    ]
+    assert chain.get_latest_version("v1").id == fresh.get_latest_version("v1").id
+    assert chain.get_version_at_date("v1", datetime(2025, 1, 3, tzinfo=timezone.utc)).id == (
+        fresh.get_version_at_date("v1", datetime(2025, 1, 3, tzinfo=timezone.utc)).id
+    )
+
+
+def test_created_at_mutated_in_place_matches_a_fresh_chain(storage, chain):
+    _linear_chain(storage, 3)
+    assert chain.get_latest_version("v1").id == "v3"
+
+    v2 = storage.get_minion("v2")
+    v2.created_at = "2025-01-04T00:00:00+00:00"
+    storage.save_minion(v2)
+
+    fresh = PromptChain(storage, cache=False)
+    date = datetime(2025, 1, 2, 12, tzinfo=timezone.utc)
+    assert [m.id for m in chain.get_version_chain("v1")] == [m.id for m in fresh.get_version_chain("v1")]
+    assert [m.id for m in chain.get_version_chain("v1")] == ["v1", "v3", "v2"]
+    assert chain.get_latest_version("v1").id == fresh.get_latest_version("v1").id
+    assert chain.get_version_at_date("v1", date).id == fresh.get_version_at_date("v1", date).id == "v1"
+
+
+def test_appended_versions_with_tied_timestamps_match_a_fresh_chain():
+    import random
+
+    for seed in range(100):
+        rnd = random.Random(seed)
+        storage = InMemoryStorage()
+        chain = PromptChain(storage)
+        storage.save_minion(make_minion("n0", {}, "2025-01-01T00:00:00+00:00"))
+        for i in range(1, 8):
+            chain.get_latest_version("n0")
+            day = rnd.randint(1, 3)
+            storage.save_minion(make_minion(f"n{i}", {}, f"2025-01-0{day}T00:00:00+00:00"))
+            storage.save_relation(make_follows(f"n{i}", f"n{rnd.randrange(i)}"))
+
+        fresh = PromptChain(storage, cache=False)
+        assert [m.id for m in chain.get_version_chain("n0")] == [m.id for m in fresh.get_version_chain("n0")]
+        assert chain.get_latest_version("n0").id == fresh.get_latest_version("n0").id
+
+
+def test_minion_saved_after_its_relation_joins_cached_chain(storage, chain):
+    storage.save_minion(make_minion("v1", {}, "2025-01-01T00:00:00+00:00"))
+    storage.save_relation(make_follows("v2", "v1"))
+    assert [m.id for m in chain.get_version_chain("v1")] == ["v1"]
+
+    storage.save_minion(make_minion("v2", {}, "2025-01-02T00:00:00+00:00"))
+    assert [m.id for m in chain.get_version_chain("v1")] == ["v1", "v2"]
+
+
+def test_saving_non_version_minions_skips_relation_lookups(storage, chain):
+    storage.save_minion(make_minion("v1", {}))
+    chain.get_version_chain("v1")
+    calls = []
+    get_relations = storage.get_relations
+    storage.get_relations = lambda **filters: calls.append(filters) or get_relations(**filters)
+
+    result = make_minion("r1", {})
+    result.minion_type_id = "minions-prompts/prompt-result"
+    storage.save_minion(result)
+
+    assert calls == []
+
+
+def test_chain_cache_evicts_least_recently_used():
+    storage = CountingStorage()
+    chain = PromptChain(storage, max_chains=2)
+    for id in ("a", "b", "c"):
+        storage.save_minion(make_minion(id, {}))
+    chain.get_version_chain("a")
+    chain.get_version_chain("b")
+    chain.get_version_chain("a")
+    chain.get_version_chain("c")
+
+    queries = storage.relation_queries
+    chain.get_version_chain("a")
+    chain.get_version_chain("c")
+    assert storage.relation_queries == queries
+    chain.get_version_chain("b")
+    assert storage.relation_queries > queries
+
+
+def test_max_chains_must_be_positive(storage):
+    with pytest.raises(ValueError):
+        PromptChain(storage, max_chains=0)
+
+
+def test_clear_drops_cached_chains(storage, chain):
+    storage.save_minion(make_minion("v1", {}))
+    chain.get_version_chain("v1")
+    storage.clear()
+    with pytest.raises(ValueError):
+        chain.get_version_chain("v1")
+
+
+def _linear_chain(storage, count):
+    for i in range(1, count + 1):
+        storage.save_minion(make_minion(f"v{i}", {"content": f"v{i}"}, f"2025-01-0{i}T00:00:00+00:00"))
+    for i in range(2, count + 1):
+        storage.save_relation(make_follows(f"v{i}", f"v{i - 1}"))
+
+
+def test_get_versions_at_dates_matches_point_lookups(storage, chain):
+    _linear_chain(storage, 4)
+    dates = [
+        datetime(2025, 1, 3, 6, tzinfo=timezone.utc),
+        datetime(2024, 12, 31, tzinfo=timezone.utc),
+        datetime(2025, 1, 2, tzinfo=timezone.utc),
+        datetime(2025, 2, 1, tzinfo=timezone.utc),
+    ]
+    results = chain.get_versions_at_dates("v2", dates)
+    assert [m.id if m else None for m in results] == ["v3", None, "v2", "v4"]
+    assert results == [chain.get_version_at_date("v2", d) for d in dates]
+
+
+def test_get_version_at_date_tie_returns_first_in_chain(storage, chain):
+    ts = "2025-01-01T00:00:00+00:00"
+    storage.save_minion(make_minion("a", {"content": "a"}, ts))
+    storage.save_minion(make_minion("b", {"content": "b"}, ts))
+    storage.save_relation(make_follows("b", "a"))
+
+    target = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    expected = chain.get_version_chain("a")[0]
+    assert chain.get_version_at_date("b", target).id == expected.id
+    assert chain.get_versions_at_dates("b", [target])[0].id == expected.id
+
+
+def test_created_at_parsing_is_memoised_across_chains(storage):
+    from minions_prompts.prompt_chain import _epoch
+
+    _linear_chain(storage, 3)
+    _epoch.cache_clear()
+    PromptChain(storage).get_version_chain("v1")
+    PromptChain(storage).get_version_chain("v3")
+    info = _epoch.cache_info()
+    assert info.misses == 3
+    assert info.hits >= 3
+    assert _epoch("2025-01-01T00:00:00+00:00") == datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+# ── Bulk resolution ────────────────────────────────────────────────────────────
+
+
+def _branching_forest(storage):
+    # a1 <- a2 <- a3, a2 <- a4 (branch); b1 <- b2; c1 alone
+    for id, day in [("a1", 1), ("a2", 2), ("a3", 3), ("a4", 4), ("b1", 1), ("b2", 5), ("c1", 2)]:
+        storage.save_minion(make_minion(id, {"content": id}, f"2025-01-0{day}T00:00:00+00:00"))
+    for source, target in [("a2", "a1"), ("a3", "a2"), ("a4", "a2"), ("b2", "b1")]:
+        storage.save_relation(make_follows(source, target))
+
+
+def test_bulk_lookups_match_single_lookups():
+    storage = InMemoryStorage()
+    _branching_forest(storage)
+    ids = ["a3", "b1", "c1", "a1"]
+
+    bulk = PromptChain(storage, cache=False)
+    single = PromptChain(storage, cache=False)
+    chains = bulk.get_version_chains(ids)
+    latest = bulk.get_latest_versions(ids)
+    for id in ids:
+        assert chains[id] == single.get_version_chain(id)
+        assert latest[id] == single.get_latest_version(id)
+    assert latest["a1"].id == "a4"
+
+
+def test_bulk_lookups_load_relations_once_and_fill_cache():
+    storage = CountingStorage()
+    _branching_forest(storage)
+    chain = PromptChain(storage)
+    storage.relation_queries = 0
+
+    latest = chain.get_latest_versions(["a1", "a3", "b2", "c1"])
+    assert {id: m.id for id, m in latest.items()} == {"a1": "a4", "a3": "a4", "b2": "b2", "c1": "c1"}
+    assert storage.relation_queries == 1
+    assert [m.id for m in chain.get_version_chain("b2")] == ["b1", "b2"]
+    assert storage.relation_queries == 1
+
+
+def test_bulk_lookup_unknown_prompt_raises(storage, chain):
+    _branching_forest(storage)
+    with pytest.raises(ValueError, match="not found"):
+        chain.get_version_chains(["a1", "missing"])
+
+
+# ── Head index ─────────────────────────────────────────────────────────────────
+
+
+def test_new_version_moves_head_without_traversal():
+    storage = CountingStorage()
+    chain = PromptChain(storage)
+    _linear_chain(storage, 2)
+    assert [m.id for m in chain.get_version_chain("v1")] == ["v1", "v2"]
+
+    storage.save_minion(make_minion("v3", {"content": "v3"}, "2025-01-03T00:00:00+00:00"))
+    storage.save_relation(make_follows("v3", "v2"))
+    queries = storage.relation_queries
+    assert chain.get_latest_version("v1").id == "v3"
+    assert [m.id for m in chain.get_version_chain("v1")] == ["v1", "v2", "v3"]
+    assert storage.relation_queries == queries
+    assert chain.heads() == {"v1": "v3"}
+
+
+def test_cold_latest_version_reads_the_head_index():
+    storage = CountingStorage()
+    _linear_chain(storage, 9)
+    storage.relation_queries = 0
+    chain = PromptChain(storage)
+    assert chain.get_latest_version("v1").id == "v9"
+    assert chain.get_latest_version("v5").id == "v9"
+    assert storage.relation_queries == 0
+
+
+def test_head_index_follows_merges_and_moved_versions(storage):
+    _linear_chain(storage, 2)
+    storage.save_minion(make_minion("w1", {"content": "w1"}, "2025-01-05T00:00:00+00:00"))
+    storage.save_minion(make_minion("x1", {"content": "x1"}, "2025-01-01T00:00:00+00:00"))
+    storage.save_relation(make_follows("w1", "x1"))
+    assert storage.get_heads() == {"v1": "v2", "x1": "w1"}
+    # w1 also follows v2, so it becomes the head of both lineages.
+    storage.save_relation(make_follows("w1", "v2"))
+    assert storage.get_heads() == {"v1": "w1", "x1": "w1"}
+    storage.save_minion(make_minion("v3", {"content": "v3"}, "2025-01-09T00:00:00+00:00"))
+    storage.save_relation(make_follows("v3", "w1"))
+    storage.save_minion(make_minion("fork", {"content": "fork"}, "2025-01-07T00:00:00+00:00"))
+    storage.save_relation(make_follows("fork", "v1"))
+    assert storage.get_heads() == {"v1": "v3", "x1": "v3"}
+    storage.save_minion(make_minion("v3", {"content": "v3"}, "2025-01-04T00:00:00+00:00"))
+    assert storage.get_heads() == {"v1": "fork", "x1": "v3"}
+    assert storage.get_heads() == storage.rebuild_head_index()
+
+
+def test_older_branch_keeps_head(storage, chain):
+    _linear_chain(storage, 3)
+    assert chain.get_latest_version("v1").id == "v3"
+    storage.save_minion(make_minion("fork", {"content": "fork"}, "2025-01-02T12:00:00+00:00"))
+    storage.save_relation(make_follows("fork", "v1"))
+    assert chain.get_latest_version("v1").id == "v3"
+    assert chain.verify_heads() == {}
+
+
+def test_verify_heads_reports_and_repairs_stale_head():
+    storage = MutableStorage()
+    chain = PromptChain(storage)
+    _linear_chain(storage, 2)
+    assert chain.get_latest_version("v1").id == "v2"
+    storage.muted = True
+    storage.save_minion(make_minion("v3", {"content": "v3"}, "2025-01-03T00:00:00+00:00"))
+    storage.save_relation(make_follows("v3", "v2"))
+    storage.save_minion(make_minion("x2", {"content": "x2"}, "2025-01-02T00:00:00+00:00"))
+    storage.save_minion(make_minion("x1", {"content": "x1"}, "2025-01-01T00:00:00+00:00"))
+    storage.save_relation(make_follows("x2", "x1"))
+    storage.muted = False
+
+    assert chain.verify_heads() == {"v1": ("v2", "v3"), "x1": (None, "x2")}
+    assert chain.heads() == {"v1": "v3", "x1": "x2"}
+    assert chain.get_latest_version("v1").id == "v3"
+    assert chain.verify_heads() == {}
+
+
+def test_verify_heads_checks_cached_heads_without_an_index():
+    storage = UnindexedStorage()
+    chain = PromptChain(storage)
+    _linear_chain(storage, 2)
+    assert chain.get_latest_version("v1").id == "v2"
+    assert chain.heads() == {"v1": "v2"}
+    assert chain.verify_heads() == {}
+
+
+def test_rebuild_heads_resolves_every_lineage(storage, chain):
+    _branching_forest(storage)
+    assert chain.rebuild_heads() == {"a1": "a4", "b1": "b2"}
+    assert chain.heads() == {"a1": "a4", "b1": "b2"}
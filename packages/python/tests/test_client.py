@@ -17,3 +17,10 @@ def test_prompts_plugin_mounting_on_core():
     
     chain = minions.prompts.create_chain()
     assert chain is not None
+
+def test_plugin_exposes_head_index():
+    minions = Minions(plugins=[PromptsPlugin()])
+    api = minions.prompts
+    assert api.rebuild_heads() == {}
+    assert api.verify_heads() == {}
+    assert api.heads() == {}
@@ -129,3 +129,120 @@ def test_added_and_removed_simultaneously(differ):
     removed_fields = {r["field"] for r in result.removed}
     assert "new_field" in added_fields
     assert "old_field" in removed_fields
+
+
+@pytest.mark.parametrize("algorithm", ["myers", "lcs"])
+def test_algorithms_agree_on_content_diff(algorithm):
+    v1 = make_minion({"content": "a\nb\nc\nd\ne"})
+    v2 = make_minion({"content": "a\nc\nd\nX\ne\nf"})
+    result = PromptDiff(algorithm=algorithm).diff(v1, v2)
+    assert [(l.type, l.text) for l in result.content_diff] == [
+        ("context", "a"),
+        ("remove", "b"),
+        ("context", "c"),
+        ("context", "d"),
+        ("add", "X"),
+        ("context", "e"),
+        ("add", "f"),
+    ]
+
+
+def test_myers_handles_large_prompts_with_small_edits():
+    lines = [f"instruction {i}" for i in range(20000)]
+    edited = list(lines)
+    edited[10000] = "instruction changed"
+    result = PromptDiff().diff(make_minion({"content": "\n".join(lines)}), make_minion({"content": "\n".join(edited)}))
+    changes = [(l.type, l.text) for l in result.content_diff if l.type != "context"]
+    assert changes == [("add", "instruction changed"), ("remove", "instruction 10000")]
+
+
+def test_myers_heavy_rewrite_keeps_shared_lines():
+    old = "\n".join(f"old {i}" if i % 2 else "" for i in range(3000))
+    new = "\n".join(f"new {i}" if i % 2 else "" for i in range(3000))
+    result = PromptDiff().diff(make_minion({"content": old}), make_minion({"content": new}))
+    assert sum(l.type == "context" for l in result.content_diff) == 1500
+    assert [l.text for l in result.content_diff if l.type != "add"] == old.split("\n")
+    assert [l.text for l in result.content_diff if l.type != "remove"] == new.split("\n")
+
+
+def test_myers_cost_cap_still_yields_a_valid_diff(monkeypatch):
+    import random
+
+    from minions_prompts import prompt_diff
+
+    monkeypatch.setattr(prompt_diff, "MYERS_MIN_COST", 2)
+    rng = random.Random(0)
+    old = [str(rng.randint(0, 9)) for _ in range(300)]
+    new = [str(rng.randint(0, 9)) for _ in range(300)]
+    result = PromptDiff().diff(make_minion({"content": "\n".join(old)}), make_minion({"content": "\n".join(new)}))
+    assert [l.text for l in result.content_diff if l.type != "add"] == old
+    assert [l.text for l in result.content_diff if l.type != "remove"] == new
+
+
+def test_unknown_algorithm_rejected():
+    with pytest.raises(ValueError):
+        PromptDiff(algorithm="patience")
+
+
+def test_identical_content_is_all_context(differ):
+    content = "line one\nline two\nline three"
+    result = differ.diff(make_minion({"content": content}), make_minion({"content": content}))
+    assert [l.type for l in result.content_diff] == ["context"] * 3
+
+
+def test_lcs_engine_only_diffs_changed_middle():
+    # Without trimming the identical head and tail this would need a 20k × 20k table.
+    lines = [f"rule {i}" for i in range(20000)]
+    edited = lines[:100] + ["inserted"] + lines[100:]
+    result = PromptDiff(algorithm="lcs").diff(
+        make_minion({"content": "\n".join(lines)}), make_minion({"content": "\n".join(edited)})
+    )
+    assert [l.text for l in result.content_diff if l.type == "add"] == ["inserted"]
+    assert len(result.content_diff) == 20001
+
+
+def test_word_granularity_returns_spans():
+    differ = PromptDiff(granularity="word")
+    result = differ.diff(
+        make_minion({"content": "Summarize the article for experts."}),
+        make_minion({"content": "Summarize the paper for experts."}),
+    )
+    assert result.granularity == "word"
+    assert [(s.type, s.text) for s in result.content_diff] == [
+        ("context", "Summarize the "),
+        ("add", "paper"),
+        ("remove", "article"),
+        ("context", " for experts."),
+    ]
+    assert "{+paper+}[-article-]" in differ.format(result)
+
+
+def test_char_granularity_reconstructs_both_versions():
+    old, new = "colour scheme", "color schema"
+    result = PromptDiff(granularity="char").diff(make_minion({"content": old}), make_minion({"content": new}))
+    assert "".join(s.text for s in result.content_diff if s.type != "add") == old
+    assert "".join(s.text for s in result.content_diff if s.type != "remove") == new
+
+
+def test_diff_chain_yields_adjacent_diffs_lazily(differ):
+    versions = [
+        make_minion({"content": "a\nb"}, title="v1"),
+        make_minion({"content": "a\nb\nc"}, title="v2"),
+        make_minion({"content": "a\nc"}, title="v3"),
+    ]
+    diffs = differ.diff_chain(iter(versions))
+    first = next(diffs)
+    assert [(l.type, l.text) for l in first.content_diff if l.type != "context"] == [("add", "c")]
+    rest = list(diffs)
+    assert len(rest) == 1
+    assert [(l.type, l.text) for l in rest[0].content_diff if l.type != "context"] == [("remove", "b")]
+    for pair, result in zip(zip(versions, versions[1:]), [first, *rest]):
+        assert result == differ.diff(*pair)
+
+
+def test_cumulative_diff_compares_root_and_leaf(differ):
+    versions = [make_minion({"content": f"v{i}"}) for i in range(4)]
+    result = differ.cumulative_diff(versions)
+    assert [(l.type, l.text) for l in result.content_diff] == [("add", "v3"), ("remove", "v0")]
+    with pytest.raises(ValueError):
+        differ.cumulative_diff([])
@@ -82,3 +82,8 @@ def test_to_json_returns_structured_export(storage, exporter):
 def test_to_json_raises_for_unknown_prompt(exporter):
     with pytest.raises((ValueError, KeyError, Exception)):
         exporter.to_json("nonexistent")
+
+
+def test_to_raw_many_renders_each_row(storage, exporter):
+    storage.save_minion(make_prompt("pm", "Hi {{name}}"))
+    assert list(exporter.to_raw_many("pm", [{"name": "A"}, {"name": "B"}])) == ["Hi A", "Hi B"]
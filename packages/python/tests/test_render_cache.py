@@ -0,0 +1,105 @@
+"""Tests for RenderCache."""
+
+import hashlib
+
+import pytest
+from minions_prompts import PromptRenderer, RenderCache
+from minions_prompts.render_cache import content_hash, variables_hash
+
+
+class CountingRenderer(PromptRenderer):
+    def __init__(self):
+        self.rows = 0
+
+    def render_many(self, template, rows, **kwargs):
+        rows = list(rows)
+        self.rows += len(rows)
+        return super().render_many(template, rows, **kwargs)
+
+
+def test_variables_hash_ignores_key_order():
+    assert variables_hash({"a": 1, "b": [1, 2]}) == variables_hash({"b": [1, 2], "a": 1})
+    assert variables_hash({"a": 1}) != variables_hash({"a": "1"})
+    assert variables_hash(None) == variables_hash({})
+
+
+@pytest.mark.parametrize(
+    "left, right",
+    [
+        ({"x": (1, 2)}, {"x": [1, 2]}),
+        ({"x": {1: "a"}}, {"x": {"1": "a"}}),
+        ({"x": 1}, {"x": 1.0}),
+        ({"x": 1}, {"x": True}),
+        ({"x": None}, {"x": "None"}),
+    ],
+)
+def test_variables_hash_keeps_types_apart(left, right):
+    assert variables_hash(left) != variables_hash(right)
+
+
+def test_rows_without_a_lossless_hash_bypass_the_cache():
+    class Name:
+        def __init__(self, value):
+            self.value = value
+
+        def __str__(self):
+            return "same"
+
+    renderer = CountingRenderer()
+    cache = RenderCache(renderer=renderer)
+    rows = [{"x": Name("a")}, {"x": 1}, {"x": Name("b")}]
+
+    assert variables_hash(rows[0]) is None
+    assert [r.text for r in cache.render_many("{{x}}", rows)] == ["same", "1", "same"]
+    assert [r.text for r in cache.render_many("{{x}}", rows)] == ["same", "1", "same"]
+    assert len(cache) == 1
+    assert renderer.rows == 5
+    assert (cache.hits, cache.misses) == (1, 5)
+
+
+def test_render_returns_text_and_its_hash():
+    rendered = RenderCache().render("Hi {{name}}", {"name": "Ann"})
+
+    assert rendered.text == "Hi Ann"
+    assert rendered.hash == content_hash("Hi Ann") == hashlib.sha256(b"Hi Ann").hexdigest()
+
+
+def test_render_many_renders_each_distinct_row_once():
+    renderer = CountingRenderer()
+    cache = RenderCache(renderer=renderer)
+    rows = [{"x": 1}, {"x": 2}, {"x": 1}]
+
+    first = cache.render_many("{{x}}!", rows)
+    second = cache.render_many("{{x}}!", list(reversed(rows)))
+
+    assert [r.text for r in first] == ["1!", "2!", "1!"]
+    assert [r.text for r in second] == ["1!", "2!", "1!"]
+    assert renderer.rows == 2
+    assert (cache.hits, cache.misses) == (4, 2)
+
+
+def test_template_edits_miss_the_cache():
+    cache = RenderCache()
+    cache.render("A {{x}}", {"x": 1})
+
+    assert cache.render("B {{x}}", {"x": 1}).text == "B 1"
+    assert cache.misses == 2
+
+
+def test_cache_evicts_least_recently_used():
+    cache = RenderCache(maxsize=2)
+    cache.render("{{x}}", {"x": 1})
+    cache.render("{{x}}", {"x": 2})
+    cache.render("{{x}}", {"x": 1})
+    cache.render("{{x}}", {"x": 3})
+
+    assert len(cache) == 2
+    cache.render("{{x}}", {"x": 1})
+    assert cache.hits == 2
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == cache.misses == 0
+
+
+def test_negative_maxsize_rejected():
+    with pytest.raises(ValueError, match="maxsize"):
+        RenderCache(maxsize=-1)
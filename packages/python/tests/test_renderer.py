@@ -139,3 +139,151 @@ def test_rerender_with_different_variable_map(renderer):
     assert result1 == "Hello Alice"
     assert result2 == "Hello Bob"
     assert result1 != result2
+
+
+def test_compile_returns_cached_compiled_template(renderer):
+    template = "Hi {{name}}{{#if vip}} (VIP){{/if}}: {{#each items}}[{{this}}]{{/each}}"
+    compiled = renderer.compile(template)
+    assert compiled is renderer.compile(template)
+    assert compiled.is_compiled
+    variables = {"name": "Ann", "vip": True, "items": ["a", "b"]}
+    assert compiled.render(variables) == "Hi Ann (VIP): [a][b]"
+    assert compiled.render(variables) == renderer.render(template, variables)
+
+
+def test_compiled_each_with_dict_items_falls_back_to_outer_variables(renderer):
+    compiled = renderer.compile("{{#each users}}{{name}}@{{team}}{{#if show}}!{{/if}} {{/each}}")
+    result = compiled.render({"users": [{"name": "A"}, {"name": "B", "team": "y"}], "team": "x", "show": 1})
+    assert result == "A@x! B@y! "
+
+
+def test_compiled_escaped_placeholder_is_unescaped(renderer):
+    compiled = renderer.compile(r"Literal \{{name}} and {{name}}")
+    assert compiled.render({"name": "Bob"}) == "Literal {{name}} and Bob"
+
+
+def test_nested_if_blocks_use_regex_fallback(renderer):
+    template = "{{#if a}}x{{#if b}}y{{/if}}z{{/if}}"
+    compiled = renderer.compile(template)
+    assert not compiled.is_compiled
+    assert compiled.render({"a": True, "b": False}) == "x{{#if b}}yz{{/if}}"
+
+
+def test_each_item_containing_placeholder_matches_regex_passes(renderer):
+    # Item text is re-scanned for placeholders, exactly as the regex passes do.
+    result = renderer.render("{{#each items}}{{this}} {{/each}}", {"items": ["{{who}}"], "who": "me"})
+    assert result == "me "
+
+
+def test_render_many_yields_lazily_in_order(renderer):
+    rows = ({"n": i} for i in range(3))
+    results = renderer.render_many("#{{n}}", rows)
+    assert next(results) == "#0"
+    assert list(results) == ["#1", "#2"]
+
+
+def test_render_many_with_workers_matches_serial(renderer):
+    template = "{{#each xs}}{{this}},{{/each}} {{name}}"
+    rows = [{"xs": [i, i + 1], "name": f"r{i}"} for i in range(50)]
+    expected = [renderer.render(template, row) for row in rows]
+    assert list(renderer.render_many(template, rows, workers=2, chunk_size=7)) == expected
+
+
+def test_render_many_checks_required_variables(renderer):
+    results = renderer.render_many("{{x}}", [{"x": 1}, {}], required_variables=["x"])
+    assert next(results) == "1"
+    with pytest.raises(RendererError):
+        next(results)
+
+
+def test_render_iter_matches_render(renderer):
+    template = "Docs:\n{{#each docs}}<doc>{{this}}</doc>\n{{/each}}Escaped \\{{x}} {{x}}"
+    variables = {"docs": ["alpha", "beta", "gamma"], "x": "X"}
+    fragments = list(renderer.render_iter(template, variables))
+    assert len(fragments) > 1
+    assert "".join(fragments) == renderer.render(template, variables)
+
+
+def test_render_iter_unescapes_across_fragment_boundaries(renderer):
+    template = "{{#each parts}}{{this}}{{/each}}{{tail}}"
+    variables = {"parts": ["a", "b"], "tail": "\\"}
+    assert "".join(renderer.render_iter(template + "{", variables)) == renderer.render(template + "{", variables)
+
+
+def test_render_iter_streams_items_that_need_regex_passes(renderer):
+    template = "{{#each items}}[{{this}}]{{/each}} {{#if on}}{{tail}}{{/if}}"
+    items = [f"item {i}" for i in range(1000)]
+    items[500] = "a{b}"
+    variables = {"items": items, "on": True, "tail": "end"}
+
+    fragments = list(renderer.render_iter(template, variables))
+
+    assert len(fragments) > 1000
+    assert max(len(f) for f in fragments) < 100
+    assert "".join(fragments) == renderer.render(template, variables)
+
+
+def test_render_iter_keeps_fragments_bounded_for_long_braced_items(renderer):
+    template = "{{#each items}}<{{this}}>{{/each}}{{#if on}}!{{/if}}"
+    items = ["{" + "x" * 400 + "\\" + str(i) for i in range(500)]
+    variables = {"items": items, "on": True}
+
+    fragments = list(renderer.render_iter(template, variables))
+
+    assert len(fragments) >= 500
+    assert max(len(f) for f in fragments) < 1000
+    assert "".join(fragments) == renderer.render(template, variables)
+
+
+def test_render_iter_regex_passes_match_render_across_items(renderer):
+    template = "{{#each items}}{{this}}{{/each}}|{{#each rows}}{{v}}{{/each}}"
+    variables = {
+        "items": ["{", "{x", "}}", "\\", "{{#if x}}", "y", "{{/if}}", "{{", "x}", "}"],
+        "rows": [{"v": "{{x}}"}, {"v": "\\"}, {"v": "{{x"}, {"v": "}}"}],
+        "x": "X",
+    }
+    assert "".join(renderer.render_iter(template, variables)) == renderer.render(template, variables)
+
+
+def test_render_to_text_and_binary_sinks(renderer):
+    import io
+
+    template = "{{#each rows}}{{this}};{{/each}}"
+    variables = {"rows": [str(i) for i in range(100)]}
+    expected = renderer.render(template, variables)
+
+    text_sink = io.StringIO()
+    assert renderer.render_to(template, variables, text_sink, buffer_size=16) == len(expected)
+    assert text_sink.getvalue() == expected
+
+    binary_sink = io.BytesIO()
+    renderer.render_to(template, variables, binary_sink)
+    assert binary_sink.getvalue() == expected.encode("utf-8")
+
+
+def test_variable_manifest_groups_variables_by_usage(renderer):
+    template = "{{greeting}} {{#if vip}}{{perk}}{{/if}}{{#each items}}- {{this}}{{/each}}{{greeting}}"
+    manifest = renderer.variable_manifest(template)
+    assert manifest.variables == ("greeting", "vip", "perk", "items", "this")
+    assert manifest.scalars == ("greeting", "perk")
+    assert manifest.conditionals == ("vip",)
+    assert manifest.collections == ("items",)
+    assert manifest.item_variables == (("items", ("this",)),)
+    assert renderer.variable_manifest(template) is manifest
+
+
+@pytest.mark.parametrize("suffix", ["", " {{#if a}}{{#if b}}x{{/if}}{{/if}}"])
+def test_variable_manifest_scopes_each_block_names(renderer, suffix):
+    template = "{{#each items}}{{name}}: {{this}}{{/each}} for {{user}}" + suffix
+    manifest = renderer.variable_manifest(template)
+    assert renderer.compile(template).is_compiled == (not suffix)
+    assert manifest.scalars == ("user",)
+    assert manifest.collections == ("items",)
+    assert manifest.item_variables == (("items", ("name", "this")),)
+    assert manifest.variables[:4] == ("items", "name", "this", "user")
+
+
+def test_extract_variables_returns_fresh_list(renderer):
+    first = renderer.extract_variables("{{a}} {{b}}")
+    first.append("mutated")
+    assert renderer.extract_variables("{{a}} {{b}}") == ["a", "b"]
@@ -0,0 +1,100 @@
+"""Tests for ResultTable."""
+
+import pytest
+from datetime import datetime, timezone
+from minions import Minion
+from minions_prompts import PromptScorer, ResultTable, summarize_results
+from minions_prompts.storage import InMemoryStorage
+
+np = pytest.importorskip("numpy")
+
+
+def make_minion(id: str, type_id: str, fields: dict) -> Minion:
+    now = datetime.now(timezone.utc).isoformat()
+    return Minion(id=id, title=id, minion_type_id=type_id, fields=fields, created_at=now, updated_at=now)
+
+
+def filled_table(rows: int) -> ResultTable:
+    table = ResultTable(capacity=4)
+    for i in range(rows):
+        scores = {"q": i} if i % 3 else {"q": i, "rare": -i}
+        table.append(f"p{i % 2}", f"t{i % 5}", scores, passed=i % 4 == 0)
+    return table
+
+
+def test_append_interns_ids_and_packs_pass_bits():
+    table = filled_table(20)
+    assert len(table) == 20
+    assert table.prompt_ids == ["p0", "p1"]
+    assert table.test_ids == ["t0", "t1", "t2", "t3", "t4"]
+    assert table.prompt_codes.tolist() == [i % 2 for i in range(20)]
+    assert table.passed.tolist() == [i % 4 == 0 for i in range(20)]
+    assert table.column("q").dtype == np.float32
+    assert table.column("q").tolist() == list(range(20))
+    rare = table.column("rare")
+    assert rare[3] == -3
+    assert np.isnan(rare[1])
+
+
+def test_slice_is_independent_of_parent():
+    table = filled_table(20)
+    part = table[5:13]
+    assert len(part) == 8
+    assert part.passed.tolist() == [i % 4 == 0 for i in range(5, 13)]
+    assert part.column("q").tolist() == list(range(5, 13))
+
+    part.append("p9", "t0", {"q": 99, "new": 1}, passed=True)
+    assert len(table) == 20
+    assert table.column("q")[13] == 13
+    assert "new" not in table.dimensions
+    assert part.prompt_ids[-1] == "p9"
+    assert "p9" not in table.prompt_ids
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load_roundtrip(tmp_path, mmap):
+    table = filled_table(37)
+    path = tmp_path / "results.mprt"
+    table.save(path)
+
+    loaded = ResultTable.load(path, mmap=mmap)
+    assert len(loaded) == 37
+    assert loaded.dimensions == table.dimensions
+    assert loaded.prompt_ids == table.prompt_ids
+    assert loaded.test_codes.tolist() == table.test_codes.tolist()
+    assert loaded.passed.tolist() == table.passed.tolist()
+    np.testing.assert_array_equal(loaded.column("rare"), table.column("rare"))
+
+    loaded.append("p0", "t0", {"q": 1}, passed=True)
+    assert len(loaded) == 38
+    assert loaded.passed[-1]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError, match="Not a result table"):
+        ResultTable.load(path)
+
+
+def test_scorer_writes_table_instead_of_minions():
+    storage = InMemoryStorage()
+    storage.save_minion(make_minion("p", "minions-prompts/prompt-template", {"content": "{{x}}"}))
+    for i in range(3):
+        storage.save_minion(make_minion(f"t{i}", "minions-prompts/prompt-test", {"inputVariables": {"x": i}}))
+    table = ResultTable()
+    scorer = PromptScorer(storage, result_table=table, save_result_minions=False)
+
+    scorer.run_test_suite("p", ["t0", "t1", "t2"], [{"scores": {"q": i}, "passed": i > 0} for i in range(3)])
+    scorer.run_test("p", "t0", scores={"q": 9}, passed=True)
+
+    assert len(table) == 4
+    assert storage.get_relations(type="references") == []
+    summary = summarize_results(table.to_frame())["p"]
+    assert summary.count == 4
+    assert summary.means == {"q": 3.0}
+
+
+def test_scorer_requires_a_sink():
+    with pytest.raises(ValueError, match="requires a result_table"):
+        PromptScorer(InMemoryStorage(), save_result_minions=False)
@@ -1,9 +1,11 @@
 """Tests for PromptScorer."""
 
+import hashlib
+
 import pytest
 from datetime import datetime, timezone
 from minions import Minion
-from minions_prompts import PromptScorer
+from minions_prompts import PromptScorer, RenderCache
 from minions_prompts.storage import InMemoryStorage
 
 
@@ -248,3 +250,319 @@ def test_compare_versions_deltas_correct_negative_when_v2_scores_lower(storage,
     assert len(comparisons) == 1
     assert comparisons[0].deltas["precision"] == -30
     assert comparisons[0].winner == "v1"
+
+
+class CountingStorage(InMemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.bulk_calls = 0
+        self.single_writes = 0
+
+    def save_minions(self, minions):
+        self.bulk_calls += 1
+        super().save_minions(minions)
+
+    def save_relations(self, relations):
+        self.bulk_calls += 1
+        super().save_relations(relations)
+
+    def save_relation(self, relation):
+        self.single_writes += 1
+        super().save_relation(relation)
+
+
+def test_compare_versions_flushes_writes_once_per_suite():
+    storage = CountingStorage()
+    scorer = PromptScorer(storage)
+    storage.save_minion(make_prompt("vb1", "A {{x}}"))
+    storage.save_minion(make_prompt("vb2", "B {{x}}"))
+    storage.save_minion(make_test("tb1", {"x": "1"}))
+    storage.save_minion(make_test("tb2", {"x": "2"}))
+
+    scorer.compare_versions(
+        "vb1",
+        "vb2",
+        ["tb1", "tb2"],
+        [{"scores": {"q": 1}, "passed": True}] * 2,
+        [{"scores": {"q": 2}, "passed": True}] * 2,
+    )
+
+    assert storage.bulk_calls == 2
+    assert len(storage.get_relations(type="references")) == 8
+    results = [m for m in storage.get_all_minions() if m.minion_type_id == "minions-prompts/prompt-result"]
+    assert len(results) == 4
+
+
+def test_run_test_suite_missing_test_writes_nothing(storage, scorer):
+    storage.save_minion(make_prompt("pm", "{{x}}"))
+    storage.save_minion(make_test("tm-ok", {"x": "1"}))
+
+    with pytest.raises(ValueError, match="Test not found"):
+        scorer.run_test_suite(
+            "pm",
+            ["tm-ok", "tm-missing"],
+            [{"scores": {}, "passed": True}, {"scores": {}, "passed": True}],
+        )
+
+    assert storage.get_relations(type="references") == []
+
+
+def test_render_tests_renders_without_saving(storage, scorer):
+    storage.save_minion(make_prompt("prt", "Q: {{q}}"))
+    storage.save_minion(make_test("trt1", {"q": "one"}))
+    storage.save_minion(make_test("trt2", {"q": "two"}))
+
+    assert scorer.render_tests("prt", ["trt1", "trt2"]) == ["Q: one", "Q: two"]
+    assert storage.get_relations(type="references") == []
+
+
+def _suite(storage, count):
+    storage.save_minion(make_prompt("pp", "Item {{n}}"))
+    test_ids = []
+    for i in range(count):
+        storage.save_minion(make_test(f"tp{i}", {"n": str(i)}))
+        test_ids.append(f"tp{i}")
+    evaluations = [{"scores": {"q": i}, "passed": i % 2 == 0} for i in range(count)]
+    return test_ids, evaluations
+
+
+def test_run_test_suite_on_thread_pool_keeps_input_order():
+    from concurrent.futures import ThreadPoolExecutor
+
+    storage = CountingStorage()
+    scorer = PromptScorer(storage)
+    test_ids, evaluations = _suite(storage, 50)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = scorer.run_test_suite("pp", test_ids, evaluations, executor=pool)
+
+    assert [r.test_id for r in results] == test_ids
+    assert [r.rendered_prompt for r in results] == [f"Item {i}" for i in range(50)]
+    assert [r.scores["q"] for r in results] == list(range(50))
+    assert storage.bulk_calls == 2
+
+
+def test_run_test_suite_renders_only_cache_misses_on_the_executor():
+    from concurrent.futures import ThreadPoolExecutor
+
+    class CountingExecutor(ThreadPoolExecutor):
+        submitted = 0
+
+        def submit(self, fn, *args, **kwargs):
+            self.submitted += len(args[1])
+            return super().submit(fn, *args, **kwargs)
+
+    storage = CountingStorage()
+    scorer = PromptScorer(storage)
+    test_ids, evaluations = _suite(storage, 20)
+
+    with CountingExecutor(max_workers=2) as pool:
+        first = scorer.run_test_suite("pp", test_ids[:10], evaluations[:10], executor=pool)
+        assert pool.submitted == 10
+        second = scorer.run_test_suite("pp", test_ids, evaluations, executor=pool)
+        assert pool.submitted == 20
+
+    assert [r.rendered_prompt for r in first + second] == [
+        f"Item {i}" for i in [*range(10), *range(20)]
+    ]
+
+
+def test_run_test_suite_with_max_workers_uses_process_pool(storage, scorer):
+    test_ids, evaluations = _suite(storage, 12)
+
+    results = scorer.run_test_suite("pp", test_ids, evaluations, max_workers=2)
+
+    assert [r.rendered_prompt for r in results] == [f"Item {i}" for i in range(12)]
+    assert len(storage.get_relations(type="references")) == 24
+
+
+# ── Evaluator pipeline ─────────────────────────────────────────────────────────
+
+
+def _length_evaluator(rendered_prompt, test):
+    return {"scores": {"length": len(rendered_prompt)}, "passed": True, "output": rendered_prompt.upper()}
+
+
+def test_run_test_suite_with_sync_evaluator(storage, scorer):
+    test_ids, _ = _suite(storage, 5)
+
+    results = scorer.run_test_suite("pp", test_ids, evaluator=_length_evaluator, concurrency=2)
+
+    assert [r.test_id for r in results] == test_ids
+    assert [r.scores["length"] for r in results] == [6] * 5
+    assert results[3].result.fields["output"] == "ITEM 3"
+    assert len(storage.get_relations(type="references")) == 10
+
+
+def test_run_test_suite_with_async_evaluator_retries_flaky_calls(storage, scorer):
+    import asyncio
+
+    test_ids, _ = _suite(storage, 4)
+    attempts = {}
+
+    async def flaky(rendered_prompt, test):
+        attempts[test.id] = attempts.get(test.id, 0) + 1
+        await asyncio.sleep(0)
+        if attempts[test.id] == 1:
+            raise ConnectionError("transient")
+        return {"scores": {"ok": 1}, "passed": True}
+
+    results = scorer.run_test_suite("pp", test_ids, evaluator=flaky, retries=1, timeout=5)
+    assert all(r.passed for r in results)
+    assert attempts == {test_id: 2 for test_id in test_ids}
+
+
+def test_evaluator_timeout_raises_and_saves_nothing(storage, scorer):
+    import asyncio
+    from minions_prompts import EvaluationError
+
+    test_ids, _ = _suite(storage, 3)
+
+    async def slow(rendered_prompt, test):
+        if test.id == "tp1":
+            await asyncio.sleep(10)
+        return {"scores": {}, "passed": True}
+
+    with pytest.raises(EvaluationError) as info:
+        scorer.run_test_suite("pp", test_ids, evaluator=slow, timeout=0.05)
+    assert info.value.test_id == "tp1"
+    assert info.value.attempts == 1
+    assert storage.get_relations(type="references") == []
+
+
+def test_run_test_suite_requires_exactly_one_score_source(storage, scorer):
+    test_ids, evaluations = _suite(storage, 1)
+    with pytest.raises(ValueError, match="exactly one"):
+        scorer.run_test_suite("pp", test_ids)
+    with pytest.raises(ValueError, match="exactly one"):
+        scorer.run_test_suite("pp", test_ids, evaluations, evaluator=_length_evaluator)
+
+
+# ── Sequential comparison ──────────────────────────────────────────────────────
+
+
+def _two_versions(storage, count):
+    storage.save_minion(make_prompt("sa", "A {{n}}"))
+    storage.save_minion(make_prompt("sb", "B {{n}}"))
+    for i in range(count):
+        storage.save_minion(make_test(f"ts{i}", {"n": str(i)}))
+    return [f"ts{i}" for i in range(count)]
+
+
+def test_sequential_comparison_stops_once_decided(storage, scorer):
+    test_ids = _two_versions(storage, 50)
+    pulled = []
+
+    def stream():
+        for i in range(50):
+            pulled.append(i)
+            yield {"scores": {"q": 1}, "passed": True}, {"scores": {"q": 2}, "passed": True}
+
+    outcome = scorer.compare_versions_sequential("sa", "sb", test_ids, stream())
+
+    assert outcome.decided and outcome.winner == "v2"
+    # log(0.95/0.05) / log(0.6/0.4) ≈ 7.3, so the 8th straight win decides.
+    assert len(outcome.comparisons) == len(pulled) == 8
+    assert outcome.evaluations_saved == 84
+    assert outcome.wins == {"v1": 0, "v2": 8, "tie": 0}
+    assert len(storage.get_relations(type="references")) == 32
+
+
+def test_sequential_comparison_undecided_when_tests_run_out(storage, scorer):
+    test_ids = _two_versions(storage, 6)
+    evaluations = [({"scores": {"q": i % 2}}, {"scores": {"q": (i + 1) % 2}}) for i in range(10)]
+
+    outcome = scorer.compare_versions_sequential("sa", "sb", test_ids, evaluations)
+
+    assert not outcome.decided and outcome.winner == "tie"
+    assert outcome.evaluations_saved == 0
+    assert outcome.wins == {"v1": 3, "v2": 3, "tie": 0}
+
+
+def test_sequential_comparison_with_evaluator(storage, scorer):
+    test_ids = _two_versions(storage, 40)
+    calls = []
+
+    def evaluator(rendered_prompt, test):
+        calls.append(rendered_prompt)
+        return {"scores": {"q": 5 if rendered_prompt.startswith("A") else 1}, "passed": True}
+
+    outcome = scorer.compare_versions_sequential("sa", "sb", test_ids, evaluator=evaluator, win_rate=0.75)
+
+    assert outcome.winner == "v1"
+    assert len(calls) == 2 * len(outcome.comparisons) == 2 * 3
+    assert outcome.evaluations_saved == 2 * 37
+
+
+def test_sequential_comparison_renders_only_the_looks_it_takes(storage):
+    cache = RenderCache()
+    scorer = PromptScorer(storage, render_cache=cache)
+    test_ids = _two_versions(storage, 50)
+    evaluations = [({"scores": {"q": 1}}, {"scores": {"q": 2}})] * 50
+
+    outcome = scorer.compare_versions_sequential("sa", "sb", test_ids, evaluations)
+
+    assert len(outcome.comparisons) == 8
+    assert cache.misses + cache.hits == 2 * 8
+
+
+def test_sequential_comparison_counts_one_saved_call_per_identical_render(storage, scorer):
+    test_ids = _two_versions(storage, 50)
+    storage.save_minion(make_prompt("sa2", "A {{n}}"))
+    evaluations = [({"scores": {"q": 1}}, {"scores": {"q": 2}})] * 50
+
+    outcome = scorer.compare_versions_sequential("sa", "sa2", test_ids, evaluations)
+
+    assert outcome.decided and len(outcome.comparisons) == 8
+    assert outcome.evaluations_saved == 42
+
+
+def test_sequential_comparison_saves_nothing_when_evaluations_run_out(storage, scorer):
+    test_ids = _two_versions(storage, 10)
+    evaluations = [({"scores": {"q": 1}}, {"scores": {"q": 1}})] * 4
+
+    outcome = scorer.compare_versions_sequential("sa", "sb", test_ids, evaluations)
+
+    assert not outcome.decided and len(outcome.comparisons) == 4
+    assert outcome.evaluations_saved == 0
+
+
+# ── Render cache ───────────────────────────────────────────────────────────────
+
+
+def test_results_record_prompt_hash(storage, scorer):
+    storage.save_minion(make_prompt("p1", "Hello {{name}}"))
+    storage.save_minion(make_test("t1", {"name": "Ann"}))
+
+    result = scorer.run_test("p1", "t1", scores={}, passed=True)
+
+    assert result.prompt_hash == hashlib.sha256(b"Hello Ann").hexdigest()
+    assert storage.get_minion(result.result.id).fields["promptHash"] == result.prompt_hash
+
+
+def test_repeated_runs_reuse_cached_renders(storage):
+    cache = RenderCache()
+    scorer = PromptScorer(storage, render_cache=cache)
+    test_ids = _two_versions(storage, 3)
+    evaluations = [{"scores": {"q": 1}, "passed": True}] * 3
+
+    scorer.compare_versions("sa", "sb", test_ids, evaluations, evaluations)
+    PromptScorer(storage, render_cache=cache).run_test_suite("sa", test_ids, evaluations)
+
+    assert (cache.misses, cache.hits) == (6, 3)
+
+
+def test_identical_renders_are_evaluated_once(storage, scorer):
+    test_ids = _two_versions(storage, 4)
+    storage.save_minion(make_prompt("sa2", "A {{n}}"))
+    calls = []
+
+    def evaluator(rendered_prompt, test):
+        calls.append(rendered_prompt)
+        return {"scores": {"q": 1}, "passed": True}
+
+    outcome = scorer.compare_versions_sequential("sa", "sa2", test_ids, evaluator=evaluator)
+
+    assert len(calls) == 4
+    assert outcome.wins == {"v1": 0, "v2": 0, "tie": 4}
+    assert all(c.v1_result.prompt_hash == c.v2_result.prompt_hash for c in outcome.comparisons)
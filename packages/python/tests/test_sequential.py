@@ -0,0 +1,34 @@
+"""Tests for SequentialProbabilityRatioTest."""
+
+import math
+
+import pytest
+from minions_prompts import SequentialProbabilityRatioTest
+
+
+def test_boundaries_follow_wald():
+    sprt = SequentialProbabilityRatioTest(alpha=0.05, beta=0.1)
+    assert sprt.upper == pytest.approx(math.log(0.9 / 0.05))
+    assert sprt.lower == pytest.approx(math.log(0.1 / 0.95))
+
+
+def test_ties_do_not_move_the_statistic():
+    sprt = SequentialProbabilityRatioTest()
+    for _ in range(100):
+        assert sprt.update("tie") is None
+    assert sprt.log_likelihood_ratio == 0
+    assert sprt.observations == 100
+
+
+def test_decides_for_v1_and_then_refuses_updates():
+    sprt = SequentialProbabilityRatioTest(win_rate=0.8)
+    decisions = [sprt.update("v1") for _ in range(3)]
+    assert decisions == [None, None, "v1"]
+    with pytest.raises(RuntimeError):
+        sprt.update("v2")
+
+
+@pytest.mark.parametrize("kwargs", [{"win_rate": 0.5}, {"win_rate": 1.0}, {"alpha": 0}, {"beta": 1}])
+def test_rejects_invalid_parameters(kwargs):
+    with pytest.raises(ValueError):
+        SequentialProbabilityRatioTest(**kwargs)
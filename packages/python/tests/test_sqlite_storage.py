@@ -0,0 +1,255 @@
+"""Tests for SQLitePromptStorage."""
+
+import pytest
+from datetime import datetime, timezone
+from minions import Minion, Relation
+from minions_prompts import PromptChain, PromptExporter, PromptScorer, SQLitePromptStorage
+from minions_prompts.storage import PromptStorage
+
+
+def make_minion(id: str, fields: dict = None, created_at: str = None) -> Minion:
+    now = datetime.now(timezone.utc).isoformat()
+    return Minion(
+        id=id,
+        title=f"Minion {id}",
+        minion_type_id="minions-prompts/prompt-template",
+        fields=fields or {},
+        created_at=created_at or now,
+        updated_at=now,
+    )
+
+
+def make_relation(id: str, source_id: str, target_id: str, type: str = "follows") -> Relation:
+    return Relation(
+        id=id,
+        source_id=source_id,
+        target_id=target_id,
+        type=type,
+        created_at=datetime.now(timezone.utc).isoformat(),
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    s = SQLitePromptStorage(str(tmp_path / "prompts.db"))
+    yield s
+    s.close()
+
+
+def test_save_and_get_roundtrip(storage):
+    storage.save_minion(make_minion("m1", {"content": "Hello {{name}}", "tags": ["a"]}))
+    retrieved = storage.get_minion("m1")
+    assert retrieved is not None
+    assert retrieved.fields == {"content": "Hello {{name}}", "tags": ["a"]}
+    assert storage.get_minion("missing") is None
+
+
+def test_overwrite_existing_minion(storage):
+    storage.save_minion(make_minion("m1", {"content": "old"}))
+    storage.save_minion(make_minion("m1", {"content": "new"}))
+    assert storage.get_minion("m1").fields["content"] == "new"
+    assert len(storage.get_all_minions()) == 1
+
+
+def test_get_relations_filters(storage):
+    storage.save_relation(make_relation("r1", "m2", "m1"))
+    storage.save_relation(make_relation("r2", "m3", "m1"))
+    storage.save_relation(make_relation("r3", "m2", "m1", "references"))
+
+    assert [r.id for r in storage.get_relations(target_id="m1", type="follows")] == ["r1", "r2"]
+    assert [r.id for r in storage.get_relations(source_id="m2")] == ["r1", "r3"]
+    assert [r.id for r in storage.get_relations(type="references")] == ["r3"]
+    assert len(storage.get_all_relations()) == 3
+
+
+def test_data_persists_across_connections(tmp_path):
+    path = str(tmp_path / "persist.db")
+    with SQLitePromptStorage(path) as storage:
+        storage.save_minion(make_minion("m1"))
+        storage.save_relation(make_relation("r1", "m1", "m0"))
+
+    with SQLitePromptStorage(path) as reopened:
+        assert reopened.get_minion("m1") is not None
+        assert [r.id for r in reopened.get_relations(source_id="m1")] == ["r1"]
+
+
+def test_uses_wal_journal(storage):
+    mode = storage._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_clear_removes_everything(storage):
+    storage.save_minion(make_minion("m1"))
+    storage.save_relation(make_relation("r1", "m1", "m0"))
+    storage.clear()
+    assert storage.get_all_minions() == []
+    assert storage.get_all_relations() == []
+
+
+def test_chain_scorer_and_exporter_work_unchanged(storage):
+    storage.save_minion(make_minion("v1", {"content": "v1 {{x}}"}, "2025-01-01T00:00:00+00:00"))
+    storage.save_minion(make_minion("v2", {"content": "v2 {{x}}"}, "2025-01-02T00:00:00+00:00"))
+    storage.save_relation(make_relation("f1", "v2", "v1"))
+    test = make_minion("t1")
+    test.fields = {"inputVariables": {"x": "go"}}
+    storage.save_minion(test)
+
+    chain = PromptChain(storage)
+    assert [m.id for m in chain.get_version_chain("v1")] == ["v1", "v2"]
+    assert chain.get_latest_version("v1").id == "v2"
+
+    result = PromptScorer(storage).run_test("v2", "t1", scores={"q": 1}, passed=True)
+    assert result.rendered_prompt == "v2 go"
+
+    export = PromptExporter(storage).to_json("v1")
+    assert [v.id for v in export.versions] == ["v2"]
+    assert len(export.test_results) == 1
+
+
+def test_bulk_saves(storage):
+    storage.save_minions(make_minion(f"m{i}") for i in range(50))
+    storage.save_relations(make_relation(f"r{i}", f"m{i}", "m0") for i in range(1, 50))
+    assert len(storage.get_all_minions()) == 50
+    assert len(storage.get_relations(target_id="m0", type="follows")) == 49
+
+
+def test_get_minions_preserves_order_and_reports_missing(storage):
+    for i in range(3):
+        storage.save_minion(make_minion(f"m{i}"))
+    result = storage.get_minions(["m2", "missing", "m0", "m2"])
+    assert [m.id if m else None for m in result] == ["m2", None, "m0", "m2"]
+
+
+def test_get_descendants_uses_recursive_query(storage):
+    for id in ("r", "a", "b", "c", "d"):
+        storage.save_minion(make_minion(id))
+    for i, (source, target) in enumerate(
+        [("a", "r"), ("b", "r"), ("c", "a"), ("missing", "b"), ("d", "missing"), ("a", "c")]
+    ):
+        storage.save_relation(make_relation(f"r{i}", source, target))
+    storage.save_relation(make_relation("x", "b", "r", type="references"))
+
+    assert [m.id for m in storage.get_descendants("r")] == ["a", "b", "c"]
+    assert [m.id for m in storage.get_descendants("r", type="references")] == ["b"]
+
+
+def test_descendant_graph_matches_default_walk(storage):
+    for id in ("r", "a", "b", "c", "d", "e"):
+        storage.save_minion(make_minion(id))
+    edges = [("b", "r"), ("a", "r"), ("d", "a"), ("c", "b"), ("e", "d"), ("a", "c"), ("x", "e")]
+    for i, (source, target) in enumerate(edges):
+        storage.save_relation(make_relation(f"r{i}", source, target))
+
+    descendants, relations = storage.get_descendant_graph("r")
+    default, default_relations = PromptStorage.get_descendant_graph(storage, "r")
+    assert [m.id for m in descendants] == [m.id for m in default] == ["b", "a", "c", "d", "e"]
+    assert sorted(r.id for r in relations) == sorted(r.id for r in default_relations)
+    assert "r6" not in {r.id for r in relations}
+
+
+def test_chain_leaves_come_from_one_traversal(storage):
+    storage.save_minion(make_minion("v1", {}, "2025-01-01T00:00:00+00:00"))
+    storage.save_minion(make_minion("v2", {}, "2025-01-02T00:00:00+00:00"))
+    storage.save_minion(make_minion("v3", {}, "2025-01-03T00:00:00+00:00"))
+    storage.save_relation(make_relation("f1", "v2", "v1"))
+    storage.save_relation(make_relation("f2", "v3", "v1"))
+    chain = PromptChain(storage)
+    calls = []
+    get_relations = storage.get_relations
+    storage.get_relations = lambda **filters: calls.append(filters) or get_relations(**filters)
+
+    assert chain.get_latest_version("v2").id == "v3"
+    assert [c for c in calls if "target_id" in c] == []
+
+
+def test_chain_cache_sees_writes_from_another_connection(tmp_path):
+    path = str(tmp_path / "shared.db")
+    with SQLitePromptStorage(path) as mine, SQLitePromptStorage(path) as theirs:
+        mine.save_minion(make_minion("v1", {}, "2025-01-01T00:00:00+00:00"))
+        chain = PromptChain(mine)
+        assert chain.get_latest_version("v1").id == "v1"
+
+        theirs.save_minion(make_minion("v2", {}, "2025-01-02T00:00:00+00:00"))
+        theirs.save_relation(make_relation("f1", "v2", "v1"))
+        assert chain.get_latest_version("v1").id == "v2"
+        assert [m.id for m in chain.get_version_chain("v2")] == ["v1", "v2"]
+
+
+def test_external_version_ignores_own_writes(storage):
+    before = storage.external_version()
+    storage.save_minion(make_minion("m1"))
+    assert storage.external_version() == before
+
+
+def test_descendant_graph_probes_the_target_index(storage):
+    from minions_prompts.sqlite_storage import _GET_DESCENDANT_GRAPH
+
+    storage.save_minions(make_minion(f"c{c}v{v}") for c in range(200) for v in range(3))
+    storage.save_relations(
+        make_relation(f"r{c}_{v}", f"c{c}v{v}", f"c{c}v{v - 1}") for c in range(200) for v in (1, 2)
+    )
+
+    descendants, relations = storage.get_descendant_graph("c42v0")
+    assert [m.id for m in descendants] == ["c42v1", "c42v2"]
+    assert [r.id for r in relations] == ["r42_1", "r42_2"]
+    plan = [
+        row[3]
+        for row in storage._conn.execute(
+            "EXPLAIN QUERY PLAN " + _GET_DESCENDANT_GRAPH, ("c42v0", "follows", "follows")
+        )
+    ]
+    relation_steps = [step for step in plan if " r " in f" {step} "]
+    assert relation_steps
+    assert all("idx_relations_target_type" in step for step in relation_steps)
+
+
+def _versions(storage, count):
+    storage.save_minions(
+        make_minion(f"v{i}", {}, f"2025-01-0{i}T00:00:00+00:00") for i in range(1, count + 1)
+    )
+    storage.save_relations(make_relation(f"f{i}", f"v{i}", f"v{i - 1}") for i in range(2, count + 1))
+
+
+def test_head_index_persists_across_connections(tmp_path):
+    path = str(tmp_path / "heads.db")
+    with SQLitePromptStorage(path) as storage:
+        _versions(storage, 3)
+        assert storage.get_heads() == {"v1": "v3"}
+
+    with SQLitePromptStorage(path) as reopened:
+        assert reopened.get_heads() == {"v1": "v3"}
+        assert reopened.get_head_id("v2") == "v3"
+
+
+def test_databases_without_a_head_index_are_indexed_on_open(tmp_path):
+    import sqlite3
+
+    path = str(tmp_path / "old.db")
+    with SQLitePromptStorage(path) as storage:
+        _versions(storage, 3)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("DELETE FROM lineage")
+        conn.execute("DELETE FROM heads")
+        conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+    with SQLitePromptStorage(path) as reopened:
+        assert reopened.get_heads() == {"v1": "v3"}
+
+
+def test_head_index_is_written_with_the_relation(storage):
+    class FailingIndex(SQLitePromptStorage):
+        def _index_relations(self, relations):
+            super()._index_relations(relations)
+            raise RuntimeError("index write failed")
+
+    _versions(storage, 2)
+    failing = FailingIndex(storage._path)
+    failing.save_minion(make_minion("v3", {}, "2025-01-03T00:00:00+00:00"))
+    with pytest.raises(RuntimeError):
+        failing.save_relation(make_relation("f3", "v3", "v2"))
+    failing.close()
+
+    assert storage.get_relations(source_id="v3") == []
+    assert storage.get_heads() == {"v1": "v2"}
@@ -2,7 +2,7 @@
 import pytest
 from datetime import datetime, timezone
 from minions import Minion, Relation
-from minions_prompts.storage import InMemoryStorage
+from minions_prompts.storage import InMemoryStorage, PromptStorage
 
 
 def make_minion(id: str) -> Minion:
@@ -79,3 +79,62 @@ def test_overwrite_existing_minion():
     retrieved = storage.get_minion("m1")
     assert retrieved is not None
     assert retrieved.title == "Updated Title"
+
+
+def test_get_relations_combined_filters_use_indexes():
+    storage = InMemoryStorage()
+    storage.save_relation(make_relation("r1", "m2", "m1"))
+    storage.save_relation(make_relation("r2", "m3", "m1"))
+    storage.save_relation(
+        Relation(
+            id="r3",
+            source_id="m2",
+            target_id="m1",
+            type="references",
+            created_at=datetime.now(timezone.utc).isoformat(),
+        )
+    )
+
+    assert [r.id for r in storage.get_relations(target_id="m1", type="follows")] == ["r1", "r2"]
+    assert [r.id for r in storage.get_relations(source_id="m2", type="references")] == ["r3"]
+    assert [r.id for r in storage.get_relations(source_id="m2", target_id="m1")] == ["r1", "r3"]
+    assert [
+        r.id for r in storage.get_relations(source_id="m2", target_id="m1", type="follows")
+    ] == ["r1"]
+    assert [r.id for r in storage.get_relations(type="references")] == ["r3"]
+    assert len(storage.get_relations()) == 3
+
+
+def test_clear_resets_relation_indexes():
+    storage = InMemoryStorage()
+    storage.save_relation(make_relation("r1", "m2", "m1"))
+    storage.clear()
+    assert storage.get_relations(target_id="m1", type="follows") == []
+    assert storage.get_relations(source_id="m2") == []
+
+
+def _fork_with_gap(storage):
+    # r <- a <- c <- a (cycle), r <- b <- missing <- d (cut off by the missing minion)
+    for id in ("r", "a", "b", "c", "d"):
+        storage.save_minion(make_minion(id))
+    for i, (source, target) in enumerate(
+        [("a", "r"), ("b", "r"), ("c", "a"), ("missing", "b"), ("d", "missing"), ("a", "c")]
+    ):
+        storage.save_relation(make_relation(f"r{i}", source, target))
+
+
+def test_get_descendants_walks_breadth_first():
+    storage = InMemoryStorage()
+    _fork_with_gap(storage)
+    assert [m.id for m in storage.get_descendants("r")] == ["a", "b", "c"]
+    assert storage.get_descendants("r", type="other") == []
+
+
+def test_default_get_descendants_matches_indexed_walk():
+    storage = InMemoryStorage()
+    _fork_with_gap(storage)
+    default = PromptStorage.get_descendants(storage, "r")
+    assert [m.id for m in default] == [m.id for m in storage.get_descendants("r")]
+    _, relations = storage.get_descendant_graph("r")
+    _, default_relations = PromptStorage.get_descendant_graph(storage, "r")
+    assert [r.id for r in relations] == [r.id for r in default_relations] == ["r0", "r1", "r2", "r5"]